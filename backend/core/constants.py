@@ -8,6 +8,47 @@ VERIFICATION_REQUIRED_HOURS = 72  # 검증 필요 시간 임계값
 CRITICAL_ALERT_HOURS = 24  # 중요 알림 기본 시간 범위
 CONSECUTIVE_VIOLATION_DETECTION_HOURS = 12  # 연속 이탈 패턴 감지 시간 범위
 
+# 대량 등록 설정
+CCP_LOG_BULK_MAX_SIZE = 5000  # 한 번에 등록 가능한 최대 측정값 수
+CCP_LOG_BULK_BATCH_SIZE = 500  # bulk_create 배치 크기
+
+# CCP 목록 통계
+CCP_STATISTICS_DAYS = 30  # 이탈 건수/준수율 집계 기간 (시간 집계 구간 단위)
+
+# 감사용 CCP 로그 내보내기
+CCP_LOG_EXPORT_CHUNK_SIZE = 5000  # 키셋 단위 조회 행 수
+
+# CCP 로그 보관 이관
+CCP_LOG_HOT_RETENTION_MONTHS = 12  # 원본 테이블에 남겨 둘 닫힌 월 수
+CCP_LOG_ARCHIVE_BATCH_SIZE = 2000  # 트랜잭션 한 번에 이관할 행 수
+
+# 실시간 푸시 설정
+REALTIME_TOPICS = ['ccp_deviation', 'critical_alert', 'production_status']  # 구독 가능한 이벤트 종류
+REALTIME_CLIENT_QUEUE_SIZE = 1000  # 연결별 미전송 이벤트 최대 보관 수 (초과 시 오래된 이벤트 폐기)
+REALTIME_RECONNECT_INITIAL_DELAY_SECONDS = 1  # Redis 채널 재연결 첫 대기 시간
+REALTIME_RECONNECT_MAX_DELAY_SECONDS = 30  # 재연결 대기 시간 상한 (실패 시 2배씩 증가)
+
+# 대시보드 스냅샷 캐시
+DASHBOARD_SNAPSHOT_TTL_SECONDS = 30  # 변경 시 즉시 무효화되며, 시간 경과에 따른 카운터(지연/오늘)는 TTL로 갱신
+
+# 리콜 영향 분석 설정
+RECALL_MAX_DEPTH = 3  # 로트 → 주문 → 로트 최대 탐색 단계
+RECALL_QUERY_CHUNK_SIZE = 1000  # 단계별 일괄 조회 시 IN 절 최대 크기
+
+# 자재 소요량 계획 (MRP)
+MRP_MAX_HORIZON_DAYS = 90  # 최대 계획 기간
+
+# 제품 원가 캐시
+COST_CACHE_MAX_ENTRIES = 1000  # 로컬 LRU 최대 항목 수 (제품 x 생산 수량)
+COST_CACHE_TTL_SECONDS = 3600  # 원가 캐시 항목 만료 (로컬/공유 공통, 변경 시 즉시 무효화)
+COST_MATERIAL_INDEX_TTL_SECONDS = 300  # 원자재 → 제품 역색인 재구성 주기
+
+# 원가 시뮬레이션
+COST_SIMULATION_MAX_SCENARIOS = 500  # 요청당 최대 시나리오 수
+
+# 재고 부족 기본 임계값 (재주문점 미지정 원자재)
+LOW_STOCK_DEFAULT_THRESHOLD = 10  # 원자재 단위 기준
+
 # 연속 이탈 임계값
 CONSECUTIVE_VIOLATION_THRESHOLD = 3  # 연속 이탈 알림 기준 횟수
 
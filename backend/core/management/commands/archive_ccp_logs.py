@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.constants import CCP_LOG_HOT_RETENTION_MONTHS
+from core.services.ccp_log_archive_service import CCPLogArchiveService
+
+
+class Command(BaseCommand):
+    help = '보존 기간이 지난 월의 CCP 로그를 보관 테이블과 월별 압축 CSV로 이관'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            default=CCP_LOG_HOT_RETENTION_MONTHS,
+            help=f'원본 테이블에 남겨 둘 닫힌 월 수 (기본 {CCP_LOG_HOT_RETENTION_MONTHS})',
+        )
+        parser.add_argument(
+            '--export-dir',
+            default=None,
+            help='월별 압축 CSV 저장 디렉터리 (기본 CCP_LOG_ARCHIVE_DIR 설정)',
+        )
+        parser.add_argument(
+            '--no-export',
+            action='store_true',
+            help='압축 CSV 파일 생성 생략 (보관 테이블 이관만 수행)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='이관 대상 월만 출력',
+        )
+
+    def handle(self, *args, **options):
+        service = CCPLogArchiveService()
+        months = service.archivable_months(options['retention_months'])
+        if not months:
+            self.stdout.write(self.style.SUCCESS('이관할 CCP 로그가 없습니다.'))
+            return
+
+        self.stdout.write(f"이관 대상 월: {', '.join(f'{month:%Y-%m}' for month in months)}")
+        if options['dry_run']:
+            return
+
+        export_dir = None if options['no_export'] else (options['export_dir'] or settings.CCP_LOG_ARCHIVE_DIR)
+        for month in months:
+            result = service.archive_month(month, export_dir=export_dir)
+            message = f"✓ {month:%Y-%m}: {result['moved_count']}건 이관 (보관 {result['log_count']}건)"
+            if result['export_path']:
+                message += f" → {result['export_path']}"
+            self.stdout.write(message)
+
+        self.stdout.write(self.style.SUCCESS('CCP 로그 보관 이관 완료'))
@@ -0,0 +1,161 @@
+import random
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.constants import RECALL_MAX_DEPTH
+from core.models import (
+    User, Supplier, RawMaterial, MaterialLot,
+    FinishedProduct, ProductionOrder, MaterialUsage
+)
+from core.services.recall_service import RecallService
+
+
+class Command(BaseCommand):
+    help = '리콜 영향 분석 벤치마크 (시드 그래프 생성 후 측정, 기본적으로 롤백)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lots', type=int, default=100000, help='생성할 원자재 로트 수')
+        parser.add_argument('--lots-per-order', type=int, default=8, help='생산 주문당 투입 로트 수')
+        parser.add_argument('--samples', type=int, default=20, help='측정할 리콜 시작 로트 수')
+        parser.add_argument('--depth', type=int, default=RECALL_MAX_DEPTH, help='탐색 단계')
+        parser.add_argument('--seed', type=int, default=42, help='난수 시드')
+        parser.add_argument('--keep', action='store_true', help='시드 데이터를 롤백하지 않고 유지')
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            lot_ids, user = self.seed_graph(options['lots'], options['lots_per_order'])
+            self.stdout.write(f'✓ 시드 그래프 생성 {time.perf_counter() - started:.1f}초')
+
+            self.run_benchmark(lot_ids, user, options['samples'], options['depth'])
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+                self.stdout.write('시드 데이터 롤백')
+
+    def seed_graph(self, lot_count, lots_per_order):
+        """로트 N개, 주문 N/lots_per_order개, 주문별 lots_per_order개 사용 이력 생성"""
+        suffix = uuid.uuid4().hex[:8]
+        now = timezone.now()
+
+        user = User.objects.create_user(
+            username=f'recall_bench_{suffix}',
+            password=uuid.uuid4().hex,
+            role='admin'
+        )
+        supplier = Supplier.objects.create(
+            name='리콜 벤치마크 공급업체',
+            code=f'BENCH-SUP-{suffix}',
+            contact_person='벤치마크',
+            email='bench@example.com',
+            phone='000-0000-0000',
+            address='-',
+            created_by=user
+        )
+        materials = RawMaterial.objects.bulk_create([
+            RawMaterial(
+                name=f'벤치마크 원자재 {index}',
+                code=f'BENCH-RM-{suffix}-{index}',
+                category='ingredient',
+                supplier=supplier,
+                created_by=user
+            )
+            for index in range(100)
+        ])
+        products = FinishedProduct.objects.bulk_create([
+            FinishedProduct(
+                name=f'벤치마크 제품 {index}',
+                code=f'BENCH-FP-{suffix}-{index}',
+                shelf_life_days=30,
+                net_weight=Decimal('1.000'),
+                packaging_type='box',
+                created_by=user
+            )
+            for index in range(50)
+        ])
+
+        lots = [
+            MaterialLot(
+                lot_number=f'BENCH-LOT-{suffix}-{index}',
+                raw_material=materials[index % len(materials)],
+                supplier=supplier,
+                received_date=now - timedelta(days=index % 365),
+                quantity_received=Decimal('100.000'),
+                quantity_current=Decimal('0.000'),
+                unit_price=Decimal('1000.00'),
+                status='used',
+                quality_test_passed=True,
+                created_by=user
+            )
+            for index in range(lot_count)
+        ]
+        MaterialLot.objects.bulk_create(lots, batch_size=5000)
+
+        order_count = max(1, lot_count // lots_per_order)
+        orders = [
+            ProductionOrder(
+                order_number=f'BENCH-PO-{suffix}-{index}',
+                finished_product=products[index % len(products)],
+                planned_quantity=Decimal('100.000'),
+                produced_quantity=Decimal('98.000'),
+                planned_start_date=now - timedelta(days=index % 365, hours=8),
+                planned_end_date=now - timedelta(days=index % 365),
+                status='completed',
+                created_by=user
+            )
+            for index in range(order_count)
+        ]
+        ProductionOrder.objects.bulk_create(orders, batch_size=5000)
+
+        usages = []
+        for order in orders:
+            for lot in random.sample(lots, min(lots_per_order, len(lots))):
+                usages.append(MaterialUsage(
+                    material_lot=lot,
+                    raw_material_id=lot.raw_material_id,
+                    production_order=order,
+                    quantity=Decimal('12.500'),
+                    unit_price=lot.unit_price,
+                    used_at=order.planned_start_date,
+                    created_by=user
+                ))
+            if len(usages) >= 5000:
+                MaterialUsage.objects.bulk_create(usages)
+                usages = []
+        MaterialUsage.objects.bulk_create(usages)
+
+        self.stdout.write(
+            f'  로트 {len(lots)}개, 주문 {len(orders)}개, 사용 이력 {len(orders) * lots_per_order}건'
+        )
+        return [lot.id for lot in lots], user
+
+    def run_benchmark(self, lot_ids, user, samples, depth):
+        service = RecallService()
+        timings = []
+        query_counts = []
+        affected = []
+
+        for lot_id in random.sample(lot_ids, min(samples, len(lot_ids))):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                impact = service.analyze_lot_recall(lot_id, user, max_depth=depth)
+                timings.append(time.perf_counter() - started)
+            query_counts.append(len(queries))
+            affected.append(impact['summary']['affected_order_count'])
+
+        timings.sort()
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        self.stdout.write(f'리콜 영향 분석 (탐색 단계 {depth}, 표본 {len(timings)}개)')
+        self.stdout.write(f'  소요 시간: 중앙값 {timings[len(timings) // 2] * 1000:.1f}ms, p95 {p95 * 1000:.1f}ms')
+        self.stdout.write(f'  쿼리 수: 최대 {max(query_counts)}회')
+        self.stdout.write(f'  영향 주문 수: 평균 {sum(affected) / len(affected):.0f}개, 최대 {max(affected)}개')
+        self.stdout.write(self.style.SUCCESS('리콜 벤치마크 완료'))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from core.models import CCPLogHourlyRollup, CCPLogDailyRollup
+from core.services.ccp_rollup_service import CCPRollupService
+
+
+class Command(BaseCommand):
+    help = 'CCP 로그 시간/일 집계 테이블 재생성'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ccp',
+            action='append',
+            dest='ccp_ids',
+            help='재생성할 CCP ID (여러 번 지정 가능, 생략 시 전체)',
+        )
+
+    def handle(self, *args, **options):
+        ccp_ids = options['ccp_ids']
+
+        self.stdout.write('CCP 로그 집계 재생성 중...')
+        CCPRollupService().rebuild(ccp_ids=ccp_ids)
+
+        hourly = CCPLogHourlyRollup.objects.all()
+        daily = CCPLogDailyRollup.objects.all()
+        if ccp_ids:
+            hourly = hourly.filter(ccp_id__in=ccp_ids)
+            daily = daily.filter(ccp_id__in=ccp_ids)
+
+        self.stdout.write(f'✓ 시간 집계 {hourly.count()}건, 일 집계 {daily.count()}건 생성')
+        self.stdout.write(self.style.SUCCESS('CCP 로그 집계 재생성 완료'))
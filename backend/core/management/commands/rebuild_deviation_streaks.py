@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from core.services.deviation_streak_service import DeviationStreakService
+
+
+class Command(BaseCommand):
+    help = 'CCP별 연속 기준 이탈 상태를 측정 이력으로부터 재생성'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ccp',
+            action='append',
+            dest='ccp_ids',
+            help='재생성할 CCP ID (여러 번 지정 가능, 생략 시 전체)',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('연속 이탈 상태 재생성 중...')
+        rebuilt = DeviationStreakService().rebuild(ccp_ids=options['ccp_ids'])
+        self.stdout.write(f'✓ CCP {rebuilt}개 상태 재생성')
+        self.stdout.write(self.style.SUCCESS('연속 이탈 상태 재생성 완료'))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core.services.production_board_service import ProductionBoardService
+
+
+class Command(BaseCommand):
+    help = '생산 주문 목록 읽기 모델을 생산 주문으로부터 재구성'
+
+    def handle(self, *args, **options):
+        self.stdout.write('생산 주문 목록 읽기 모델 재구성 중...')
+        count = ProductionBoardService().rebuild()
+
+        self.stdout.write(f'✓ 생산 주문 {count}건 반영')
+        self.stdout.write(self.style.SUCCESS('생산 주문 목록 읽기 모델 재구성 완료'))
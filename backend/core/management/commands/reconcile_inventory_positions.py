@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core.models import MaterialInventoryPosition
+from core.services.inventory_service import InventoryPositionService
+
+
+class Command(BaseCommand):
+    help = '원자재별 재고 현황을 원자재 로트로부터 재구성'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--material',
+            action='append',
+            dest='material_ids',
+            help='재구성할 원자재 ID (여러 번 지정 가능, 생략 시 전체)',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('원자재 재고 현황 재구성 중...')
+        drifted = InventoryPositionService().reconcile(material_ids=options['material_ids'])
+
+        positions = MaterialInventoryPosition.objects.all()
+        if options['material_ids']:
+            positions = positions.filter(raw_material_id__in=options['material_ids'])
+
+        self.stdout.write(f'✓ 재고 현황 {positions.count()}건 재구성 (값 변경 {drifted}건)')
+        self.stdout.write(self.style.SUCCESS('원자재 재고 현황 재구성 완료'))
@@ -0,0 +1,86 @@
+import django.db.models.deletion
+import uuid
+from datetime import timezone as dt_timezone
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDay, TruncHour
+
+
+def backfill_rollups(apps, schema_editor):
+    """기존 CCP 로그로 시간/일 집계 생성"""
+    CCPLog = apps.get_model('core', 'CCPLog')
+
+    for model_name, trunc in (('CCPLogHourlyRollup', TruncHour), ('CCPLogDailyRollup', TruncDay)):
+        Rollup = apps.get_model('core', model_name)
+        buckets = CCPLog.objects.annotate(
+            bucket=trunc('measured_at', tzinfo=dt_timezone.utc)
+        ).values('ccp_id', 'bucket').annotate(
+            log_count=Count('id'),
+            within_limits_count=Count('id', filter=Q(is_within_limits=True)),
+            corrective_action_count=Count('id', filter=Q(status='corrective_action')),
+            verified_count=Count('id', filter=Q(verified_by__isnull=False)),
+            min_value=Min('measured_value'),
+            max_value=Max('measured_value'),
+            sum_value=Sum('measured_value')
+        ).order_by()
+
+        Rollup.objects.bulk_create([
+            Rollup(
+                id=uuid.uuid4(),
+                ccp_id=row['ccp_id'],
+                bucket_start=row['bucket'],
+                log_count=row['log_count'],
+                within_limits_count=row['within_limits_count'],
+                corrective_action_count=row['corrective_action_count'],
+                verified_count=row['verified_count'],
+                min_value=row['min_value'],
+                max_value=row['max_value'],
+                sum_value=row['sum_value']
+            )
+            for row in buckets.iterator()
+        ], batch_size=1000)
+
+
+def rollup_fields():
+    return [
+        ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+        ('bucket_start', models.DateTimeField(help_text='집계 구간 시작 시각 (UTC 기준)')),
+        ('log_count', models.PositiveIntegerField(default=0)),
+        ('within_limits_count', models.PositiveIntegerField(default=0)),
+        ('corrective_action_count', models.PositiveIntegerField(default=0)),
+        ('verified_count', models.PositiveIntegerField(default=0)),
+        ('min_value', models.DecimalField(blank=True, decimal_places=3, max_digits=10, null=True)),
+        ('max_value', models.DecimalField(blank=True, decimal_places=3, max_digits=10, null=True)),
+        ('sum_value', models.DecimalField(decimal_places=3, default=0, max_digits=20)),
+        ('updated_at', models.DateTimeField(auto_now=True)),
+        ('ccp', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.ccp')),
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_bom'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CCPLogHourlyRollup',
+            fields=rollup_fields(),
+            options={
+                'db_table': 'ccp_log_hourly_rollups',
+                'indexes': [models.Index(fields=['bucket_start'], name='ccp_hourly_bucket_idx')],
+                'unique_together': {('ccp', 'bucket_start')},
+            },
+        ),
+        migrations.CreateModel(
+            name='CCPLogDailyRollup',
+            fields=rollup_fields(),
+            options={
+                'db_table': 'ccp_log_daily_rollups',
+                'indexes': [models.Index(fields=['bucket_start'], name='ccp_daily_bucket_idx')],
+                'unique_together': {('ccp', 'bucket_start')},
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
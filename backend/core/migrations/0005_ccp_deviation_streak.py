@@ -0,0 +1,62 @@
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+def backfill_streaks(apps, schema_editor):
+    """CCP별 최신 측정부터 첫 기준 내 측정까지의 연속 이탈 횟수 계산"""
+    CCP = apps.get_model('core', 'CCP')
+    CCPLog = apps.get_model('core', 'CCPLog')
+    CCPDeviationStreak = apps.get_model('core', 'CCPDeviationStreak')
+
+    streaks = []
+    for ccp_id in CCP.objects.values_list('id', flat=True):
+        current_run = 0
+        run_started_at = None
+        last_measured_at = None
+        history = CCPLog.objects.filter(ccp_id=ccp_id).order_by(
+            '-measured_at'
+        ).values_list('is_within_limits', 'measured_at')
+        for is_within_limits, measured_at in history.iterator(chunk_size=500):
+            if last_measured_at is None:
+                last_measured_at = measured_at
+            if is_within_limits:
+                break
+            current_run += 1
+            run_started_at = measured_at
+
+        streaks.append(CCPDeviationStreak(
+            id=uuid.uuid4(),
+            ccp_id=ccp_id,
+            current_run=current_run,
+            run_started_at=run_started_at,
+            last_measured_at=last_measured_at
+        ))
+
+    CCPDeviationStreak.objects.bulk_create(streaks, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_ccp_log_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CCPDeviationStreak',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('current_run', models.PositiveIntegerField(default=0, help_text='최신 측정부터 연속된 기준 이탈 횟수')),
+                ('run_started_at', models.DateTimeField(blank=True, help_text='현재 연속 이탈의 첫 측정 시각', null=True)),
+                ('last_measured_at', models.DateTimeField(blank=True, help_text='마지막으로 반영된 측정 시각', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('ccp', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='deviation_streak', to='core.ccp')),
+            ],
+            options={
+                'db_table': 'ccp_deviation_streaks',
+                'indexes': [models.Index(fields=['current_run', 'last_measured_at'], name='ccp_streak_run_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_streaks, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_ccp_deviation_streak'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialUsage',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('usage_type', models.CharField(choices=[('production', '생산 투입'), ('manual', '수동 소비')], default='production', max_length=20)),
+                ('quantity', models.DecimalField(decimal_places=3, max_digits=10)),
+                ('unit_price', models.DecimalField(decimal_places=2, help_text='사용 시점 로트 단가', max_digits=10)),
+                ('used_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('notes', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='created_material_usages', to=settings.AUTH_USER_MODEL)),
+                ('material_lot', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='usages', to='core.materiallot')),
+                ('production_order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='material_usages', to='core.productionorder')),
+                ('raw_material', models.ForeignKey(help_text='로트의 원자재 (원자재별 집계용 비정규화)', on_delete=django.db.models.deletion.PROTECT, related_name='usages', to='core.rawmaterial')),
+            ],
+            options={
+                'db_table': 'material_usages',
+                'indexes': [
+                    models.Index(fields=['material_lot', 'used_at'], name='usage_lot_used_idx'),
+                    models.Index(fields=['production_order', 'material_lot'], name='usage_order_lot_idx'),
+                    models.Index(fields=['raw_material', 'used_at'], name='usage_material_used_idx'),
+                ],
+            },
+        ),
+    ]
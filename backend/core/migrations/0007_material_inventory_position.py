@@ -0,0 +1,37 @@
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_material_usage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialInventoryPosition',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('on_hand_quantity', models.DecimalField(decimal_places=3, default=0, help_text='활성 로트(입고/보관중/사용중) 현재 수량 합계', max_digits=14)),
+                ('available_quantity', models.DecimalField(decimal_places=3, default=0, help_text='입고/보관중 로트 현재 수량 합계', max_digits=14)),
+                ('active_lot_count', models.PositiveIntegerField(default=0)),
+                ('near_expiry_count', models.PositiveIntegerField(default=0, help_text='as_of_date 기준 7일 내 만료 로트 수')),
+                ('expiring_30d_count', models.PositiveIntegerField(default=0, help_text='as_of_date 기준 30일 내 만료(만료 포함) 로트 수')),
+                ('expired_lot_count', models.PositiveIntegerField(default=0, help_text='as_of_date 기준 만료 로트 수')),
+                ('total_value', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('next_expiry_date', models.DateField(blank=True, null=True)),
+                ('as_of_date', models.DateField(help_text='만료 관련 카운트 기준일 (날짜가 바뀌면 조회 시 재계산)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('raw_material', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='inventory_position', to='core.rawmaterial')),
+            ],
+            options={
+                'db_table': 'material_inventory_positions',
+                'indexes': [
+                    models.Index(fields=['available_quantity'], name='inv_pos_available_idx'),
+                    models.Index(fields=['as_of_date'], name='inv_pos_as_of_idx'),
+                ],
+            },
+        ),
+    ]
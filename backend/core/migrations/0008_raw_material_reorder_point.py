@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_material_inventory_position'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rawmaterial',
+            name='reorder_point',
+            field=models.DecimalField(blank=True, decimal_places=3, help_text='재주문점 (원자재 단위 기준, 미지정 시 기본 임계값 사용)', max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='rawmaterial',
+            name='safety_stock',
+            field=models.DecimalField(decimal_places=3, default=0, help_text='안전 재고 (원자재 단위 기준)', max_digits=10),
+        ),
+    ]
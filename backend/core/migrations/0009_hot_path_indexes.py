@@ -0,0 +1,47 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_raw_material_reorder_point'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='materiallot',
+            index=models.Index(fields=['raw_material', 'status', 'quality_test_passed', 'expiry_date', 'received_date'], name='mlot_material_fifo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='materiallot',
+            index=models.Index(fields=['raw_material', 'received_date'], name='mlot_material_received_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='materiallot',
+            index=models.Index(fields=['status', 'expiry_date'], name='mlot_status_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ccplog',
+            index=models.Index(fields=['ccp', 'measured_at'], name='ccplog_ccp_measured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ccplog',
+            index=models.Index(fields=['is_within_limits', 'measured_at'], name='ccplog_limits_measured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ccplog',
+            index=models.Index(fields=['production_order', 'verified_by'], name='ccplog_order_verified_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ccplog',
+            index=models.Index(fields=['measured_at'], name='ccplog_measured_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productionorder',
+            index=models.Index(fields=['status', 'planned_start_date'], name='po_status_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='productionorder',
+            index=models.Index(fields=['status', 'planned_end_date'], name='po_status_end_idx'),
+        ),
+    ]
@@ -0,0 +1,78 @@
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def compress_archive_table(apps, schema_editor):
+    """MariaDB/MySQL: 보관 테이블 페이지 압축 (InnoDB file-per-table 필요)"""
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute('ALTER TABLE ccp_log_archives ROW_FORMAT=COMPRESSED KEY_BLOCK_SIZE=8')
+
+
+def decompress_archive_table(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    schema_editor.execute('ALTER TABLE ccp_log_archives ROW_FORMAT=DYNAMIC KEY_BLOCK_SIZE=0')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_material_lot_received_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CCPLogArchive',
+            fields=[
+                ('id', models.UUIDField(editable=False, primary_key=True, serialize=False)),
+                ('measured_value', models.DecimalField(decimal_places=3, max_digits=10)),
+                ('unit', models.CharField(max_length=20)),
+                ('measured_at', models.DateTimeField()),
+                ('status', models.CharField(choices=[('within_limits', '기준 내'), ('out_of_limits', '기준 이탈'), ('corrective_action', '개선조치')], max_length=20)),
+                ('is_within_limits', models.BooleanField()),
+                ('deviation_notes', models.TextField(blank=True)),
+                ('corrective_action_taken', models.TextField(blank=True)),
+                ('verification_date', models.DateTimeField(blank=True, null=True)),
+                ('measurement_device', models.CharField(blank=True, max_length=100)),
+                ('environmental_conditions', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('ccp', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='archived_logs', to='core.ccp')),
+                ('corrective_action_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('production_order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='archived_ccp_logs', to='core.productionorder')),
+                ('verified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived CCP Monitoring Log',
+                'verbose_name_plural': 'Archived CCP Monitoring Logs',
+                'db_table': 'ccp_log_archives',
+                'ordering': ['-measured_at'],
+                'indexes': [
+                    models.Index(fields=['ccp', 'measured_at'], name='ccparch_ccp_measured_idx'),
+                    models.Index(fields=['measured_at'], name='ccparch_measured_idx'),
+                    models.Index(fields=['production_order'], name='ccparch_order_idx'),
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name='CCPLogArchiveBatch',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('period_start', models.DateTimeField(help_text='이관 월 시작 (UTC)', unique=True)),
+                ('period_end', models.DateTimeField(help_text='이관 월 종료 (UTC, 미포함)')),
+                ('log_count', models.PositiveIntegerField(default=0)),
+                ('export_path', models.CharField(blank=True, help_text='월별 압축 CSV 파일 경로', max_length=500)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'ccp_log_archive_batches',
+                'ordering': ['-period_start'],
+            },
+        ),
+        migrations.RunPython(compress_archive_table, decompress_archive_table),
+    ]
@@ -0,0 +1,81 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_board(apps, schema_editor):
+    """기존 생산 주문으로 목록 읽기 모델 채우기 (이후에는 저장 시그널로 유지)"""
+    ProductionOrder = apps.get_model('core', 'ProductionOrder')
+    ProductionOrderBoardEntry = apps.get_model('core', 'ProductionOrderBoardEntry')
+
+    entries = []
+    for order in ProductionOrder.objects.select_related('finished_product', 'assigned_operator').iterator():
+        completion_rate = 0
+        if order.planned_quantity:
+            completion_rate = round((order.produced_quantity / order.planned_quantity) * 100, 2)
+        entries.append(ProductionOrderBoardEntry(
+            production_order_id=order.id,
+            order_number=order.order_number,
+            finished_product_id=order.finished_product_id,
+            product_name=order.finished_product.name,
+            product_code=order.finished_product.code,
+            planned_quantity=order.planned_quantity,
+            produced_quantity=order.produced_quantity,
+            completion_rate=completion_rate,
+            planned_start_date=order.planned_start_date,
+            planned_end_date=order.planned_end_date,
+            actual_start_date=order.actual_start_date,
+            actual_end_date=order.actual_end_date,
+            open_deadline=None if order.status in ('completed', 'cancelled') else order.planned_end_date,
+            status=order.status,
+            priority=order.priority,
+            assigned_operator_id=order.assigned_operator_id,
+            assigned_operator_username=order.assigned_operator.username if order.assigned_operator_id else '',
+            created_at=order.created_at,
+            updated_at=order.updated_at,
+        ))
+    ProductionOrderBoardEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_ccp_log_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductionOrderBoardEntry',
+            fields=[
+                ('production_order', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='board_entry', serialize=False, to='core.productionorder')),
+                ('order_number', models.CharField(max_length=50)),
+                ('product_name', models.CharField(max_length=200)),
+                ('product_code', models.CharField(max_length=50)),
+                ('planned_quantity', models.DecimalField(decimal_places=3, max_digits=10)),
+                ('produced_quantity', models.DecimalField(decimal_places=3, max_digits=10)),
+                ('completion_rate', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('planned_start_date', models.DateTimeField()),
+                ('planned_end_date', models.DateTimeField()),
+                ('actual_start_date', models.DateTimeField(blank=True, null=True)),
+                ('actual_end_date', models.DateTimeField(blank=True, null=True)),
+                ('open_deadline', models.DateTimeField(blank=True, help_text='완료/취소되지 않은 주문의 계획 종료 시각 (지연 여부 판단용)', null=True)),
+                ('status', models.CharField(choices=[('planned', '계획'), ('in_progress', '생산중'), ('completed', '완료'), ('cancelled', '취소'), ('on_hold', '보류')], max_length=20)),
+                ('priority', models.CharField(choices=[('low', '낮음'), ('normal', '보통'), ('high', '높음'), ('urgent', '긴급')], max_length=10)),
+                ('assigned_operator_username', models.CharField(blank=True, max_length=150)),
+                ('created_at', models.DateTimeField(help_text='생산 주문 생성 시각')),
+                ('updated_at', models.DateTimeField(help_text='생산 주문 수정 시각')),
+                ('assigned_operator', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('finished_product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.finishedproduct')),
+            ],
+            options={
+                'db_table': 'production_order_board',
+                'indexes': [
+                    models.Index(fields=['created_at'], name='pob_created_idx'),
+                    models.Index(fields=['status', 'created_at'], name='pob_status_created_idx'),
+                    models.Index(fields=['status', 'planned_start_date'], name='pob_status_start_idx'),
+                    models.Index(fields=['assigned_operator', 'created_at'], name='pob_operator_created_idx'),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_board, migrations.RunPython.noop),
+    ]
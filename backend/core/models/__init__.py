@@ -2,9 +2,14 @@ from .user import User
 from .supplier import Supplier
 from .raw_material import RawMaterial, MaterialLot
 from .product import FinishedProduct
-from .production import ProductionOrder
-from .haccp import CCP, CCPLog
+from .production import ProductionOrder, ProductionOrderBoardEntry
+from .haccp import (
+    CCP, CCPLog, CCPLogArchive, CCPLogArchiveBatch, CCPLogHourlyRollup, CCPLogDailyRollup,
+    CCPDeviationStreak
+)
 from .bom import BOM
+from .material_usage import MaterialUsage
+from .inventory import MaterialInventoryPosition
 
 __all__ = [
     'User',
@@ -13,7 +18,15 @@ __all__ = [
     'MaterialLot',
     'FinishedProduct',
     'ProductionOrder',
+    'ProductionOrderBoardEntry',
     'CCP',
     'CCPLog',
+    'CCPLogArchive',
+    'CCPLogArchiveBatch',
+    'CCPLogHourlyRollup',
+    'CCPLogDailyRollup',
+    'CCPDeviationStreak',
     'BOM',
+    'MaterialUsage',
+    'MaterialInventoryPosition',
 ]
\ No newline at end of file
@@ -52,6 +52,14 @@ class CCP(models.Model):
         
     def __str__(self):
         return f"{self.name} ({self.code})"
+    
+    def evaluate_measurement(self, measured_value):
+        """측정값의 한계 기준 판정 - (is_within_limits, status) 반환"""
+        if self.critical_limit_min is not None and measured_value < self.critical_limit_min:
+            return False, 'out_of_limits'
+        if self.critical_limit_max is not None and measured_value > self.critical_limit_max:
+            return False, 'out_of_limits'
+        return True, 'within_limits'
 
 
 class CCPLog(models.Model):
@@ -104,21 +112,155 @@ class CCPLog(models.Model):
         verbose_name = 'CCP Monitoring Log'
         verbose_name_plural = 'CCP Monitoring Logs'
         ordering = ['-measured_at']
+        indexes = [
+            models.Index(fields=['ccp', 'measured_at'], name='ccplog_ccp_measured_idx'),
+            models.Index(fields=['is_within_limits', 'measured_at'], name='ccplog_limits_measured_idx'),
+            models.Index(fields=['production_order', 'verified_by'], name='ccplog_order_verified_idx'),
+            models.Index(fields=['measured_at'], name='ccplog_measured_idx'),
+        ]
         
     def __str__(self):
         return f"{self.ccp.name} - {self.measured_value} {self.unit} ({self.measured_at})"
     
     def save(self, *args, **kwargs):
         """저장 시 자동으로 한계 기준 체크"""
-        if self.pk is None:  # 새로 생성되는 경우만
-            if self.ccp.critical_limit_min is not None and self.measured_value < self.ccp.critical_limit_min:
-                self.is_within_limits = False
-                self.status = 'out_of_limits'
-            elif self.ccp.critical_limit_max is not None and self.measured_value > self.ccp.critical_limit_max:
-                self.is_within_limits = False
-                self.status = 'out_of_limits'
-            else:
-                self.is_within_limits = True
-                self.status = 'within_limits'
+        if self._state.adding:  # 새로 생성되는 경우만 (id가 uuid4 기본값이라 pk로는 판별 불가)
+            self.is_within_limits, self.status = self.ccp.evaluate_measurement(self.measured_value)
+        
+        super().save(*args, **kwargs)
+
+
+class CCPLogArchive(models.Model):
+    """
+    보존 기간이 지난 CCP 로그 보관 테이블 (월 단위 이관, 불변)
+    - 필드는 CCPLog와 동일 (id 유지), MariaDB에서는 ROW_FORMAT=COMPRESSED
+    """
+    
+    id = models.UUIDField(primary_key=True, editable=False)
+    ccp = models.ForeignKey(CCP, on_delete=models.PROTECT, related_name='archived_logs')
+    production_order = models.ForeignKey(
+        ProductionOrder,
+        on_delete=models.PROTECT,
+        related_name='archived_ccp_logs',
+        null=True,
+        blank=True
+    )
+    measured_value = models.DecimalField(max_digits=10, decimal_places=3)
+    unit = models.CharField(max_length=20)
+    measured_at = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=CCPLog.STATUS_CHOICES)
+    is_within_limits = models.BooleanField()
+    deviation_notes = models.TextField(blank=True)
+    corrective_action_taken = models.TextField(blank=True)
+    corrective_action_by = models.ForeignKey(
+        User, on_delete=models.PROTECT, null=True, blank=True, related_name='+'
+    )
+    verified_by = models.ForeignKey(
+        User, on_delete=models.PROTECT, null=True, blank=True, related_name='+'
+    )
+    verification_date = models.DateTimeField(null=True, blank=True)
+    measurement_device = models.CharField(max_length=100, blank=True)
+    environmental_conditions = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    created_by = models.ForeignKey(User, on_delete=models.PROTECT, related_name='+')
+    archived_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'ccp_log_archives'
+        verbose_name = 'Archived CCP Monitoring Log'
+        verbose_name_plural = 'Archived CCP Monitoring Logs'
+        ordering = ['-measured_at']
+        indexes = [
+            models.Index(fields=['ccp', 'measured_at'], name='ccparch_ccp_measured_idx'),
+            models.Index(fields=['measured_at'], name='ccparch_measured_idx'),
+            models.Index(fields=['production_order'], name='ccparch_order_idx'),
+        ]
         
-        super().save(*args, **kwargs)
\ No newline at end of file
+    def __str__(self):
+        return f"[보관] {self.ccp_id} - {self.measured_value} {self.unit} ({self.measured_at})"
+
+
+class CCPLogArchiveBatch(models.Model):
+    """CCP 로그 월 단위 이관 이력 (이관 시작 시 생성 → 조회 시 보관 테이블 포함 여부 판단 기준)"""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    period_start = models.DateTimeField(unique=True, help_text='이관 월 시작 (UTC)')
+    period_end = models.DateTimeField(help_text='이관 월 종료 (UTC, 미포함)')
+    log_count = models.PositiveIntegerField(default=0)
+    export_path = models.CharField(max_length=500, blank=True, help_text='월별 압축 CSV 파일 경로')
+    started_at = models.DateTimeField(auto_now_add=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'ccp_log_archive_batches'
+        ordering = ['-period_start']
+        
+    def __str__(self):
+        return f"{self.period_start:%Y-%m} 보관 ({self.log_count}건)"
+
+
+class CCPLogRollupBase(models.Model):
+    """CCP 로그 시계열 집계 (증분 유지) - 공통 필드"""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    ccp = models.ForeignKey(CCP, on_delete=models.CASCADE, related_name='+')
+    bucket_start = models.DateTimeField(help_text='집계 구간 시작 시각 (UTC 기준)')
+    log_count = models.PositiveIntegerField(default=0)
+    within_limits_count = models.PositiveIntegerField(default=0)
+    corrective_action_count = models.PositiveIntegerField(default=0)
+    verified_count = models.PositiveIntegerField(default=0)
+    min_value = models.DecimalField(max_digits=10, decimal_places=3, null=True, blank=True)
+    max_value = models.DecimalField(max_digits=10, decimal_places=3, null=True, blank=True)
+    sum_value = models.DecimalField(max_digits=20, decimal_places=3, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        abstract = True
+
+
+class CCPLogHourlyRollup(CCPLogRollupBase):
+    """CCP별 시간 단위 로그 집계"""
+    
+    class Meta:
+        db_table = 'ccp_log_hourly_rollups'
+        unique_together = ['ccp', 'bucket_start']
+        indexes = [
+            models.Index(fields=['bucket_start'], name='ccp_hourly_bucket_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.ccp_id} @ {self.bucket_start:%Y-%m-%d %H}:00 ({self.log_count})"
+
+
+class CCPLogDailyRollup(CCPLogRollupBase):
+    """CCP별 일 단위 로그 집계"""
+    
+    class Meta:
+        db_table = 'ccp_log_daily_rollups'
+        unique_together = ['ccp', 'bucket_start']
+        indexes = [
+            models.Index(fields=['bucket_start'], name='ccp_daily_bucket_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.ccp_id} @ {self.bucket_start:%Y-%m-%d} ({self.log_count})"
+
+
+class CCPDeviationStreak(models.Model):
+    """CCP별 연속 기준 이탈 상태 (최신 측정 기준)"""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    ccp = models.OneToOneField(CCP, on_delete=models.CASCADE, related_name='deviation_streak')
+    current_run = models.PositiveIntegerField(default=0, help_text='최신 측정부터 연속된 기준 이탈 횟수')
+    run_started_at = models.DateTimeField(null=True, blank=True, help_text='현재 연속 이탈의 첫 측정 시각')
+    last_measured_at = models.DateTimeField(null=True, blank=True, help_text='마지막으로 반영된 측정 시각')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'ccp_deviation_streaks'
+        indexes = [
+            models.Index(fields=['current_run', 'last_measured_at'], name='ccp_streak_run_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.ccp_id} 연속 이탈 {self.current_run}회"
@@ -0,0 +1,36 @@
+from django.db import models
+from .raw_material import RawMaterial
+import uuid
+
+
+class MaterialInventoryPosition(models.Model):
+    """원자재별 재고 현황 (로트 입고/소비/할당 시 같은 트랜잭션에서 재계산)"""
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    raw_material = models.OneToOneField(RawMaterial, on_delete=models.CASCADE, related_name='inventory_position')
+    on_hand_quantity = models.DecimalField(
+        max_digits=14, decimal_places=3, default=0,
+        help_text='활성 로트(입고/보관중/사용중) 현재 수량 합계'
+    )
+    available_quantity = models.DecimalField(
+        max_digits=14, decimal_places=3, default=0,
+        help_text='입고/보관중 로트 현재 수량 합계'
+    )
+    active_lot_count = models.PositiveIntegerField(default=0)
+    near_expiry_count = models.PositiveIntegerField(default=0, help_text='as_of_date 기준 7일 내 만료 로트 수')
+    expiring_30d_count = models.PositiveIntegerField(default=0, help_text='as_of_date 기준 30일 내 만료(만료 포함) 로트 수')
+    expired_lot_count = models.PositiveIntegerField(default=0, help_text='as_of_date 기준 만료 로트 수')
+    total_value = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    next_expiry_date = models.DateField(null=True, blank=True)
+    as_of_date = models.DateField(help_text='만료 관련 카운트 기준일 (날짜가 바뀌면 조회 시 재계산)')
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'material_inventory_positions'
+        indexes = [
+            models.Index(fields=['available_quantity'], name='inv_pos_available_idx'),
+            models.Index(fields=['as_of_date'], name='inv_pos_as_of_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.raw_material_id} 재고 {self.on_hand_quantity}"
@@ -0,0 +1,58 @@
+from django.db import models
+from django.utils import timezone
+import uuid
+
+
+class MaterialUsage(models.Model):
+    """원자재 로트 사용 이력 - 로트 ↔ 생산 주문 추적성의 기준 데이터"""
+    
+    USAGE_TYPE_CHOICES = [
+        ('production', '생산 투입'),
+        ('manual', '수동 소비'),
+    ]
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    material_lot = models.ForeignKey(
+        'MaterialLot',
+        on_delete=models.PROTECT,
+        related_name='usages'
+    )
+    raw_material = models.ForeignKey(
+        'RawMaterial',
+        on_delete=models.PROTECT,
+        related_name='usages',
+        help_text='로트의 원자재 (원자재별 집계용 비정규화)'
+    )
+    production_order = models.ForeignKey(
+        'ProductionOrder',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='material_usages'
+    )
+    usage_type = models.CharField(max_length=20, choices=USAGE_TYPE_CHOICES, default='production')
+    quantity = models.DecimalField(max_digits=10, decimal_places=3)
+    unit_price = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        help_text='사용 시점 로트 단가'
+    )
+    used_at = models.DateTimeField(default=timezone.now)
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    created_by = models.ForeignKey(
+        'User',
+        on_delete=models.PROTECT,
+        related_name='created_material_usages'
+    )
+    
+    class Meta:
+        db_table = 'material_usages'
+        indexes = [
+            models.Index(fields=['material_lot', 'used_at'], name='usage_lot_used_idx'),
+            models.Index(fields=['production_order', 'material_lot'], name='usage_order_lot_idx'),
+            models.Index(fields=['raw_material', 'used_at'], name='usage_material_used_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.material_lot_id} → {self.production_order_id or '수동 소비'} ({self.quantity})"
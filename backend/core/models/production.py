@@ -57,6 +57,53 @@ class ProductionOrder(models.Model):
     
     class Meta:
         db_table = 'production_orders'
+        indexes = [
+            models.Index(fields=['status', 'planned_start_date'], name='po_status_start_idx'),
+            models.Index(fields=['status', 'planned_end_date'], name='po_status_end_idx'),
+        ]
         
     def __str__(self):
-        return f"{self.order_number} - {self.finished_product.name}"
\ No newline at end of file
+        return f"{self.order_number} - {self.finished_product.name}"
+
+class ProductionOrderBoardEntry(models.Model):
+    """
+    생산 주문 목록용 읽기 모델 (생산 주문/제품/작업자 저장 시 갱신)
+    - 목록/예정 조회를 조인 없이 이 테이블 한 번 조회로 제공
+    """
+    
+    production_order = models.OneToOneField(
+        ProductionOrder, on_delete=models.CASCADE, primary_key=True, related_name='board_entry'
+    )
+    order_number = models.CharField(max_length=50)
+    finished_product = models.ForeignKey(FinishedProduct, on_delete=models.CASCADE, related_name='+')
+    product_name = models.CharField(max_length=200)
+    product_code = models.CharField(max_length=50)
+    planned_quantity = models.DecimalField(max_digits=10, decimal_places=3)
+    produced_quantity = models.DecimalField(max_digits=10, decimal_places=3)
+    completion_rate = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    planned_start_date = models.DateTimeField()
+    planned_end_date = models.DateTimeField()
+    actual_start_date = models.DateTimeField(null=True, blank=True)
+    actual_end_date = models.DateTimeField(null=True, blank=True)
+    open_deadline = models.DateTimeField(
+        null=True, blank=True,
+        help_text='완료/취소되지 않은 주문의 계획 종료 시각 (지연 여부 판단용)'
+    )
+    status = models.CharField(max_length=20, choices=ProductionOrder.STATUS_CHOICES)
+    priority = models.CharField(max_length=10, choices=ProductionOrder.PRIORITY_CHOICES)
+    assigned_operator = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    assigned_operator_username = models.CharField(max_length=150, blank=True)
+    created_at = models.DateTimeField(help_text='생산 주문 생성 시각')
+    updated_at = models.DateTimeField(help_text='생산 주문 수정 시각')
+    
+    class Meta:
+        db_table = 'production_order_board'
+        indexes = [
+            models.Index(fields=['created_at'], name='pob_created_idx'),
+            models.Index(fields=['status', 'created_at'], name='pob_status_created_idx'),
+            models.Index(fields=['status', 'planned_start_date'], name='pob_status_start_idx'),
+            models.Index(fields=['assigned_operator', 'created_at'], name='pob_operator_created_idx'),
+        ]
+        
+    def __str__(self):
+        return f"{self.order_number} - {self.product_name}"
@@ -25,6 +25,14 @@ class RawMaterial(models.Model):
     shelf_life_days = models.IntegerField(null=True, blank=True)
     allergens = models.TextField(blank=True, help_text='알레르기 유발 요소')
     supplier = models.ForeignKey(Supplier, on_delete=models.PROTECT, related_name='raw_materials')
+    reorder_point = models.DecimalField(
+        max_digits=10, decimal_places=3, null=True, blank=True,
+        help_text='재주문점 (원자재 단위 기준, 미지정 시 기본 임계값 사용)'
+    )
+    safety_stock = models.DecimalField(
+        max_digits=10, decimal_places=3, default=0,
+        help_text='안전 재고 (원자재 단위 기준)'
+    )
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -70,6 +78,19 @@ class MaterialLot(models.Model):
     
     class Meta:
         db_table = 'material_lots'
+        indexes = [
+            # FIFO 할당/원가 계산: 원자재 + 상태 + 품질 조건, 유통기한/입고일 순
+            models.Index(
+                fields=['raw_material', 'status', 'quality_test_passed', 'expiry_date', 'received_date'],
+                name='mlot_material_fifo_idx'
+            ),
+            # 원자재별 입고 이력 (최근 단가/로트 목록)
+            models.Index(fields=['raw_material', 'received_date'], name='mlot_material_received_idx'),
+            # 로트 목록 키셋 페이지네이션 (received_date, id)
+            models.Index(fields=['received_date'], name='mlot_received_idx'),
+            # 상태별 유통기한 임박 조회
+            models.Index(fields=['status', 'expiry_date'], name='mlot_status_expiry_idx'),
+        ]
         
     def __str__(self):
         return f"{self.raw_material.name} - {self.lot_number}"
\ No newline at end of file
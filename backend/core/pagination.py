@@ -0,0 +1,152 @@
+"""
+목록 API 페이지네이션
+- 기본: 페이지 번호 방식 (기존 응답 형식 유지)
+- ?cursor= : 키셋(커서) 방식, 뷰의 keyset_ordering 기준으로 OFFSET 없이 다음 페이지 조회
+- ?count=false : 전체 건수(COUNT) 조회 생략 (무한 스크롤 클라이언트용)
+"""
+import base64
+import json
+from collections import OrderedDict
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    페이지 번호 / 키셋 겸용 페이지네이션
+    - 뷰에 keyset_ordering (예: ('-measured_at', '-id'))이 있어야 커서 방식 사용 가능
+    - 키셋 정렬 컬럼 조합은 인덱스로 뒷받침되어야 함 (InnoDB 보조 인덱스는 PK를 포함)
+    """
+
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.mode = 'page'
+        self.include_count = request.query_params.get(self.count_query_param, 'true').lower() not in ('false', '0')
+
+        keyset_ordering = getattr(view, 'keyset_ordering', None)
+        if keyset_ordering and self.cursor_query_param in request.query_params:
+            self.mode = 'cursor'
+            return self._paginate_keyset(queryset, request, keyset_ordering)
+
+        if not self.include_count:
+            self.mode = 'page_without_count'
+            return self._paginate_without_count(queryset, request)
+
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.mode == 'cursor':
+            response = OrderedDict()
+            if self.include_count:
+                response['count'] = self.total_count
+            response['next'] = self._cursor_link()
+            response['next_cursor'] = self.next_cursor
+            response['results'] = data
+            return Response(response)
+
+        if self.mode == 'page_without_count':
+            return Response(OrderedDict([
+                ('next', self._page_link(self.page_number + 1) if self.has_next else None),
+                ('previous', self._page_link(self.page_number - 1) if self.page_number > 1 else None),
+                ('results', data)
+            ]))
+
+        return super().get_paginated_response(data)
+
+    # 키셋 방식
+
+    def _paginate_keyset(self, queryset, request, keyset_ordering):
+        page_size = self.get_page_size(request)
+        if self.include_count:
+            self.total_count = queryset.count()
+
+        queryset = queryset.order_by(*keyset_ordering)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            values = self._decode_cursor(cursor, keyset_ordering, queryset.model)
+            queryset = queryset.filter(self._after(keyset_ordering, values))
+
+        rows = list(queryset[:page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+
+        self.next_cursor = self._encode_cursor(rows[-1], keyset_ordering) if has_next else None
+        return rows
+
+    def _after(self, keyset_ordering, values):
+        """정렬 키 (a, b, ...) 기준 마지막 행 이후 조건: a 이후 OR (a 같고 b 이후) OR ..."""
+        condition = Q()
+        equal = Q()
+        for ordering, value in zip(keyset_ordering, values):
+            field = ordering.lstrip('-')
+            lookup = 'lt' if ordering.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def _encode_cursor(self, row, keyset_ordering):
+        values = []
+        for ordering in keyset_ordering:
+            value = getattr(row, ordering.lstrip('-'))
+            values.append(value.isoformat() if isinstance(value, datetime) else str(value))
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def _decode_cursor(self, cursor, keyset_ordering, model):
+        """커서 → 정렬 컬럼 값 목록 (형식/타입/범위가 맞지 않으면 404)"""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        except (ValueError, UnicodeDecodeError):
+            raise NotFound('유효하지 않은 커서입니다.')
+        if not isinstance(values, list) or len(values) != len(keyset_ordering):
+            raise NotFound('유효하지 않은 커서입니다.')
+
+        decoded = []
+        for ordering, value in zip(keyset_ordering, values):
+            if not isinstance(value, str):
+                raise NotFound('유효하지 않은 커서입니다.')
+            field = model._meta.get_field(ordering.lstrip('-'))
+            try:
+                value = field.to_python(value)
+                if isinstance(value, datetime) and timezone.is_aware(value):
+                    value.astimezone(dt_timezone.utc)  # DB 저장 기준(UTC) 변환 범위 확인
+            except (ValidationError, TypeError, ValueError, OverflowError):
+                raise NotFound('유효하지 않은 커서입니다.')
+            decoded.append(value)
+        return decoded
+
+    def _cursor_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(self.request.build_absolute_uri(), self.cursor_query_param, self.next_cursor)
+
+    # 건수 생략 페이지 번호 방식
+
+    def _paginate_without_count(self, queryset, request):
+        page_size = self.get_page_size(request)
+        try:
+            self.page_number = max(int(request.query_params.get(self.page_query_param, 1)), 1)
+        except ValueError:
+            raise NotFound('유효하지 않은 페이지입니다.')
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def _page_link(self, page_number):
+        url = self.request.build_absolute_uri()
+        if page_number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, page_number)
@@ -0,0 +1,19 @@
+"""
+실시간 이벤트 푸시 (WebSocket)
+- 브로커: 이벤트 팬아웃 계층 (in-process / Redis 호환 pub/sub 교체 가능)
+- events: 모델 변경 시 트랜잭션 커밋 후 이벤트 발행
+- consumer: ASGI WebSocket 엔드포인트
+"""
+from .brokers import get_broker
+from .events import (
+    publish_ccp_deviation,
+    publish_critical_alert,
+    publish_production_status_change,
+)
+
+__all__ = [
+    'get_broker',
+    'publish_ccp_deviation',
+    'publish_critical_alert',
+    'publish_production_status_change',
+]
@@ -0,0 +1,166 @@
+"""
+실시간 이벤트 팬아웃 브로커
+- InProcessBroker: 같은 프로세스의 WebSocket 연결로 직접 전달 (개발/단일 워커)
+- RedisBroker: Redis 호환 pub/sub 채널을 거쳐 모든 ASGI 워커로 전달
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core.constants import (
+    REALTIME_CLIENT_QUEUE_SIZE,
+    REALTIME_RECONNECT_INITIAL_DELAY_SECONDS,
+    REALTIME_RECONNECT_MAX_DELAY_SECONDS,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """WebSocket 연결 하나의 이벤트 수신 큐 (이벤트 루프 스레드 소유)"""
+
+    def __init__(self, topics, loop=None):
+        self.topics = set(topics)
+        self.loop = loop or asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=REALTIME_CLIENT_QUEUE_SIZE)
+
+    def _put(self, message):
+        # 느린 클라이언트 때문에 다른 연결이 막히지 않도록 가장 오래된 이벤트를 버림
+        if self.queue.full():
+            self.queue.get_nowait()
+        self.queue.put_nowait(message)
+
+    def deliver(self, message):
+        """임의 스레드에서 호출 가능"""
+        if message['topic'] in self.topics:
+            self.loop.call_soon_threadsafe(self._put, message)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class InProcessBroker:
+    """프로세스 내 구독자에게 직접 팬아웃"""
+
+    def __init__(self):
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def publish(self, topic, payload):
+        self.dispatch({'topic': topic, 'payload': payload})
+
+    def dispatch(self, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.deliver(message)
+            except RuntimeError:
+                # 이벤트 루프가 이미 종료된 연결
+                self.unsubscribe(subscription)
+
+    def subscribe(self, topics):
+        subscription = Subscription(topics)
+        with self._lock:
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+
+
+class RedisBroker(InProcessBroker):
+    """
+    Redis 호환 pub/sub 브로커
+    - publish: 채널에 JSON 발행 (WSGI/관리 명령 등 어느 프로세스에서든 가능)
+    - subscribe: 첫 구독 시 리스너 스레드를 띄워 채널 메시지를 로컬 구독자에게 전달
+    - 연결이 끊기면 리스너 스레드가 지수 백오프로 재연결 (기존 WebSocket 연결 유지)
+    """
+
+    def __init__(self, url, channel):
+        super().__init__()
+        try:
+            import redis
+        except ImportError as exc:
+            raise ImproperlyConfigured(
+                "REALTIME_BROKER='redis' 사용 시 redis 패키지 설치가 필요합니다."
+            ) from exc
+        self.channel = channel
+        self._client = redis.Redis.from_url(url)
+        self._listener = None
+
+    def publish(self, topic, payload):
+        message = json.dumps({'topic': topic, 'payload': payload}, cls=DjangoJSONEncoder)
+        try:
+            self._client.publish(self.channel, message)
+        except Exception:
+            # 실시간 푸시 실패가 측정값 저장/생산 처리를 막지 않도록 기록만 남김
+            logger.exception('실시간 이벤트 발행 실패: %s', topic)
+
+    def subscribe(self, topics):
+        subscription = super().subscribe(topics)
+        self._ensure_listener()
+        return subscription
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen, name='realtime-redis-listener', daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self):
+        """채널 수신 루프 (연결 오류 시 백오프 후 재구독, 수신 성공 시 대기 시간 초기화)"""
+        delay = REALTIME_RECONNECT_INITIAL_DELAY_SECONDS
+        while True:
+            pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                delay = REALTIME_RECONNECT_INITIAL_DELAY_SECONDS
+                for item in pubsub.listen():
+                    try:
+                        self.dispatch(json.loads(item['data']))
+                    except (ValueError, KeyError):
+                        logger.warning('잘못된 실시간 이벤트 메시지 무시')
+            except Exception:
+                logger.exception('실시간 이벤트 채널 수신 중단, %s초 후 재연결', delay)
+            finally:
+                try:
+                    pubsub.close()
+                except Exception:
+                    pass
+            time.sleep(delay)
+            delay = min(delay * 2, REALTIME_RECONNECT_MAX_DELAY_SECONDS)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """설정(REALTIME_BROKER)에 따른 프로세스 단일 브로커"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = getattr(settings, 'REALTIME_BROKER', 'inprocess')
+                if backend == 'inprocess':
+                    _broker = InProcessBroker()
+                elif backend == 'redis':
+                    _broker = RedisBroker(
+                        url=settings.REALTIME_REDIS_URL,
+                        channel=f'{settings.REALTIME_CHANNEL_PREFIX}:events'
+                    )
+                else:
+                    raise ImproperlyConfigured(f'지원하지 않는 REALTIME_BROKER: {backend}')
+    return _broker
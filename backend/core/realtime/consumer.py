@@ -0,0 +1,97 @@
+"""
+ASGI WebSocket 엔드포인트
+- 연결: ws://<host>/ws/events/?token=<JWT access token>&topics=ccp_deviation,critical_alert
+- 서버 → 클라이언트: {"topic": "...", "payload": {...}} JSON 텍스트 프레임
+- 클라이언트 → 서버: "ping" 문자열에 "pong" 응답 (연결 유지 확인용)
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, AuthenticationFailed
+
+from core.constants import REALTIME_TOPICS
+from .brokers import get_broker
+
+
+# 중요 알림은 get_critical_alerts와 동일하게 관리자/품질관리자만 수신
+TOPIC_ROLES = {
+    'critical_alert': ['admin', 'quality_manager'],
+}
+
+# WebSocket 종료 코드 (4000번대: 애플리케이션 정의)
+CLOSE_UNAUTHORIZED = 4401
+CLOSE_FORBIDDEN = 4403
+
+
+def _authenticate(raw_token):
+    authentication = JWTAuthentication()
+    validated_token = authentication.get_validated_token(raw_token)
+    return authentication.get_user(validated_token)
+
+
+def _allowed_topics(user, requested):
+    topics = [topic for topic in requested if topic in REALTIME_TOPICS]
+    return [
+        topic for topic in topics
+        if topic not in TOPIC_ROLES or user.role in TOPIC_ROLES[topic]
+    ]
+
+
+async def websocket_events(scope, receive, send):
+    """실시간 이벤트 푸시 WebSocket 애플리케이션"""
+    message = await receive()
+    if message['type'] != 'websocket.connect':
+        return
+
+    query = parse_qs(scope.get('query_string', b'').decode())
+    raw_token = (query.get('token') or [''])[0]
+    try:
+        user = await sync_to_async(_authenticate)(raw_token)
+    except (InvalidToken, AuthenticationFailed):
+        await send({'type': 'websocket.close', 'code': CLOSE_UNAUTHORIZED})
+        return
+
+    requested = query['topics'][0].split(',') if query.get('topics') else REALTIME_TOPICS
+    topics = _allowed_topics(user, requested)
+    if not topics:
+        await send({'type': 'websocket.close', 'code': CLOSE_FORBIDDEN})
+        return
+
+    broker = get_broker()
+    subscription = broker.subscribe(topics)
+    await send({'type': 'websocket.accept'})
+    await send({
+        'type': 'websocket.send',
+        'text': json.dumps({'topic': 'subscribed', 'payload': {'topics': topics}}),
+    })
+
+    receive_task = asyncio.ensure_future(receive())
+    event_task = asyncio.ensure_future(subscription.get())
+    try:
+        while True:
+            done, _ = await asyncio.wait(
+                {receive_task, event_task}, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            if receive_task in done:
+                incoming = receive_task.result()
+                if incoming['type'] == 'websocket.disconnect':
+                    break
+                if incoming.get('text') == 'ping':
+                    await send({'type': 'websocket.send', 'text': 'pong'})
+                receive_task = asyncio.ensure_future(receive())
+
+            if event_task in done:
+                await send({
+                    'type': 'websocket.send',
+                    'text': json.dumps(event_task.result(), cls=DjangoJSONEncoder),
+                })
+                event_task = asyncio.ensure_future(subscription.get())
+    finally:
+        broker.unsubscribe(subscription)
+        for task in (receive_task, event_task):
+            task.cancel()
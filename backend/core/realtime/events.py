@@ -0,0 +1,57 @@
+"""
+실시간 이벤트 발행
+- 트랜잭션 커밋 이후에만 발행 (롤백된 데이터가 단말에 표시되지 않도록)
+- 페이로드는 JSON 직렬화 가능한 값만 사용
+"""
+from django.db import transaction
+
+from .brokers import get_broker
+
+
+def _publish_on_commit(topic, payload):
+    transaction.on_commit(lambda: get_broker().publish(topic, payload))
+
+
+def publish_ccp_deviation(log, ccp=None):
+    """기준 이탈 CCP 로그 이벤트"""
+    ccp = ccp or log.ccp
+    _publish_on_commit('ccp_deviation', {
+        'log_id': str(log.id),
+        'ccp_id': str(ccp.id),
+        'ccp_code': ccp.code,
+        'ccp_name': ccp.name,
+        'production_order_id': str(log.production_order_id) if log.production_order_id else None,
+        'measured_value': str(log.measured_value),
+        'unit': log.unit,
+        'critical_limit_min': str(ccp.critical_limit_min) if ccp.critical_limit_min is not None else None,
+        'critical_limit_max': str(ccp.critical_limit_max) if ccp.critical_limit_max is not None else None,
+        'status': log.status,
+        'measured_at': log.measured_at.isoformat(),
+    })
+
+
+def publish_critical_alert(streak, ccp=None):
+    """연속 기준 이탈 임계 도달 알림 (get_critical_alerts의 consecutive_deviation과 동일 형식)"""
+    ccp = ccp or streak.ccp
+    _publish_on_commit('critical_alert', {
+        'type': 'consecutive_deviation',
+        'severity': 'critical',
+        'message': f'{ccp.name} 연속 {streak.current_run}회 기준 이탈',
+        'ccp_code': ccp.code,
+        'consecutive_count': streak.current_run,
+        'run_started_at': streak.run_started_at.isoformat() if streak.run_started_at else None,
+        'last_measured_at': streak.last_measured_at.isoformat() if streak.last_measured_at else None,
+    })
+
+
+def publish_production_status_change(order, previous_status):
+    """생산 주문 상태 변경 이벤트"""
+    _publish_on_commit('production_status', {
+        'production_order_id': str(order.id),
+        'order_number': order.order_number,
+        'previous_status': previous_status,
+        'status': order.status,
+        'status_display': order.get_status_display(),
+        'produced_quantity': str(order.produced_quantity) if order.produced_quantity is not None else None,
+        'changed_at': order.updated_at.isoformat() if order.updated_at else None,
+    })
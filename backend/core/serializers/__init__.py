@@ -2,8 +2,8 @@ from .user_serializers import UserSerializer, UserCreateSerializer, UserUpdateSe
 from .supplier_serializers import SupplierSerializer, SupplierCreateSerializer, SupplierUpdateSerializer  
 from .raw_material_serializers import RawMaterialSerializer, RawMaterialCreateSerializer, MaterialLotSerializer, MaterialLotCreateSerializer
 from .product_serializers import FinishedProductSerializer, FinishedProductCreateSerializer, FinishedProductUpdateSerializer
-from .production_serializers import ProductionOrderSerializer, ProductionOrderCreateSerializer, ProductionOrderUpdateSerializer
-from .haccp_serializers import CCPSerializer, CCPCreateSerializer, CCPLogSerializer, CCPLogCreateSerializer, CCPLogUpdateSerializer
+from .production_serializers import ProductionOrderSerializer, ProductionOrderBoardSerializer, ProductionOrderCreateSerializer, ProductionOrderUpdateSerializer
+from .haccp_serializers import CCPSerializer, CCPCreateSerializer, CCPLogSerializer, CCPLogListSerializer, CCPLogCreateSerializer, CCPLogUpdateSerializer
 
 __all__ = [
     'UserSerializer',
@@ -18,6 +18,8 @@ __all__ = [
     'MaterialLotCreateSerializer', 
     'FinishedProductSerializer',
     'ProductionOrderSerializer',
+    'ProductionOrderBoardSerializer',
     'CCPSerializer',
     'CCPLogSerializer',
+    'CCPLogListSerializer',
 ]
\ No newline at end of file
@@ -29,34 +29,36 @@ class CCPSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'created_by']
     
+    def _statistics(self, obj):
+        """
+        로그 통계 주석 (HaccpQueryService.with_log_statistics)
+        - 주석 없이 전달된 CCP는 해당 CCP만 한 번 조회해 보완
+        """
+        if not hasattr(obj, 'recent_log_count'):
+            from core.services.haccp_service import HaccpQueryService
+            annotated = HaccpQueryService().with_log_statistics(CCP.objects.filter(pk=obj.pk)).values(
+                'total_log_count', 'recent_log_count', 'recent_within_limits_count',
+                'recent_corrective_action_count'
+            ).get()
+            for field, value in annotated.items():
+                setattr(obj, field, value)
+        return obj
+    
     def get_total_logs(self, obj):
         """총 로그 수"""
-        return obj.logs.count()
+        return self._statistics(obj).total_log_count
     
     def get_out_of_limits_count(self, obj):
-        """기준 이탈 로그 수 (최근 30일)"""
-        from datetime import timedelta
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        return obj.logs.filter(
-            measured_at__gte=thirty_days_ago,
-            status='out_of_limits'
-        ).count()
+        """기준 이탈 로그 수 (최근 30일, 개선조치 입력 전)"""
+        stats = self._statistics(obj)
+        return stats.recent_log_count - stats.recent_within_limits_count - stats.recent_corrective_action_count
     
     def get_compliance_rate(self, obj):
         """규정 준수율 (최근 30일, 백분율)"""
-        from datetime import timedelta
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        
-        total_logs = obj.logs.filter(measured_at__gte=thirty_days_ago).count()
-        if total_logs == 0:
+        stats = self._statistics(obj)
+        if stats.recent_log_count == 0:
             return None
-            
-        within_limits_count = obj.logs.filter(
-            measured_at__gte=thirty_days_ago,
-            status='within_limits'
-        ).count()
-        
-        return round((within_limits_count / total_logs) * 100, 2)
+        return round((stats.recent_within_limits_count / stats.recent_log_count) * 100, 2)
 
 
 class CCPCreateSerializer(serializers.ModelSerializer):
@@ -113,8 +115,26 @@ class CCPCreateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+def calculate_deviation_percentage(log):
+    """한계 기준 대비 편차율 (하한 미달은 음수, 상한 초과는 양수, 기준 내는 0)"""
+    if log.status == 'within_limits':
+        return 0
+        
+    ccp = log.ccp
+    measured = float(log.measured_value)
+    
+    if ccp.critical_limit_min is not None and measured < float(ccp.critical_limit_min):
+        deviation = ((float(ccp.critical_limit_min) - measured) / float(ccp.critical_limit_min)) * 100
+        return round(-deviation, 2)  # 음수로 표시 (하한값 미달)
+    elif ccp.critical_limit_max is not None and measured > float(ccp.critical_limit_max):
+        deviation = ((measured - float(ccp.critical_limit_max)) / float(ccp.critical_limit_max)) * 100
+        return round(deviation, 2)  # 양수로 표시 (상한값 초과)
+        
+    return 0
+
+
 class CCPLogSerializer(serializers.ModelSerializer):
-    """CCP 모니터링 로그 조회용 Serializer"""
+    """CCP 모니터링 로그 조회용 Serializer (중첩 상세 형식)"""
     
     ccp = CCPSerializer(read_only=True)
     production_order = ProductionOrderSerializer(read_only=True)
@@ -139,20 +159,7 @@ class CCPLogSerializer(serializers.ModelSerializer):
     
     def get_deviation_percentage(self, obj):
         """한계 기준 대비 편차율 계산"""
-        if obj.status == 'within_limits':
-            return 0
-            
-        ccp = obj.ccp
-        measured = float(obj.measured_value)
-        
-        if ccp.critical_limit_min is not None and measured < float(ccp.critical_limit_min):
-            deviation = ((float(ccp.critical_limit_min) - measured) / float(ccp.critical_limit_min)) * 100
-            return round(-deviation, 2)  # 음수로 표시 (하한값 미달)
-        elif ccp.critical_limit_max is not None and measured > float(ccp.critical_limit_max):
-            deviation = ((measured - float(ccp.critical_limit_max)) / float(ccp.critical_limit_max)) * 100
-            return round(deviation, 2)  # 양수로 표시 (상한값 초과)
-            
-        return 0
+        return calculate_deviation_percentage(obj)
     
     def get_time_since_measurement(self, obj):
         """측정 후 경과시간 (시간 단위)"""
@@ -160,6 +167,62 @@ class CCPLogSerializer(serializers.ModelSerializer):
         return round(time_diff.total_seconds() / 3600, 2)
 
 
+class CCPLogListSerializer(serializers.ModelSerializer):
+    """
+    CCP 모니터링 로그 목록용 Serializer (평면 형식)
+    - RELATED_FIELDS select_related 조인 값만 사용하여 행별 추가 쿼리 없음
+    - 중첩 상세 형식(CCPLogSerializer)은 ?detail=full 요청 시에만 사용
+    """
+    
+    RELATED_FIELDS = ('ccp', 'production_order', 'created_by', 'corrective_action_by', 'verified_by')
+    
+    ccp_code = serializers.CharField(source='ccp.code', read_only=True)
+    ccp_name = serializers.CharField(source='ccp.name', read_only=True)
+    ccp_type = serializers.CharField(source='ccp.ccp_type', read_only=True)
+    ccp_type_display = serializers.CharField(source='ccp.get_ccp_type_display', read_only=True)
+    ccp_process_step = serializers.CharField(source='ccp.process_step', read_only=True)
+    critical_limit_min = serializers.DecimalField(
+        source='ccp.critical_limit_min', max_digits=10, decimal_places=3, read_only=True, allow_null=True
+    )
+    critical_limit_max = serializers.DecimalField(
+        source='ccp.critical_limit_max', max_digits=10, decimal_places=3, read_only=True, allow_null=True
+    )
+    production_order_number = serializers.CharField(
+        source='production_order.order_number', read_only=True, allow_null=True
+    )
+    created_by_username = serializers.CharField(source='created_by.username', read_only=True)
+    corrective_action_by_username = serializers.CharField(
+        source='corrective_action_by.username', read_only=True, allow_null=True
+    )
+    verified_by_username = serializers.CharField(
+        source='verified_by.username', read_only=True, allow_null=True
+    )
+    
+    # 계산 필드
+    deviation_percentage = serializers.SerializerMethodField()
+    time_since_measurement = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = CCPLog
+        fields = [
+            'id', 'ccp', 'ccp_code', 'ccp_name', 'ccp_type', 'ccp_type_display', 'ccp_process_step',
+            'critical_limit_min', 'critical_limit_max', 'production_order', 'production_order_number',
+            'measured_value', 'unit', 'measured_at', 'status', 'is_within_limits',
+            'deviation_notes', 'corrective_action_taken', 'corrective_action_by',
+            'corrective_action_by_username', 'verified_by', 'verified_by_username', 'verification_date',
+            'measurement_device', 'deviation_percentage', 'time_since_measurement',
+            'created_at', 'created_by', 'created_by_username'
+        ]
+        read_only_fields = fields
+    
+    def get_deviation_percentage(self, obj):
+        return calculate_deviation_percentage(obj)
+    
+    def get_time_since_measurement(self, obj):
+        time_diff = timezone.now() - obj.measured_at
+        return round(time_diff.total_seconds() / 3600, 2)
+
+
 class CCPLogCreateSerializer(serializers.ModelSerializer):
     """CCP 로그 생성용 Serializer - 불변 데이터이므로 생성만 가능"""
     
@@ -25,15 +25,33 @@ class FinishedProductSerializer(serializers.ModelSerializer):
             'estimated_unit_cost', 'cost_calculation_status'
         ]
     
+    def _get_cost_info(self, obj):
+        """
+        제품 원가 계산 결과
+        - 목록 조회: 뷰에서 페이지 단위로 계산한 context['product_costs'] 사용
+        - 그 외: 제품별 1회 계산 후 두 필드가 공유
+        """
+        product_costs = self.context.get('product_costs')
+        if product_costs is not None and obj.id in product_costs:
+            return product_costs[obj.id]
+        
+        if not hasattr(self, '_cost_cache'):
+            self._cost_cache = {}
+        if obj.id not in self._cost_cache:
+            from ..services.cost_calculation_service import CostCalculationService
+            self._cost_cache[obj.id] = CostCalculationService.calculate_product_cost(str(obj.id))
+        return self._cost_cache[obj.id]
+    
     def get_has_bom(self, obj):
-        """BOM 설정 여부 확인"""
+        """BOM 설정 여부 확인 (목록 조회 시 has_active_bom 어노테이션 사용)"""
+        if hasattr(obj, 'has_active_bom'):
+            return obj.has_active_bom
         return obj.bom_items.filter(is_active=True).exists()
     
     def get_estimated_unit_cost(self, obj):
         """예상 단위 원가 계산"""
         try:
-            from ..services.cost_calculation_service import CostCalculationService
-            cost_info = CostCalculationService.calculate_product_cost(str(obj.id))
+            cost_info = self._get_cost_info(obj)
             return str(cost_info['unit_cost'])
         except Exception:
             return "0"
@@ -41,8 +59,7 @@ class FinishedProductSerializer(serializers.ModelSerializer):
     def get_cost_calculation_status(self, obj):
         """원가 계산 상태 정보"""
         try:
-            from ..services.cost_calculation_service import CostCalculationService
-            cost_info = CostCalculationService.calculate_product_cost(str(obj.id))
+            cost_info = self._get_cost_info(obj)
             return {
                 'bom_missing': cost_info['bom_missing'],
                 'calculation_method': cost_info['calculation_method'],
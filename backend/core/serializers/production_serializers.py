@@ -1,6 +1,6 @@
 from rest_framework import serializers
 from django.utils import timezone
-from core.models import ProductionOrder
+from core.models import ProductionOrder, ProductionOrderBoardEntry
 from .user_serializers import UserSerializer
 from .product_serializers import FinishedProductSerializer
 
@@ -56,6 +56,33 @@ class ProductionOrderSerializer(serializers.ModelSerializer):
         return None
 
 
+
+class ProductionOrderBoardSerializer(serializers.ModelSerializer):
+    """
+    생산오더 목록용 Serializer (평면 형식)
+    - 목록 읽기 모델(ProductionOrderBoardEntry) 컬럼만 사용하여 조인/행별 계산 없음
+    - is_overdue는 조회 쿼리 주석값 (ProductionBoardService.annotate_overdue)
+    - 중첩 상세 형식(ProductionOrderSerializer)은 ?detail=full 요청 시에만 사용
+    """
+    
+    id = serializers.UUIDField(source='production_order_id', read_only=True)
+    completion_rate = serializers.DecimalField(
+        max_digits=16, decimal_places=2, read_only=True, coerce_to_string=False
+    )
+    is_overdue = serializers.BooleanField(read_only=True)
+    
+    class Meta:
+        model = ProductionOrderBoardEntry
+        fields = [
+            'id', 'order_number', 'finished_product', 'product_name', 'product_code',
+            'planned_quantity', 'produced_quantity', 'completion_rate',
+            'planned_start_date', 'planned_end_date', 'actual_start_date', 'actual_end_date',
+            'status', 'priority', 'assigned_operator', 'assigned_operator_username',
+            'is_overdue', 'created_at', 'updated_at'
+        ]
+        read_only_fields = fields
+
+
 class ProductionOrderCreateSerializer(serializers.ModelSerializer):
     """생산오더 생성용 Serializer"""
     
@@ -6,7 +6,12 @@ from .supplier_serializers import SupplierSerializer
 
 
 class RawMaterialSerializer(serializers.ModelSerializer):
-    """원자재 카탈로그 조회용 Serializer"""
+    """
+    원자재 카탈로그 조회용 Serializer
+    - 목록 뷰는 페이지 단위 재고 현황을 context['inventory_positions']로 전달
+    """
+    
+    RELATED_FIELDS = ('supplier__created_by', 'created_by')
     
     supplier = SupplierSerializer(read_only=True)
     created_by = UserSerializer(read_only=True)
@@ -19,47 +24,28 @@ class RawMaterialSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'name', 'code', 'category', 'description', 'unit',
             'storage_temp_min', 'storage_temp_max', 'shelf_life_days', 
-            'allergens', 'supplier', 'is_active', 'inventory_info',
+            'allergens', 'supplier', 'reorder_point', 'safety_stock', 'is_active', 'inventory_info',
             'created_at', 'updated_at', 'created_by'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'created_by']
     
     def get_inventory_info(self, obj):
-        """재고 정보 계산"""
-        from datetime import date, timedelta
-        from django.db.models import Sum
-        
-        # 활성 로트들 (received, in_storage, in_use 상태이고 수량이 있는 것)
-        active_lots = obj.lots.filter(
-            status__in=['received', 'in_storage', 'in_use'],
-            quantity_current__gt=0
-        )
-        
-        # 총 수량
-        total_quantity = active_lots.aggregate(
-            total=Sum('quantity_current')
-        )['total'] or 0
-        
-        # 활성 로트 수
-        active_lots_count = active_lots.count()
-        
-        # 7일 내 만료 로트 수
-        seven_days_later = date.today() + timedelta(days=7)
-        near_expiry_count = active_lots.filter(
-            expiry_date__lte=seven_days_later,
-            expiry_date__gte=date.today()
-        ).count()
+        """재고 정보 (원자재별 재고 현황 테이블 기준)"""
+        from django.utils import timezone
+        from core.services.inventory_service import InventoryPositionService
         
-        # 총 재고 가치 (단가가 있는 로트만)
-        total_value = 0
-        for lot in active_lots.filter(unit_price__isnull=False):
-            total_value += float(lot.unit_price * lot.quantity_current)
+        positions = self.context.get('inventory_positions')
+        position = positions.get(obj.id) if positions is not None else None
+        if position is None:
+            position = getattr(obj, 'inventory_position', None)
+        if position is None or position.as_of_date < timezone.localdate():
+            position = InventoryPositionService().get_position(obj)
         
         return {
-            'totalQuantity': float(total_quantity),
-            'activeLots': active_lots_count,
-            'nearExpiry': near_expiry_count,
-            'totalValue': total_value
+            'totalQuantity': float(position.on_hand_quantity),
+            'activeLots': position.active_lot_count,
+            'nearExpiry': position.near_expiry_count,
+            'totalValue': float(position.total_value)
         }
 
 
@@ -73,7 +59,7 @@ class RawMaterialCreateSerializer(serializers.ModelSerializer):
         fields = [
             'name', 'code', 'category', 'description', 'unit',
             'storage_temp_min', 'storage_temp_max', 'shelf_life_days',
-            'allergens', 'supplier_id', 'is_active'
+            'allergens', 'supplier_id', 'reorder_point', 'safety_stock', 'is_active'
         ]
         
     def validate_code(self, value):
@@ -96,6 +82,15 @@ class RawMaterialCreateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({
                     'storage_temp_min': '최소 온도는 최대 온도보다 낮아야 합니다.'
                 })
+        
+        reorder_point = attrs.get('reorder_point')
+        safety_stock = attrs.get('safety_stock')
+        
+        if reorder_point is not None and safety_stock is not None:
+            if safety_stock > reorder_point:
+                raise serializers.ValidationError({
+                    'safety_stock': '안전 재고는 재주문점보다 클 수 없습니다.'
+                })
         return attrs
     
     def create(self, validated_data):
@@ -110,7 +105,15 @@ class RawMaterialCreateSerializer(serializers.ModelSerializer):
 
 
 class MaterialLotSerializer(serializers.ModelSerializer):
-    """원자재 로트 조회용 Serializer - 추적성 정보 포함"""
+    """
+    원자재 로트 조회용 Serializer - 추적성 정보 포함
+    - RELATED_FIELDS select_related와 context['inventory_positions']로 행별 추가 쿼리 없음
+    """
+    
+    RELATED_FIELDS = (
+        'raw_material__supplier__created_by', 'raw_material__created_by',
+        'supplier__created_by', 'created_by'
+    )
     
     raw_material = RawMaterialSerializer(read_only=True)
     supplier = SupplierSerializer(read_only=True)
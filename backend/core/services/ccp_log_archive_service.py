@@ -0,0 +1,188 @@
+import gzip
+import os
+from operator import attrgetter
+from datetime import date, datetime, time, timezone as dt_timezone
+
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from core.constants import CCP_LOG_HOT_RETENTION_MONTHS, CCP_LOG_ARCHIVE_BATCH_SIZE
+from core.models import CCPLog, CCPLogArchive, CCPLogArchiveBatch
+from core.services.ccp_log_export_service import CCPLogExportService
+
+
+# 보관 테이블로 그대로 복사하는 CCPLog 컬럼 (FK는 *_id)
+ARCHIVE_FIELDS = [field.attname for field in CCPLog._meta.concrete_fields]
+
+
+def month_start(value):
+    """UTC 기준 월 시작 시각"""
+    return value.astimezone(dt_timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value, months):
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _as_datetime(value):
+    """조회 시작 조건(datetime/date/문자열)을 aware datetime으로 변환, 해석 불가 시 None"""
+    if isinstance(value, str):
+        value = parse_datetime(value) or parse_date(value)
+    if isinstance(value, datetime):
+        return value if timezone.is_aware(value) else timezone.make_aware(value)
+    if isinstance(value, date):
+        return datetime.combine(value, time.min, tzinfo=dt_timezone.utc)
+    return None
+
+
+def archived_until():
+    """보관 테이블로 이관된(이관 중 포함) 마지막 월의 종료 시각, 없으면 None"""
+    return CCPLogArchiveBatch.objects.aggregate(until=Max('period_end'))['until']
+
+
+def ccp_log_models(date_from=None):
+    """
+    조회 기간에 해당하는 CCP 로그 모델 목록
+    - 시작 조건이 없거나(해석 불가 포함) 이관 경계 이전이면 보관 테이블 포함
+    """
+    until = archived_until()
+    if until is None:
+        return [CCPLog]
+    start = _as_datetime(date_from)
+    if start is None or start < until:
+        return [CCPLog, CCPLogArchive]
+    return [CCPLog]
+
+
+class CCPLogUnion:
+    """
+    원본 + 보관 CCP 로그 쿼리셋을 하나의 정렬된 목록처럼 다루는 래퍼
+    - 페이지네이션이 사용하는 count() / order_by() / filter() / 슬라이싱만 지원
+    - 슬라이싱은 각 쿼리셋에서 정렬 기준 상위 stop건만 읽어 메모리에서 병합
+    - 두 모델은 같은 컬럼 구성이므로 목록 Serializer를 그대로 사용
+    """
+
+    ordered = True
+
+    def __init__(self, querysets, ordering):
+        self.querysets = list(querysets)
+        self.ordering = tuple(ordering)
+        self.model = self.querysets[0].model  # 정렬/커서 컬럼 정의 (두 모델 동일)
+
+    def count(self):
+        return sum(queryset.count() for queryset in self.querysets)
+
+    def order_by(self, *ordering):
+        return CCPLogUnion(self.querysets, ordering)
+
+    def filter(self, *args, **kwargs):
+        return CCPLogUnion([queryset.filter(*args, **kwargs) for queryset in self.querysets], self.ordering)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice) or index.stop is None or index.step is not None:
+            raise TypeError('CCPLogUnion은 [start:stop] 슬라이싱만 지원합니다.')
+        start = index.start or 0
+        rows = []
+        for queryset in self.querysets:
+            rows.extend(queryset.order_by(*self.ordering)[:index.stop])
+        for ordering in reversed(self.ordering):
+            rows.sort(key=attrgetter(ordering.lstrip('-')), reverse=ordering.startswith('-'))
+        return rows[start:index.stop]
+
+
+class CCPLogArchiveService:
+    """
+    CCP 로그 월 단위 보관 이관
+    - 보존 기간이 지난 닫힌 월의 로그를 압축 보관 테이블로 옮기고 월별 gzip CSV로 내보냄
+    - 이관 이력을 먼저 기록하므로 이관 도중에도 조회 서비스는 두 테이블을 함께 읽음
+    - 시간/일 집계 테이블은 그대로 유지 (이관 여부와 무관하게 집계 조회 가능)
+    """
+
+    def archivable_months(self, retention_months=CCP_LOG_HOT_RETENTION_MONTHS):
+        """원본 테이블에 로그가 남아 있는 보존 기간 이전 월 시작 시각 목록 (오래된 순)"""
+        cutoff = add_months(month_start(timezone.now()), -retention_months)
+        return list(
+            CCPLog.objects.filter(measured_at__lt=cutoff).annotate(
+                month=TruncMonth('measured_at', tzinfo=dt_timezone.utc)
+            ).values_list('month', flat=True).distinct().order_by('month')
+        )
+
+    def archive_month(self, period_start, export_dir=None, batch_size=CCP_LOG_ARCHIVE_BATCH_SIZE):
+        """
+        한 달치 로그 이관 (중단 후 재실행 시 남은 행부터 이어서 처리)
+
+        Args:
+            period_start: 이관 월 (해당 월의 임의 시각)
+            export_dir: 월별 압축 CSV 저장 디렉터리 (None이면 파일 생략)
+            batch_size: 트랜잭션 한 번에 이관할 행 수
+        """
+        period_start = month_start(period_start)
+        period_end = add_months(period_start, 1)
+        if period_end > month_start(timezone.now()):
+            raise ValidationError('진행 중인 월의 CCP 로그는 보관할 수 없습니다.')
+
+        batch, _ = CCPLogArchiveBatch.objects.get_or_create(
+            period_start=period_start,
+            defaults={'period_end': period_end}
+        )
+
+        moved = 0
+        while True:
+            count = self._move_chunk(period_start, period_end, batch_size)
+            if not count:
+                break
+            moved += count
+
+        archived = CCPLogArchive.objects.filter(measured_at__gte=period_start, measured_at__lt=period_end)
+        batch.log_count = archived.count()
+        if export_dir:
+            batch.export_path = self._export(archived, period_start, export_dir)
+        batch.completed_at = timezone.now()
+        batch.save()
+
+        return {
+            'period_start': period_start,
+            'moved_count': moved,
+            'log_count': batch.log_count,
+            'export_path': batch.export_path
+        }
+
+    @transaction.atomic
+    def _move_chunk(self, period_start, period_end, batch_size):
+        """
+        원본 행 잠금 → 보관 테이블 삽입 → 원본 삭제 (한 트랜잭션)
+        - 원본 삭제는 행별 조회/삭제 시그널 없이 DELETE 한 번 (CCPLog를 참조하는 모델 없음)
+        - 대시보드 스냅샷은 청크당 한 번 무효화
+        """
+        from core.services.dashboard_service import DashboardSnapshotService  # 순환 import 방지
+
+        rows = list(
+            CCPLog.objects.select_for_update().filter(
+                measured_at__gte=period_start,
+                measured_at__lt=period_end
+            ).order_by('measured_at', 'id').values(*ARCHIVE_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0
+
+        CCPLogArchive.objects.bulk_create([CCPLogArchive(**row) for row in rows])
+        moved = CCPLog.objects.filter(id__in=[row['id'] for row in rows])
+        moved._raw_delete(moved.db)
+        DashboardSnapshotService().invalidate_haccp()
+        return len(rows)
+
+    def _export(self, queryset, period_start, export_dir):
+        """월별 gzip CSV 작성 (임시 파일에 쓴 뒤 교체)"""
+        os.makedirs(export_dir, exist_ok=True)
+        path = os.path.join(export_dir, f'ccp_logs_{period_start:%Y_%m}.csv.gz')
+        temp_path = f'{path}.tmp'
+        with gzip.open(temp_path, 'wt', encoding='utf-8', newline='') as output:
+            for line in CCPLogExportService().stream_csv(queryset):
+                output.write(line)
+        os.replace(temp_path, path)
+        return path
@@ -0,0 +1,86 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from core.constants import CCP_LOG_EXPORT_CHUNK_SIZE
+
+
+class _Echo:
+    """csv.writer가 쓴 한 줄을 그대로 돌려주는 의사 버퍼"""
+
+    def write(self, value):
+        return value
+
+
+class CCPLogExportService:
+    """
+    감사용 CCP 로그 대량 내보내기 (CSV / NDJSON 스트리밍)
+    - values() 조인 조회를 (measured_at, id) 키셋 단위로 나눠 읽어 메모리 사용량 일정 유지
+      (MySQL 드라이버는 서버 측 커서 스트리밍을 지원하지 않아 iterator()만으로는 결과 전체를 적재함)
+    - 행별 Serializer/모델 인스턴스 생성 없음
+    - CCPLog / CCPLogArchive 쿼리셋 모두 지원 (같은 컬럼 구성)
+    """
+
+    # (헤더, values() 필드)
+    COLUMNS = [
+        ('id', 'id'),
+        ('measured_at', 'measured_at'),
+        ('ccp_code', 'ccp__code'),
+        ('ccp_name', 'ccp__name'),
+        ('ccp_type', 'ccp__ccp_type'),
+        ('measured_value', 'measured_value'),
+        ('unit', 'unit'),
+        ('status', 'status'),
+        ('is_within_limits', 'is_within_limits'),
+        ('deviation_notes', 'deviation_notes'),
+        ('corrective_action_taken', 'corrective_action_taken'),
+        ('corrective_action_by', 'corrective_action_by__username'),
+        ('verified_by', 'verified_by__username'),
+        ('verification_date', 'verification_date'),
+        ('production_order', 'production_order__order_number'),
+        ('measurement_device', 'measurement_device'),
+        ('created_by', 'created_by__username'),
+        ('created_at', 'created_at'),
+    ]
+
+    def iter_rows(self, queryset, chunk_size=CCP_LOG_EXPORT_CHUNK_SIZE):
+        """측정 시각 오름차순으로 (헤더 순서) 튜플 행 생성"""
+        fields = [field for _, field in self.COLUMNS]
+        queryset = queryset.order_by('measured_at', 'id').values_list(*fields)
+
+        last = None
+        while True:
+            chunk = queryset
+            if last is not None:
+                measured_at, log_id = last
+                chunk = chunk.filter(
+                    Q(measured_at__gt=measured_at) | Q(measured_at=measured_at, id__gt=log_id)
+                )
+            rows = list(chunk[:chunk_size])
+            yield from rows
+            if len(rows) < chunk_size:
+                return
+            last = (rows[-1][1], rows[-1][0])
+
+    def _iter_all(self, querysets):
+        """여러 쿼리셋(보관 → 원본 순)을 이어서 읽기"""
+        for queryset in querysets:
+            yield from self.iter_rows(queryset)
+
+    def stream_csv(self, *querysets):
+        """CSV 스트림 (엑셀 한글 표시를 위해 UTF-8 BOM 포함)"""
+        writer = csv.writer(_Echo())
+        yield '\ufeff' + writer.writerow([header for header, _ in self.COLUMNS])
+        for row in self._iter_all(querysets):
+            yield writer.writerow([
+                value.isoformat() if hasattr(value, 'isoformat') else value
+                for value in row
+            ])
+
+    def stream_ndjson(self, *querysets):
+        """NDJSON 스트림 (행당 JSON 객체 한 줄)"""
+        headers = [header for header, _ in self.COLUMNS]
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        for row in self._iter_all(querysets):
+            yield encoder.encode(dict(zip(headers, row))) + '\n'
@@ -0,0 +1,303 @@
+from collections import defaultdict
+from datetime import timedelta, timezone as dt_timezone
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Count, Min, Max, Sum, Q, F, Value, DecimalField
+from django.db.models.functions import Coalesce, Least, Greatest, TruncHour, TruncDay
+from django.utils import timezone
+
+from core.models import CCPLogHourlyRollup, CCPLogDailyRollup
+from core.services.ccp_log_archive_service import ccp_log_models
+
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+
+COUNT_FIELDS = ('log_count', 'within_limits_count', 'corrective_action_count', 'verified_count')
+
+
+def floor_hour(value):
+    """UTC 기준 정시로 내림"""
+    return value.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def floor_day(value):
+    """UTC 기준 자정으로 내림"""
+    return floor_hour(value).replace(hour=0)
+
+
+def _ceil(value, unit, floor):
+    floored = floor(value)
+    return floored if floored == value else floored + unit
+
+
+def _split_window(start, end, unit, floor):
+    """
+    [start, end) 구간을 unit 경계에 맞는 내부 구간과 양 끝 나머지 구간으로 분리
+    start가 None이면 시작 제한 없음
+
+    Returns:
+        (inner, remainders): inner는 (start, end) 또는 None
+    """
+    inner_end = floor(end)
+    inner_start = _ceil(start, unit, floor) if start is not None else None
+
+    if inner_start is not None and inner_start >= inner_end:
+        return None, [(start, end)]
+
+    remainders = []
+    if start is not None and start < inner_start:
+        remainders.append((start, inner_start))
+    if inner_end < end:
+        remainders.append((inner_end, end))
+    return (inner_start, inner_end), remainders
+
+
+def _empty_totals():
+    return {
+        'total': 0,
+        'within_limits': 0,
+        'corrective_action': 0,
+        'verified': 0,
+        'min_value': None,
+        'max_value': None,
+        'sum_value': Decimal('0'),
+    }
+
+
+def _merge_totals(target, row):
+    target['total'] += row['total'] or 0
+    target['within_limits'] += row['within_limits'] or 0
+    target['corrective_action'] += row['corrective_action'] or 0
+    target['verified'] += row['verified'] or 0
+    target['sum_value'] += row['sum_value'] or Decimal('0')
+    if row['min_value'] is not None:
+        target['min_value'] = row['min_value'] if target['min_value'] is None else min(target['min_value'], row['min_value'])
+    if row['max_value'] is not None:
+        target['max_value'] = row['max_value'] if target['max_value'] is None else max(target['max_value'], row['max_value'])
+
+
+class CCPRollupService:
+    """CCP 로그 시간/일 단위 집계 테이블 유지 및 조회 서비스"""
+
+    ROLLUP_MODELS = (
+        (CCPLogHourlyRollup, floor_hour),
+        (CCPLogDailyRollup, floor_day),
+    )
+
+    @transaction.atomic
+    def record_logs(self, logs):
+        """신규 CCP 로그를 시간/일 집계에 증분 반영"""
+        for model, floor in self.ROLLUP_MODELS:
+            deltas = defaultdict(lambda: {
+                'log_count': 0, 'within_limits_count': 0, 'corrective_action_count': 0,
+                'verified_count': 0, 'min_value': None, 'max_value': None, 'sum_value': Decimal('0')
+            })
+            for log in logs:
+                delta = deltas[(log.ccp_id, floor(log.measured_at))]
+                delta['log_count'] += 1
+                delta['within_limits_count'] += 1 if log.is_within_limits else 0
+                delta['corrective_action_count'] += 1 if log.status == 'corrective_action' else 0
+                delta['verified_count'] += 1 if log.verified_by_id else 0
+                delta['sum_value'] += log.measured_value
+                if delta['min_value'] is None or log.measured_value < delta['min_value']:
+                    delta['min_value'] = log.measured_value
+                if delta['max_value'] is None or log.measured_value > delta['max_value']:
+                    delta['max_value'] = log.measured_value
+
+            for (ccp_id, bucket_start), delta in deltas.items():
+                self._apply_delta(model, ccp_id, bucket_start, delta)
+
+    @transaction.atomic
+    def record_log_update(self, log, previous_state):
+        """
+        개선조치/검증 입력에 따른 집계 보정
+
+        Args:
+            log: 저장된 CCPLog
+            previous_state: 저장 전 {'status': ..., 'verified_by_id': ...}
+        """
+        delta = {field: 0 for field in COUNT_FIELDS}
+
+        was_corrective = previous_state['status'] == 'corrective_action'
+        is_corrective = log.status == 'corrective_action'
+        delta['corrective_action_count'] = int(is_corrective) - int(was_corrective)
+
+        was_verified = previous_state['verified_by_id'] is not None
+        is_verified = log.verified_by_id is not None
+        delta['verified_count'] = int(is_verified) - int(was_verified)
+
+        if not any(delta.values()):
+            return
+
+        for model, floor in self.ROLLUP_MODELS:
+            model.objects.filter(
+                ccp_id=log.ccp_id,
+                bucket_start=floor(log.measured_at)
+            ).update(**{field: F(field) + value for field, value in delta.items() if value})
+
+    def _apply_delta(self, model, ccp_id, bucket_start, delta):
+        """집계 행 upsert (행 잠금 후 F 표현식으로 증분)"""
+        rollup, created = model.objects.select_for_update().get_or_create(
+            ccp_id=ccp_id,
+            bucket_start=bucket_start,
+            defaults=delta
+        )
+        if created:
+            return
+
+        decimal_field = DecimalField(max_digits=10, decimal_places=3)
+        model.objects.filter(pk=rollup.pk).update(
+            **{field: F(field) + delta[field] for field in COUNT_FIELDS},
+            sum_value=F('sum_value') + delta['sum_value'],
+            min_value=Least(
+                Coalesce('min_value', Value(delta['min_value'], output_field=decimal_field)),
+                Value(delta['min_value'], output_field=decimal_field)
+            ),
+            max_value=Greatest(
+                Coalesce('max_value', Value(delta['max_value'], output_field=decimal_field)),
+                Value(delta['max_value'], output_field=decimal_field)
+            )
+        )
+
+    def summarize(self, date_from=None, date_to=None, ccp_ids=None, group_by_ccp=False):
+        """
+        기간 내 CCP 로그 집계
+        - 온전한 일 구간은 일 집계, 온전한 시간 구간은 시간 집계에서 읽음
+        - 정시에 맞지 않는 양 끝 1시간 미만 구간만 원본 로그 조회
+        - date_from 이상, date_to 이하 (기존 원본 쿼리와 동일한 경계)
+
+        Returns:
+            dict: 집계 결과 (group_by_ccp=True이면 {ccp_id: 집계 결과})
+        """
+        # date_to 포함 조건을 반열린 구간으로 변환 (DB 시각 정밀도 = 마이크로초)
+        end = (date_to or timezone.now()) + timedelta(microseconds=1)
+        per_ccp = defaultdict(_empty_totals)
+
+        if date_from is not None and date_from >= end:
+            return dict(per_ccp) if group_by_ccp else _empty_totals()
+
+        daily_range, remainders = _split_window(date_from, end, DAY, floor_day)
+        hourly_ranges = []
+        raw_ranges = []
+        for start, stop in remainders:
+            hourly_range, raw_parts = _split_window(start, stop, HOUR, floor_hour)
+            if hourly_range:
+                hourly_ranges.append(hourly_range)
+            raw_ranges.extend(raw_parts)
+
+        rows = []
+        if daily_range:
+            rows.extend(self._rollup_rows(CCPLogDailyRollup, [daily_range], ccp_ids))
+        if hourly_ranges:
+            rows.extend(self._rollup_rows(CCPLogHourlyRollup, hourly_ranges, ccp_ids))
+        if raw_ranges:
+            rows.extend(self._raw_rows(raw_ranges, ccp_ids))
+
+        for row in rows:
+            _merge_totals(per_ccp[row['ccp_id']], row)
+
+        if group_by_ccp:
+            return dict(per_ccp)
+
+        totals = _empty_totals()
+        for row in per_ccp.values():
+            _merge_totals(totals, row)
+        return totals
+
+    def _range_filter(self, field, ranges):
+        condition = Q()
+        for start, stop in ranges:
+            part = Q(**{f'{field}__lt': stop})
+            if start is not None:
+                part &= Q(**{f'{field}__gte': start})
+            condition |= part
+        return condition
+
+    def _rollup_rows(self, model, ranges, ccp_ids):
+        queryset = model.objects.filter(self._range_filter('bucket_start', ranges))
+        if ccp_ids is not None:
+            queryset = queryset.filter(ccp_id__in=ccp_ids)
+        return queryset.values('ccp_id').annotate(
+            total=Sum('log_count'),
+            within_limits=Sum('within_limits_count'),
+            corrective_action=Sum('corrective_action_count'),
+            verified=Sum('verified_count'),
+            min_value=Min('min_value'),
+            max_value=Max('max_value'),
+            sum_value=Sum('sum_value')
+        ).order_by()
+
+    def _raw_rows(self, ranges, ccp_ids):
+        """원본 로그 집계 (구간이 이관 경계 이전이면 보관 로그 포함, 같은 CCP 행은 호출 측에서 합산)"""
+        starts = [start for start, _ in ranges]
+        date_from = None if None in starts else min(starts)
+
+        rows = []
+        for model in ccp_log_models(date_from):
+            queryset = model.objects.filter(self._range_filter('measured_at', ranges))
+            if ccp_ids is not None:
+                queryset = queryset.filter(ccp_id__in=ccp_ids)
+            rows.extend(queryset.values('ccp_id').annotate(
+                total=Count('id'),
+                within_limits=Count('id', filter=Q(is_within_limits=True)),
+                corrective_action=Count('id', filter=Q(status='corrective_action')),
+                verified=Count('id', filter=Q(verified_by__isnull=False)),
+                min_value=Min('measured_value'),
+                max_value=Max('measured_value'),
+                sum_value=Sum('measured_value')
+            ).order_by())
+        return rows
+
+    @transaction.atomic
+    def rebuild(self, ccp_ids=None):
+        """원본 + 보관 CCP 로그로부터 집계 테이블 재생성"""
+        for model, trunc in ((CCPLogHourlyRollup, TruncHour), (CCPLogDailyRollup, TruncDay)):
+            existing = model.objects.all()
+            if ccp_ids is not None:
+                existing = existing.filter(ccp_id__in=ccp_ids)
+            existing.delete()
+
+            # 이관 중인 월은 같은 구간이 두 테이블에 나뉘어 있을 수 있어 구간별로 합산
+            buckets = {}
+            for log_model in ccp_log_models():
+                logs = log_model.objects.all()
+                if ccp_ids is not None:
+                    logs = logs.filter(ccp_id__in=ccp_ids)
+
+                for row in logs.annotate(
+                    bucket=trunc('measured_at', tzinfo=dt_timezone.utc)
+                ).values('ccp_id', 'bucket').annotate(
+                    log_count=Count('id'),
+                    within_limits_count=Count('id', filter=Q(is_within_limits=True)),
+                    corrective_action_count=Count('id', filter=Q(status='corrective_action')),
+                    verified_count=Count('id', filter=Q(verified_by__isnull=False)),
+                    min_value=Min('measured_value'),
+                    max_value=Max('measured_value'),
+                    sum_value=Sum('measured_value')
+                ).order_by().iterator():
+                    key = (row['ccp_id'], row['bucket'])
+                    bucket = buckets.get(key)
+                    if bucket is None:
+                        buckets[key] = row
+                        continue
+                    for field in COUNT_FIELDS:
+                        bucket[field] += row[field]
+                    bucket['sum_value'] += row['sum_value']
+                    bucket['min_value'] = min(bucket['min_value'], row['min_value'])
+                    bucket['max_value'] = max(bucket['max_value'], row['max_value'])
+
+            model.objects.bulk_create([
+                model(
+                    ccp_id=row['ccp_id'],
+                    bucket_start=row['bucket'],
+                    log_count=row['log_count'],
+                    within_limits_count=row['within_limits_count'],
+                    corrective_action_count=row['corrective_action_count'],
+                    verified_count=row['verified_count'],
+                    min_value=row['min_value'],
+                    max_value=row['max_value'],
+                    sum_value=row['sum_value']
+                )
+                for row in buckets.values()
+            ], batch_size=1000)
@@ -0,0 +1,202 @@
+"""
+제품 원가 계산 결과 캐시
+- LocalCostCache: 프로세스 메모리 LRU + TTL (기본, 다른 워커의 무효화는 TTL 만료로 반영)
+- SharedCostCache: Django 캐시(Redis 등) 공유, 제품별 버전 키로 무효화 (다중 워커)
+- 원자재 → 제품 역색인으로 BOM/로트 변경 시 영향 제품만 커밋 후 무효화
+"""
+import threading
+import uuid
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.utils import timezone
+
+from core.constants import (
+    COST_CACHE_MAX_ENTRIES,
+    COST_CACHE_TTL_SECONDS,
+    COST_MATERIAL_INDEX_TTL_SECONDS,
+)
+
+
+class LocalCostCache:
+    """
+    프로세스 내 LRU 캐시 (키: 제품 ID, 생산 수량)
+    - 무효화는 쓰기를 처리한 프로세스에만 적용되므로 다른 워커는 TTL 만료로 갱신
+    - 최근 평균 단가 기간도 시간에 따라 바뀌므로 공유 백엔드와 같은 TTL 적용
+    """
+
+    def __init__(self, max_entries=COST_CACHE_MAX_ENTRIES, ttl_seconds=COST_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._keys_by_product = defaultdict(set)
+        self._material_index = None
+        self._material_index_built_at = None
+        self._lock = threading.Lock()
+
+    def get(self, product_id, quantity):
+        key = (str(product_id), quantity)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if (timezone.now() - entry['cached_at']).total_seconds() > self.ttl_seconds:
+                del self._entries[key]
+                self._discard_product_key(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, product_id, quantity, result):
+        key = (str(product_id), quantity)
+        entry = {'result': result, 'cached_at': timezone.now()}
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._keys_by_product[key[0]].add(key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._discard_product_key(evicted)
+        return entry
+
+    def invalidate_products(self, product_ids):
+        with self._lock:
+            for product_id in product_ids:
+                for key in self._keys_by_product.pop(str(product_id), ()):
+                    self._entries.pop(key, None)
+
+    def _discard_product_key(self, key):
+        keys = self._keys_by_product.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_product[key[0]]
+
+    def get_material_index(self):
+        with self._lock:
+            if self._material_index is None:
+                return None
+            age = (timezone.now() - self._material_index_built_at).total_seconds()
+            if age > COST_MATERIAL_INDEX_TTL_SECONDS:
+                return None
+            return self._material_index
+
+    def set_material_index(self, index):
+        with self._lock:
+            self._material_index = index
+            self._material_index_built_at = timezone.now()
+
+    def clear_material_index(self):
+        with self._lock:
+            self._material_index = None
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_product.clear()
+            self._material_index = None
+
+
+class SharedCostCache:
+    """
+    Django 캐시 공유 백엔드
+    - 항목 키에 제품 버전을 포함해 무효화는 버전 교체 한 번으로 처리
+    - 항목 수 제한(LRU)은 캐시 서버의 eviction 정책에 맡김
+    """
+
+    PREFIX = 'cost'
+    MATERIAL_INDEX_KEY = 'cost:material_index'
+
+    def _version_key(self, product_id):
+        return f'{self.PREFIX}:version:{product_id}'
+
+    def _entry_key(self, product_id, quantity):
+        version = cache.get(self._version_key(product_id), '0')
+        return f'{self.PREFIX}:{product_id}:{version}:{quantity}'
+
+    def get(self, product_id, quantity):
+        return cache.get(self._entry_key(product_id, quantity))
+
+    def set(self, product_id, quantity, result):
+        entry = {'result': result, 'cached_at': timezone.now()}
+        cache.set(self._entry_key(product_id, quantity), entry, COST_CACHE_TTL_SECONDS)
+        return entry
+
+    def invalidate_products(self, product_ids):
+        cache.set_many(
+            {self._version_key(product_id): uuid.uuid4().hex for product_id in product_ids},
+            None
+        )
+
+    def get_material_index(self):
+        return cache.get(self.MATERIAL_INDEX_KEY)
+
+    def set_material_index(self, index):
+        cache.set(self.MATERIAL_INDEX_KEY, index, COST_MATERIAL_INDEX_TTL_SECONDS)
+
+    def clear_material_index(self):
+        cache.delete(self.MATERIAL_INDEX_KEY)
+
+
+_cost_cache = None
+_cost_cache_lock = threading.Lock()
+
+
+def get_cost_cache():
+    """설정(COST_CACHE_BACKEND)에 따른 프로세스 단일 원가 캐시"""
+    global _cost_cache
+    if _cost_cache is None:
+        with _cost_cache_lock:
+            if _cost_cache is None:
+                backend = getattr(settings, 'COST_CACHE_BACKEND', 'local')
+                if backend == 'local':
+                    _cost_cache = LocalCostCache()
+                elif backend == 'shared':
+                    _cost_cache = SharedCostCache()
+                else:
+                    raise ImproperlyConfigured(f'지원하지 않는 COST_CACHE_BACKEND: {backend}')
+    return _cost_cache
+
+
+def get_products_for_materials(material_ids):
+    """원자재 → 제품 역색인 조회 (없거나 만료되면 BOM 한 번 조회로 재구성)"""
+    from core.models import BOM
+
+    cost_cache = get_cost_cache()
+    index = cost_cache.get_material_index()
+    if index is None:
+        index = defaultdict(set)
+        # 비활성 BOM 라인도 포함 (활성화 전환 시에도 무효화 대상)
+        for material_id, product_id in BOM.objects.values_list('raw_material_id', 'finished_product_id'):
+            index[str(material_id)].add(str(product_id))
+        index = dict(index)
+        cost_cache.set_material_index(index)
+
+    product_ids = set()
+    for material_id in material_ids:
+        product_ids |= index.get(str(material_id), set())
+    return product_ids
+
+
+def invalidate_product_costs(product_ids, rebuild_index=False):
+    """지정 제품의 원가 캐시를 커밋 후 무효화 (BOM 변경 시 역색인도 재구성)"""
+    product_ids = set(product_ids)
+
+    def _invalidate():
+        cost_cache = get_cost_cache()
+        if rebuild_index:
+            cost_cache.clear_material_index()
+        cost_cache.invalidate_products(product_ids)
+
+    transaction.on_commit(_invalidate)
+
+
+def invalidate_material_costs(material_ids):
+    """원자재 로트 변경 시 해당 원자재를 쓰는 제품의 원가 캐시를 커밋 후 무효화"""
+    material_ids = set(material_ids)
+    transaction.on_commit(
+        lambda: get_cost_cache().invalidate_products(get_products_for_materials(material_ids))
+    )
@@ -1,9 +1,90 @@
+from collections import defaultdict
+from datetime import timedelta
 from decimal import Decimal
-from django.db.models import Avg, Min, Q
+from django.db.models import Avg, Count, Q, Sum
+from django.utils import timezone
 from typing import Dict, List, Optional, Tuple
 from ..models import FinishedProduct, BOM, MaterialLot, RawMaterial
 
 
+# FIFO 단가 계산 대상 로트 상태
+PRICEABLE_LOT_STATUSES = ['received', 'in_storage']
+
+
+class CostSnapshot:
+    """
+    원가 계산용 BOM/로트 스냅샷
+    - 활성 BOM, 가용 로트(FIFO 순), 원자재별 평균 단가를 각각 한 번씩 조회
+    - 이후 제품별 원가는 메모리에서 계산 (제품/BOM 라인당 쿼리 없음)
+    """
+    
+    def __init__(self, products: List[FinishedProduct], extra_material_ids=(),
+                 include_supplier_stats: bool = False):
+        """
+        Args:
+            products: 원가 계산 대상 제품
+            extra_material_ids: BOM에 없지만 로트/단가를 함께 적재할 원자재 (시뮬레이션용)
+            include_supplier_stats: 원자재 x 공급업체별 단가 합계/건수 적재 (공급업체 제외 시뮬레이션용)
+        """
+        self.bom_by_product = defaultdict(list)
+        self.lots_by_material = defaultdict(list)
+        self.price_stats = {}
+        self.supplier_stats = defaultdict(list)
+        
+        product_ids = [product.id for product in products]
+        
+        # 1. 활성 BOM 라인 (원자재 포함)
+        if product_ids:
+            for bom_item in BOM.objects.filter(
+                finished_product_id__in=product_ids,
+                is_active=True
+            ).select_related('raw_material'):
+                self.bom_by_product[bom_item.finished_product_id].append(bom_item)
+        
+        material_ids = {
+            bom_item.raw_material_id
+            for bom_items in self.bom_by_product.values()
+            for bom_item in bom_items
+        } | set(extra_material_ids)
+        if not material_ids:
+            return
+        
+        # 2. 현재 재고 중 단가 산정 가능한 로트 (원자재별 FIFO 순)
+        for lot in MaterialLot.objects.filter(
+            raw_material_id__in=material_ids,
+            status__in=PRICEABLE_LOT_STATUSES,
+            quality_test_passed=True,
+            quantity_current__gt=0
+        ).values(
+            'raw_material_id', 'supplier_id', 'quantity_current', 'unit_price'
+        ).order_by('expiry_date', 'received_date'):
+            self.lots_by_material[lot['raw_material_id']].append(lot)
+        
+        # 3. 원자재별 최근 30일/전체 평균 단가 (DB 평균과 동일한 정밀도 유지)
+        thirty_days_ago = timezone.now() - timedelta(days=30)
+        recent = Q(received_date__gte=thirty_days_ago)
+        for row in MaterialLot.objects.filter(
+            raw_material_id__in=material_ids
+        ).values('raw_material_id').annotate(
+            recent_count=Count('id', filter=recent),
+            recent_avg=Avg('unit_price', filter=recent),
+            historical_avg=Avg('unit_price')
+        ).order_by():
+            self.price_stats[row['raw_material_id']] = row
+        
+        # 4. (선택) 원자재 x 공급업체별 단가 합계/건수
+        if include_supplier_stats:
+            for row in MaterialLot.objects.filter(
+                raw_material_id__in=material_ids
+            ).values('raw_material_id', 'supplier_id').annotate(
+                recent_count=Count('id', filter=recent),
+                recent_total=Sum('unit_price', filter=recent),
+                count=Count('id'),
+                total=Sum('unit_price')
+            ).order_by():
+                self.supplier_stats[row['raw_material_id']].append(row)
+
+
 class CostCalculationService:
     """제품 원가 계산 서비스"""
     
@@ -33,6 +114,49 @@ class CostCalculationService:
         except FinishedProduct.DoesNotExist:
             raise ValueError(f"Product with id {product_id} not found")
         
+        snapshot = CostSnapshot([product])
+        return CostCalculationService.calculate_from_snapshot(snapshot, product, production_quantity)
+    
+    @staticmethod
+    def get_cached_product_cost(product_id: str, production_quantity: int = 1) -> Tuple[Dict, Dict]:
+        """
+        캐시된 제품 원가 조회 (없으면 계산 후 저장)
+        - 키: (제품, 생산 수량) — FIFO 단가가 수량에 따라 달라지므로 수량별로 보관
+        - BOM/원자재 로트 변경 시 signals에서 영향 제품만 무효화
+        
+        Returns:
+            Tuple[Dict, Dict]: (원가 계산 결과, 캐시 정보 {'hit', 'cached_at', 'age_seconds'})
+        """
+        from .cost_cache import get_cost_cache
+        
+        cost_cache = get_cost_cache()
+        entry = cost_cache.get(product_id, production_quantity)
+        hit = entry is not None
+        if not hit:
+            result = CostCalculationService.calculate_product_cost(product_id, production_quantity)
+            entry = cost_cache.set(product_id, production_quantity, result)
+        
+        cache_info = {
+            'hit': hit,
+            'cached_at': entry['cached_at'],
+            'age_seconds': round((timezone.now() - entry['cached_at']).total_seconds(), 3)
+        }
+        return entry['result'], cache_info
+    
+    @staticmethod
+    def calculate_from_snapshot(snapshot: CostSnapshot, product: FinishedProduct,
+                                production_quantity: int = 1) -> Dict:
+        """
+        스냅샷 기준 제품 원가 계산 (쿼리 없음)
+        
+        Args:
+            snapshot: 제품이 포함된 CostSnapshot
+            product: 제품
+            production_quantity: 생산 수량
+            
+        Returns:
+            Dict: calculate_product_cost와 동일한 원가 계산 결과
+        """
         result = {
             'product': {
                 'id': str(product.id),
@@ -50,12 +174,9 @@ class CostCalculationService:
         }
         
         # BOM 확인
-        bom_items = BOM.objects.filter(
-            finished_product=product,
-            is_active=True
-        ).select_related('raw_material')
+        bom_items = snapshot.bom_by_product.get(product.id)
         
-        if not bom_items.exists():
+        if not bom_items:
             result['bom_missing'] = True
             result['warnings'].append('BOM(자재명세서)가 설정되지 않았습니다.')
             return result
@@ -66,7 +187,7 @@ class CostCalculationService:
         
         for bom_item in bom_items:
             material_cost = CostCalculationService._calculate_material_cost(
-                bom_item, production_quantity
+                snapshot, bom_item, production_quantity
             )
             result['material_costs'].append(material_cost)
             total_cost += material_cost['total_cost']
@@ -92,11 +213,12 @@ class CostCalculationService:
         return result
     
     @staticmethod
-    def _calculate_material_cost(bom_item: BOM, production_quantity: int) -> Dict:
+    def _calculate_material_cost(snapshot: CostSnapshot, bom_item: BOM, production_quantity: int) -> Dict:
         """
         BOM 아이템별 원자재 원가 계산
         
         Args:
+            snapshot: CostSnapshot
             bom_item: BOM 아이템
             production_quantity: 생산 수량
             
@@ -128,14 +250,10 @@ class CostCalculationService:
         # 3. 전체 평균 단가
         
         # 1. 현재 재고 중 FIFO 단가
-        current_lots = MaterialLot.objects.filter(
-            raw_material=material,
-            status__in=['received', 'in_storage'],
-            quality_test_passed=True,
-            quantity_current__gt=0
-        ).order_by('expiry_date', 'received_date')
+        current_lots = snapshot.lots_by_material.get(material.id)
+        price_stats = snapshot.price_stats.get(material.id)
         
-        if current_lots.exists():
+        if current_lots:
             # FIFO 방식으로 필요한 수량만큼의 평균 단가 계산
             unit_price = CostCalculationService._calculate_fifo_average_price(
                 current_lots, required_quantity
@@ -143,48 +261,34 @@ class CostCalculationService:
             result['unit_price'] = unit_price
             result['price_method'] = 'current_lot'
             result['lot_info'] = {
-                'available_lots': current_lots.count(),
-                'total_available_quantity': sum(lot.quantity_current for lot in current_lots)
+                'available_lots': len(current_lots),
+                'total_available_quantity': sum(lot['quantity_current'] for lot in current_lots)
             }
-        else:
+        elif price_stats and price_stats['recent_count']:
             # 2. 최근 30일 평균 단가
-            from django.utils import timezone
-            from datetime import timedelta
-            
-            thirty_days_ago = timezone.now() - timedelta(days=30)
-            recent_lots = MaterialLot.objects.filter(
-                raw_material=material,
-                received_date__gte=thirty_days_ago
-            )
-            
-            if recent_lots.exists():
-                avg_price = recent_lots.aggregate(avg_price=Avg('unit_price'))['avg_price']
-                result['unit_price'] = avg_price or Decimal('0')
-                result['price_method'] = 'recent_average'
-                result['warnings'].append('현재 재고가 부족하여 최근 30일 평균 단가로 계산했습니다.')
-            else:
-                # 3. 전체 평균 단가
-                all_lots = MaterialLot.objects.filter(raw_material=material)
-                if all_lots.exists():
-                    avg_price = all_lots.aggregate(avg_price=Avg('unit_price'))['avg_price']
-                    result['unit_price'] = avg_price or Decimal('0')
-                    result['price_method'] = 'historical_average'
-                    result['warnings'].append('최근 입고 내역이 없어 전체 평균 단가로 계산했습니다.')
-                else:
-                    result['warnings'].append('가격 정보를 찾을 수 없습니다.')
-                    result['price_method'] = 'no_data'
+            result['unit_price'] = price_stats['recent_avg'] or Decimal('0')
+            result['price_method'] = 'recent_average'
+            result['warnings'].append('현재 재고가 부족하여 최근 30일 평균 단가로 계산했습니다.')
+        elif price_stats:
+            # 3. 전체 평균 단가
+            result['unit_price'] = price_stats['historical_avg'] or Decimal('0')
+            result['price_method'] = 'historical_average'
+            result['warnings'].append('최근 입고 내역이 없어 전체 평균 단가로 계산했습니다.')
+        else:
+            result['warnings'].append('가격 정보를 찾을 수 없습니다.')
+            result['price_method'] = 'no_data'
         
         result['total_cost'] = result['unit_price'] * required_quantity
         
         return result
     
     @staticmethod
-    def _calculate_fifo_average_price(lots_queryset, required_quantity: Decimal) -> Decimal:
+    def _calculate_fifo_average_price(lots: List[Dict], required_quantity: Decimal) -> Decimal:
         """
         FIFO 방식으로 필요한 수량에 대한 가중평균 단가 계산
         
         Args:
-            lots_queryset: MaterialLot QuerySet (FIFO 순서로 정렬됨)
+            lots: 로트 목록 (FIFO 순서로 정렬됨, quantity_current/unit_price 포함)
             required_quantity: 필요한 수량
             
         Returns:
@@ -196,15 +300,15 @@ class CostCalculationService:
         total_cost = Decimal('0')
         remaining_quantity = required_quantity
         
-        for lot in lots_queryset:
+        for lot in lots:
             if remaining_quantity <= 0:
                 break
                 
             # 이 로트에서 사용할 수량
-            use_quantity = min(lot.quantity_current, remaining_quantity)
+            use_quantity = min(lot['quantity_current'], remaining_quantity)
             
             # 비용 누적
-            total_cost += lot.unit_price * use_quantity
+            total_cost += lot['unit_price'] * use_quantity
             remaining_quantity -= use_quantity
         
         # 가중평균 단가
@@ -213,22 +317,42 @@ class CostCalculationService:
             return total_cost / used_quantity
         
         # 재고가 부족한 경우 첫 번째 로트의 단가 사용
-        return lots_queryset.first().unit_price if lots_queryset.exists() else Decimal('0')
+        return lots[0]['unit_price'] if lots else Decimal('0')
+    
+    @staticmethod
+    def calculate_products_costs(products: List[FinishedProduct], production_quantity: int = 1) -> Dict:
+        """
+        여러 제품의 원가를 하나의 CostSnapshot으로 계산
+        
+        Args:
+            products: 제품 목록 (목록 페이지 등)
+            production_quantity: 생산 수량
+            
+        Returns:
+            Dict: {제품 ID: 원가 계산 결과}
+        """
+        snapshot = CostSnapshot(products)
+        return {
+            product.id: CostCalculationService.calculate_from_snapshot(snapshot, product, production_quantity)
+            for product in products
+        }
     
     @staticmethod
     def get_products_cost_summary() -> List[Dict]:
         """
         모든 제품의 원가 요약 정보 조회
+        - 활성 제품 전체를 하나의 CostSnapshot으로 계산
         
         Returns:
             List[Dict]: 제품별 원가 요약
         """
-        products = FinishedProduct.objects.filter(is_active=True)
+        products = list(FinishedProduct.objects.filter(is_active=True))
+        snapshot = CostSnapshot(products)
         results = []
         
         for product in products:
             try:
-                cost_info = CostCalculationService.calculate_product_cost(str(product.id))
+                cost_info = CostCalculationService.calculate_from_snapshot(snapshot, product)
                 summary = {
                     'product_id': str(product.id),
                     'product_name': product.name,
@@ -252,4 +376,4 @@ class CostCalculationService:
                     'error': str(e)
                 })
         
-        return results
\ No newline at end of file
+        return results
@@ -0,0 +1,250 @@
+import uuid
+from collections import ChainMap, defaultdict
+from decimal import Decimal, InvalidOperation
+from rest_framework.exceptions import ValidationError
+
+from core.constants import COST_SIMULATION_MAX_SCENARIOS
+from core.models import BOM, FinishedProduct, RawMaterial
+from core.services.cost_calculation_service import CostCalculationService, CostSnapshot
+
+
+class ScenarioSnapshot:
+    """
+    기준 CostSnapshot 위에 시나리오 변경분만 덮어쓴 읽기 전용 뷰
+    - 변경된 원자재/제품 항목만 새로 만들고 나머지는 기준 스냅샷을 그대로 참조
+    """
+
+    def __init__(self, base):
+        self.bom_by_product = ChainMap({}, base.bom_by_product)
+        self.lots_by_material = ChainMap({}, base.lots_by_material)
+        self.price_stats = ChainMap({}, base.price_stats)
+
+
+class CostSimulationService:
+    """
+    원가 what-if 시뮬레이션
+    - 원자재 단가 변동률, 공급업체 제외, BOM 소요량 변경을 메모리 스냅샷에만 적용 (DB 변경 없음)
+    - 스냅샷은 요청당 한 번 적재하고, 시나리오마다 변경 영향을 받는 제품만 재계산
+    """
+
+    def simulate(self, scenarios, production_quantity=1):
+        """
+        시나리오별 전체 활성 제품 원가 재계산
+
+        Args:
+            scenarios: [{
+                'name': str,
+                'price_changes': {원자재 ID: 변동률(%)},
+                'excluded_suppliers': [공급업체 ID],
+                'bom_changes': [{'product_id', 'material_id', 'quantity_per_unit'}]  # 0이면 라인 제거
+            }]
+            production_quantity: 생산 수량
+
+        Returns:
+            Dict: 기준 원가와 시나리오별 영향 제품 원가/차이
+        """
+        scenarios = self._parse_scenarios(scenarios)
+
+        products = list(FinishedProduct.objects.filter(is_active=True))
+        products_by_id = {product.id: product for product in products}
+        extra_material_ids = {
+            material_id
+            for scenario in scenarios
+            for material_id in list(scenario['price_changes']) + [
+                change['material_id'] for change in scenario['bom_changes']
+            ]
+        }
+        snapshot = CostSnapshot(
+            products,
+            extra_material_ids=extra_material_ids,
+            include_supplier_stats=any(scenario['excluded_suppliers'] for scenario in scenarios)
+        )
+        materials = {
+            material.id: material
+            for material in RawMaterial.objects.filter(id__in=extra_material_ids)
+        }
+
+        baseline = {
+            product.id: CostCalculationService.calculate_from_snapshot(snapshot, product, production_quantity)
+            for product in products
+        }
+
+        # 원자재 → 사용 제품, 공급업체 → 공급 원자재 역색인
+        products_by_material = defaultdict(set)
+        for product_id, bom_items in snapshot.bom_by_product.items():
+            for bom_item in bom_items:
+                products_by_material[bom_item.raw_material_id].add(product_id)
+        materials_by_supplier = defaultdict(set)
+        for material_id, rows in snapshot.supplier_stats.items():
+            for row in rows:
+                materials_by_supplier[row['supplier_id']].add(material_id)
+
+        results = []
+        for scenario in scenarios:
+            view = ScenarioSnapshot(snapshot)
+            affected_products = self._apply_bom_changes(
+                view, snapshot, scenario['bom_changes'], products_by_id, materials
+            )
+
+            touched_materials = set(scenario['price_changes'])
+            for supplier_id in scenario['excluded_suppliers']:
+                touched_materials |= materials_by_supplier.get(supplier_id, set())
+            for material_id in touched_materials:
+                self._apply_price_changes(
+                    view, snapshot, material_id,
+                    scenario['price_changes'].get(material_id, Decimal('0')),
+                    scenario['excluded_suppliers']
+                )
+                affected_products |= products_by_material.get(material_id, set())
+
+            results.append(self._build_scenario_result(
+                scenario, view, affected_products, products_by_id, baseline, production_quantity
+            ))
+
+        return {
+            'production_quantity': production_quantity,
+            'product_count': len(products),
+            'baseline': [
+                {
+                    'product_id': str(product.id),
+                    'product_code': product.code,
+                    'unit_cost': baseline[product.id]['unit_cost'],
+                    'calculation_method': baseline[product.id]['calculation_method']
+                }
+                for product in products
+            ],
+            'scenarios': results
+        }
+
+    def _parse_scenarios(self, scenarios):
+        if not isinstance(scenarios, list) or not scenarios:
+            raise ValidationError('시나리오 목록이 필요합니다.')
+        if len(scenarios) > COST_SIMULATION_MAX_SCENARIOS:
+            raise ValidationError(f'시나리오는 최대 {COST_SIMULATION_MAX_SCENARIOS}개까지 가능합니다.')
+
+        parsed = []
+        for index, scenario in enumerate(scenarios):
+            try:
+                parsed.append({
+                    'name': scenario.get('name') or f'시나리오 {index + 1}',
+                    'price_changes': {
+                        self._to_uuid(material_id): Decimal(str(percent))
+                        for material_id, percent in (scenario.get('price_changes') or {}).items()
+                    },
+                    'excluded_suppliers': {
+                        self._to_uuid(supplier_id) for supplier_id in scenario.get('excluded_suppliers') or []
+                    },
+                    'bom_changes': [
+                        {
+                            'product_id': self._to_uuid(change['product_id']),
+                            'material_id': self._to_uuid(change['material_id']),
+                            'quantity_per_unit': Decimal(str(change['quantity_per_unit']))
+                        }
+                        for change in scenario.get('bom_changes') or []
+                    ]
+                })
+            except (AttributeError, KeyError, TypeError, ValueError, InvalidOperation):
+                raise ValidationError(f'잘못된 시나리오 형식입니다: {index + 1}번째')
+        return parsed
+
+    def _to_uuid(self, value):
+        return value if isinstance(value, uuid.UUID) else uuid.UUID(str(value))
+
+    def _apply_bom_changes(self, view, snapshot, bom_changes, products_by_id, materials):
+        """BOM 소요량 변경 (저장하지 않는 BOM 인스턴스로 대체/추가/제거)"""
+        affected = set()
+        for change in bom_changes:
+            product_id = change['product_id']
+            if product_id not in products_by_id:
+                raise ValidationError(f'활성 제품이 아닙니다: {product_id}')
+
+            lines = [
+                bom_item for bom_item in view.bom_by_product.get(product_id, [])
+                if bom_item.raw_material_id != change['material_id']
+            ]
+            if change['quantity_per_unit'] > 0:
+                existing = next((
+                    bom_item for bom_item in snapshot.bom_by_product.get(product_id, [])
+                    if bom_item.raw_material_id == change['material_id']
+                ), None)
+                material = existing.raw_material if existing else materials.get(change['material_id'])
+                if material is None:
+                    raise ValidationError(f'존재하지 않는 원자재입니다: {change["material_id"]}')
+                lines.append(BOM(
+                    finished_product_id=product_id,
+                    raw_material=material,
+                    quantity_per_unit=change['quantity_per_unit'],
+                    unit=existing.unit if existing else material.unit
+                ))
+
+            view.bom_by_product[product_id] = lines
+            affected.add(product_id)
+        return affected
+
+    def _apply_price_changes(self, view, snapshot, material_id, percent, excluded_suppliers):
+        """원자재 단가 변동률 적용 + 제외 공급업체 로트 제거"""
+        factor = Decimal('1') + percent / Decimal('100')
+
+        view.lots_by_material[material_id] = [
+            {**lot, 'unit_price': lot['unit_price'] * factor}
+            for lot in snapshot.lots_by_material.get(material_id, [])
+            if lot['supplier_id'] not in excluded_suppliers
+        ]
+
+        stats = snapshot.price_stats.get(material_id)
+        if stats is None:
+            return
+        if excluded_suppliers:
+            # 제외 공급업체를 뺀 공급업체별 합계/건수로 평균 재계산
+            rows = [
+                row for row in snapshot.supplier_stats.get(material_id, [])
+                if row['supplier_id'] not in excluded_suppliers
+            ]
+            count = sum(row['count'] for row in rows)
+            recent_count = sum(row['recent_count'] for row in rows)
+            if not count:
+                view.price_stats[material_id] = None
+                return
+            stats = {
+                'raw_material_id': material_id,
+                'recent_count': recent_count,
+                'recent_avg': (
+                    sum(row['recent_total'] or Decimal('0') for row in rows) / recent_count
+                    if recent_count else None
+                ),
+                'historical_avg': sum(row['total'] for row in rows) / count
+            }
+        view.price_stats[material_id] = {
+            **stats,
+            'recent_avg': stats['recent_avg'] * factor if stats['recent_avg'] is not None else None,
+            'historical_avg': stats['historical_avg'] * factor if stats['historical_avg'] is not None else None
+        }
+
+    def _build_scenario_result(self, scenario, view, affected_products, products_by_id, baseline,
+                               production_quantity):
+        rows = []
+        total_delta = Decimal('0')
+        for product_id in affected_products:
+            product = products_by_id[product_id]
+            cost = CostCalculationService.calculate_from_snapshot(view, product, production_quantity)
+            baseline_cost = baseline[product_id]['unit_cost']
+            delta = cost['unit_cost'] - baseline_cost
+            total_delta += delta
+            rows.append({
+                'product_id': str(product_id),
+                'product_code': product.code,
+                'product_name': product.name,
+                'baseline_unit_cost': baseline_cost,
+                'unit_cost': cost['unit_cost'],
+                'delta': delta,
+                'delta_percent': round(delta / baseline_cost * 100, 2) if baseline_cost else None,
+                'calculation_method': cost['calculation_method']
+            })
+
+        rows.sort(key=lambda row: row['delta'], reverse=True)
+        return {
+            'name': scenario['name'],
+            'affected_product_count': len(rows),
+            'total_unit_cost_delta': total_delta,
+            'products': rows
+        }
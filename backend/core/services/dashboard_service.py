@@ -0,0 +1,166 @@
+from datetime import timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Avg, Q
+from django.utils import timezone
+
+from core.constants import DASHBOARD_SNAPSHOT_TTL_SECONDS
+from core.models import ProductionOrder
+from core.services.ccp_rollup_service import CCPRollupService
+
+
+class DashboardSnapshotService:
+    """
+    대시보드 카운터 스냅샷 서비스
+    - 소수의 그룹 쿼리로 카운터를 한 번에 계산
+    - 짧은 TTL로 캐시하고 생산 주문/CCP 로그 변경 시 커밋 후 무효화
+    """
+
+    PRODUCTION_KEY = 'dashboard:production'
+    PRODUCTION_SUMMARY_KEY = 'dashboard:production_summary'
+    STATISTICS_KEY = 'dashboard:statistics'
+
+    # 생산 주문 변경 시 무효화 대상
+    PRODUCTION_KEYS = [PRODUCTION_KEY, PRODUCTION_SUMMARY_KEY, STATISTICS_KEY]
+    # CCP 로그 변경 시 무효화 대상 (주간 평균 효율성에 HACCP 준수율 포함)
+    HACCP_KEYS = [PRODUCTION_SUMMARY_KEY, STATISTICS_KEY]
+
+    def _get_or_build(self, key, builder):
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = builder()
+            cache.set(key, snapshot, DASHBOARD_SNAPSHOT_TTL_SECONDS)
+        return snapshot
+
+    def invalidate_production(self):
+        transaction.on_commit(lambda: cache.delete_many(self.PRODUCTION_KEYS))
+
+    def invalidate_haccp(self):
+        transaction.on_commit(lambda: cache.delete_many(self.HACCP_KEYS))
+
+    def get_production_dashboard(self):
+        """ProductionOrderViewSet.dashboard 응답 데이터"""
+        return self._get_or_build(self.PRODUCTION_KEY, self._build_production_dashboard)
+
+    def get_production_summary(self):
+        """ProductionQueryService.get_production_dashboard_data 응답 데이터"""
+        return self._get_or_build(self.PRODUCTION_SUMMARY_KEY, self._build_production_summary)
+
+    def get_statistics(self):
+        """StatisticsAPIView 응답 데이터"""
+        return self._get_or_build(self.STATISTICS_KEY, self._build_statistics)
+
+    def _build_production_dashboard(self):
+        now = timezone.now()
+        today = now.date()
+        week_ago = now - timedelta(days=7)
+        today_q = Q(planned_start_date__date=today)
+
+        # 1. 단일 집계: 오늘/전체/지연/최근 완료/평균 완료율
+        totals = ProductionOrder.objects.aggregate(
+            total_orders=Count('id'),
+            today_total=Count('id', filter=today_q),
+            today_in_progress=Count('id', filter=today_q & Q(status='in_progress')),
+            today_completed=Count('id', filter=today_q & Q(status='completed')),
+            today_planned=Count('id', filter=today_q & Q(status='planned')),
+            overdue_orders=Count('id', filter=Q(
+                planned_end_date__lt=now,
+                status__in=['planned', 'in_progress', 'on_hold']
+            )),
+            recent_completed=Count('id', filter=Q(status='completed', actual_end_date__gte=week_ago)),
+            avg_produced=Avg('produced_quantity', filter=Q(status='completed')),
+            avg_planned=Avg('planned_quantity', filter=Q(status='completed'))
+        )
+
+        # 2. 상태 x 우선순위 그룹 집계 (분포 두 개를 한 쿼리로)
+        status_counts = {status_name: 0 for _, status_name in ProductionOrder.STATUS_CHOICES}
+        priority_counts = {priority_name: 0 for _, priority_name in ProductionOrder.PRIORITY_CHOICES}
+        status_names = dict(ProductionOrder.STATUS_CHOICES)
+        priority_names = dict(ProductionOrder.PRIORITY_CHOICES)
+        for row in ProductionOrder.objects.values('status', 'priority').annotate(count=Count('id')).order_by():
+            if row['status'] in status_names:
+                status_counts[status_names[row['status']]] += row['count']
+            if row['priority'] in priority_names:
+                priority_counts[priority_names[row['priority']]] += row['count']
+
+        if totals['avg_produced'] is not None and totals['avg_planned']:
+            avg_completion_rate = totals['avg_produced'] * 100 / totals['avg_planned']
+        else:
+            avg_completion_rate = 0
+
+        return {
+            'today_summary': {
+                'total_orders': totals['today_total'],
+                'in_progress': totals['today_in_progress'],
+                'completed': totals['today_completed'],
+                'planned': totals['today_planned']
+            },
+            'overall_summary': {
+                'total_orders': totals['total_orders'],
+                'overdue_orders': totals['overdue_orders'],
+                'recent_completed': totals['recent_completed'],
+                'avg_completion_rate': round(avg_completion_rate, 2)
+            },
+            'status_distribution': status_counts,
+            'priority_distribution': priority_counts
+        }
+
+    def _build_production_summary(self):
+        # production_service/haccp_service가 이 모듈을 참조하므로 순환 import 방지
+        from core.services.production_service import ProductionQueryService
+
+        now = timezone.now()
+        today_q = Q(planned_start_date__date=now.date())
+        week_q = Q(created_at__gte=now - timedelta(days=7))
+
+        totals = ProductionOrder.objects.aggregate(
+            today_total=Count('id', filter=today_q),
+            today_in_progress=Count('id', filter=today_q & Q(status='in_progress')),
+            today_completed=Count('id', filter=today_q & Q(status='completed')),
+            today_planned=Count('id', filter=today_q & Q(status='planned')),
+            week_total=Count('id', filter=week_q),
+            week_completed=Count('id', filter=week_q & Q(status='completed')),
+            urgent_orders=Count('id', filter=Q(priority='urgent', status__in=['planned', 'in_progress'])),
+            overdue_orders=Count('id', filter=Q(
+                planned_end_date__lt=now,
+                status__in=['planned', 'in_progress']
+            ))
+        )
+
+        week_completed_orders = ProductionOrder.objects.filter(week_q, status='completed')
+
+        return {
+            'today_stats': {
+                'total_orders': totals['today_total'],
+                'in_progress': totals['today_in_progress'],
+                'completed': totals['today_completed'],
+                'planned': totals['today_planned']
+            },
+            'week_stats': {
+                'total_orders': totals['week_total'],
+                'completed_orders': totals['week_completed'],
+                'avg_efficiency': ProductionQueryService()._calculate_avg_efficiency(week_completed_orders)
+            },
+            'urgent_orders': totals['urgent_orders'],
+            'overdue_orders': totals['overdue_orders']
+        }
+
+    def _build_statistics(self):
+        from core.services.haccp_service import HaccpService
+
+        now = timezone.now()
+
+        # HACCP 준수율 (최근 30일)
+        compliance_stats = HaccpService().calculate_compliance_score(
+            date_from=now - timedelta(days=30),
+            date_to=now
+        )
+
+        # 중요 이탈 건수 (최근 7일, 측정 시각 기준 집계 테이블)
+        recent_totals = CCPRollupService().summarize(date_from=now - timedelta(days=7), date_to=now)
+
+        return {
+            'compliance_rate': round(compliance_stats.get('compliance_score', 0), 2),
+            'critical_issues_count': recent_totals['total'] - recent_totals['within_limits'],
+            'active_production_orders': ProductionOrder.objects.filter(status='in_progress').count(),
+        }
@@ -0,0 +1,88 @@
+from collections import defaultdict
+from django.db import transaction
+
+from core.constants import CONSECUTIVE_VIOLATION_THRESHOLD
+from core.models import CCP, CCPLog, CCPDeviationStreak
+from core.realtime import publish_critical_alert
+
+
+class DeviationStreakService:
+    """CCP별 연속 기준 이탈 상태 증분 유지 서비스"""
+
+    @transaction.atomic
+    def record_logs(self, logs):
+        """
+        신규 CCP 로그를 연속 이탈 상태에 반영
+        - 마지막 측정 이후 로그는 순서대로 증분 반영
+        - 마지막 측정보다 이전 시각 로그가 섞이면 해당 CCP만 이력에서 재계산
+        - 연속 이탈 횟수가 임계값에 새로 도달하면 실시간 중요 알림 발행
+        """
+        logs_by_ccp = defaultdict(list)
+        for log in logs:
+            logs_by_ccp[log.ccp_id].append(log)
+
+        # 교착 방지를 위해 CCP ID 순으로 잠금
+        for ccp_id in sorted(logs_by_ccp, key=str):
+            streak, _ = CCPDeviationStreak.objects.select_for_update().get_or_create(ccp_id=ccp_id)
+            ccp_logs = sorted(logs_by_ccp[ccp_id], key=lambda log: log.measured_at)
+            previous_run = streak.current_run
+
+            if streak.last_measured_at and ccp_logs[0].measured_at < streak.last_measured_at:
+                self._recompute(streak)
+            else:
+                for log in ccp_logs:
+                    self._advance(streak, log.is_within_limits, log.measured_at)
+                streak.save()
+
+            if previous_run < CONSECUTIVE_VIOLATION_THRESHOLD <= streak.current_run:
+                publish_critical_alert(streak, ccp=ccp_logs[0].ccp)
+
+    def _advance(self, streak, is_within_limits, measured_at):
+        if is_within_limits:
+            streak.current_run = 0
+            streak.run_started_at = None
+        else:
+            streak.current_run += 1
+            streak.run_started_at = streak.run_started_at or measured_at
+        streak.last_measured_at = measured_at
+
+    def _recompute(self, streak):
+        """최신 측정부터 역순으로 읽어 첫 기준 내 측정까지의 이탈 횟수 계산"""
+        streak.current_run = 0
+        streak.run_started_at = None
+        streak.last_measured_at = None
+
+        history = CCPLog.objects.filter(ccp_id=streak.ccp_id).order_by(
+            '-measured_at'
+        ).values_list('is_within_limits', 'measured_at')
+
+        for is_within_limits, measured_at in history.iterator(chunk_size=500):
+            if streak.last_measured_at is None:
+                streak.last_measured_at = measured_at
+            if is_within_limits:
+                break
+            streak.current_run += 1
+            streak.run_started_at = measured_at
+
+        streak.save()
+
+    @transaction.atomic
+    def rebuild(self, ccp_ids=None):
+        """이력 전체로부터 연속 이탈 상태 재생성"""
+        ccps = CCP.objects.all()
+        if ccp_ids is not None:
+            ccps = ccps.filter(id__in=ccp_ids)
+
+        rebuilt = 0
+        for ccp_id in ccps.order_by('id').values_list('id', flat=True):
+            streak, _ = CCPDeviationStreak.objects.select_for_update().get_or_create(ccp_id=ccp_id)
+            self._recompute(streak)
+            rebuilt += 1
+        return rebuilt
+
+    def get_active_streaks(self, threshold, since):
+        """임계 횟수 이상 연속 이탈 중이며 최근 측정이 있는 CCP 상태 목록"""
+        return CCPDeviationStreak.objects.filter(
+            current_run__gte=threshold,
+            last_measured_at__gte=since
+        ).select_related('ccp')
@@ -1,17 +1,29 @@
+import bisect
+from collections import defaultdict
 from datetime import datetime, timedelta
 from decimal import Decimal
-from django.db import models
-from django.db.models import Count, Q, Avg
+from django.db import models, transaction
+from django.db.models import Count, Q, Avg, Sum, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
-from core.models import CCP, CCPLog, ProductionOrder
+from core.models import (
+    CCP, CCPLog, CCPLogArchive, CCPLogHourlyRollup, CCPLogDailyRollup, ProductionOrder
+)
+from core.services.ccp_rollup_service import CCPRollupService, floor_hour
+from core.services.ccp_log_archive_service import ccp_log_models
+from core.services.deviation_streak_service import DeviationStreakService
+from core.services.dashboard_service import DashboardSnapshotService
+from core.realtime import publish_ccp_deviation
 from core.constants import (
     DUPLICATE_MEASUREMENT_THRESHOLD_MINUTES,
     VERIFICATION_REQUIRED_HOURS,
     CRITICAL_ALERT_HOURS,
     CONSECUTIVE_VIOLATION_DETECTION_HOURS,
-    CONSECUTIVE_VIOLATION_THRESHOLD
+    CONSECUTIVE_VIOLATION_THRESHOLD,
+    CCP_LOG_BULK_BATCH_SIZE,
+    CCP_STATISTICS_DAYS,
 )
 
 
@@ -56,25 +68,148 @@ class HaccpService:
             
         return ccp
 
+    @transaction.atomic
+    def bulk_create_ccp_logs(self, readings, created_by):
+        """
+        센서 측정값 대량 등록
+        - 참조 CCP/생산주문을 한 번에 조회
+        - 중복 측정 검사를 단일 범위 쿼리 + 메모리 비교로 처리
+        - 한계 기준 판정을 Python에서 수행 후 bulk_create
+        - 행 단위 오류는 전체 배치를 중단하지 않고 보고
+        
+        Args:
+            readings: [(index, validated_data), ...] - CCPLogCreateSerializer 검증 결과
+            created_by: 등록 사용자
+            
+        Returns:
+            dict: {'created': [CCPLog, ...], 'errors': [{'index': int, 'errors': ...}, ...]}
+        """
+        if created_by.role not in ['admin', 'quality_manager', 'operator']:
+            raise PermissionDenied('CCP 로그 기록 권한이 없습니다.')
+        
+        errors = []
+        if not readings:
+            return {'created': [], 'errors': errors}
+        
+        # 참조 데이터 일괄 조회
+        ccp_ids = {data['ccp_id'] for _, data in readings}
+        ccps = CCP.objects.filter(id__in=ccp_ids, is_active=True).in_bulk()
+        
+        order_ids = {data['production_order_id'] for _, data in readings if data.get('production_order_id')}
+        existing_order_ids = set(
+            ProductionOrder.objects.filter(id__in=order_ids).values_list('id', flat=True)
+        ) if order_ids else set()
+        
+        # 중복 측정 검사용 기존 측정 시각 (CCP별 정렬 목록)
+        threshold = timedelta(minutes=DUPLICATE_MEASUREMENT_THRESHOLD_MINUTES)
+        measured_times = [data['measured_at'] for _, data in readings]
+        existing_times = defaultdict(list)
+        existing_logs = CCPLog.objects.filter(
+            ccp_id__in=ccps.keys(),
+            measured_at__gte=min(measured_times) - threshold,
+            measured_at__lte=max(measured_times) + threshold
+        ).values_list('ccp_id', 'measured_at')
+        for ccp_id, measured_at in existing_logs:
+            existing_times[ccp_id].append(measured_at)
+        for times in existing_times.values():
+            times.sort()
+        
+        now = timezone.now()
+        logs_to_create = []
+        
+        for index, data in readings:
+            ccp = ccps.get(data['ccp_id'])
+            if ccp is None:
+                errors.append({'index': index, 'errors': '존재하지 않거나 비활성화된 CCP입니다.'})
+                continue
+            
+            measured_at = data['measured_at']
+            if measured_at > now:
+                errors.append({'index': index, 'errors': '미래 시점의 측정 시간은 입력할 수 없습니다.'})
+                continue
+            
+            production_order_id = data.get('production_order_id')
+            if production_order_id and production_order_id not in existing_order_ids:
+                errors.append({'index': index, 'errors': '존재하지 않는 생산 주문입니다.'})
+                continue
+            
+            # 같은 CCP의 ±threshold 구간에 기존(또는 같은 배치 내) 측정이 있는지 확인
+            times = existing_times[ccp.id]
+            position = bisect.bisect_left(times, measured_at - threshold)
+            if position < len(times) and times[position] <= measured_at + threshold:
+                errors.append({'index': index, 'errors': '동일 시간대에 이미 측정 기록이 존재합니다.'})
+                continue
+            bisect.insort(times, measured_at)
+            
+            is_within_limits, status = ccp.evaluate_measurement(data['measured_value'])
+            logs_to_create.append(CCPLog(
+                ccp=ccp,
+                production_order_id=production_order_id,
+                measured_value=data['measured_value'],
+                unit=data['unit'],
+                measured_at=measured_at,
+                status=status,
+                is_within_limits=is_within_limits,
+                deviation_notes=data.get('deviation_notes', ''),
+                corrective_action_taken=data.get('corrective_action_taken', ''),
+                measurement_device=data.get('measurement_device', ''),
+                environmental_conditions=data.get('environmental_conditions', ''),
+                created_by=created_by
+            ))
+        
+        created = CCPLog.objects.bulk_create(logs_to_create, batch_size=CCP_LOG_BULK_BATCH_SIZE)
+        
+        # bulk_create는 post_save 시그널을 발생시키지 않으므로 집계/연속 이탈 상태/실시간 푸시 직접 반영
+        CCPRollupService().record_logs(created)
+        DeviationStreakService().record_logs(created)
+        for log in created:
+            if not log.is_within_limits:
+                publish_ccp_deviation(log)
+        if created:
+            DashboardSnapshotService().invalidate_haccp()
+        
+        return {'created': created, 'errors': errors}
+
     def calculate_compliance_score(self, production_order=None, ccp=None, date_from=None, date_to=None):
         """
         HACCP 컴플라이언스 점수 계산
         - 기준 내 측정값 비율
         - 개선조치 적시성
         - 검증 완료율
-        """
-        queryset = CCPLog.objects.all()
         
+        생산 주문 조건이 없으면 CCP 로그 집계 테이블에서 계산
+        생산 주문 조건이 있으면 원본 + (기간이 이관 경계 이전이면) 보관 로그에서 계산
+        """
         if production_order:
-            queryset = queryset.filter(production_order=production_order)
-        if ccp:
-            queryset = queryset.filter(ccp=ccp)
-        if date_from:
-            queryset = queryset.filter(measured_at__gte=date_from)
-        if date_to:
-            queryset = queryset.filter(measured_at__lte=date_to)
-        
-        total_logs = queryset.count()
+            counts = {'total': 0, 'within_limits': 0, 'verified': 0}
+            for model in ccp_log_models(date_from):
+                queryset = model.objects.filter(production_order=production_order)
+                if ccp:
+                    queryset = queryset.filter(ccp=ccp)
+                if date_from:
+                    queryset = queryset.filter(measured_at__gte=date_from)
+                if date_to:
+                    queryset = queryset.filter(measured_at__lte=date_to)
+                
+                for key, value in queryset.aggregate(
+                    total=Count('id'),
+                    within_limits=Count('id', filter=Q(is_within_limits=True)),
+                    verified=Count('id', filter=Q(verified_by__isnull=False))
+                ).items():
+                    counts[key] += value
+        else:
+            counts = CCPRollupService().summarize(
+                date_from=date_from,
+                date_to=date_to,
+                ccp_ids=[ccp.id] if ccp else None
+            )
+        
+        return self._build_compliance_score(
+            counts['total'], counts['within_limits'], counts['verified']
+        )
+
+    def _build_compliance_score(self, total_logs, within_limits_count, verified_count):
+        """집계 건수로 컴플라이언스 점수 산출"""
         if total_logs == 0:
             return {
                 'compliance_score': 100,
@@ -84,9 +219,7 @@ class HaccpService:
                 'verification_rate': 0
             }
         
-        within_limits_count = queryset.filter(is_within_limits=True).count()
         out_of_limits_count = total_logs - within_limits_count
-        verified_count = queryset.filter(verified_by__isnull=False).count()
         
         compliance_rate = (within_limits_count / total_logs) * 100
         verification_rate = (verified_count / total_logs) * 100
@@ -148,31 +281,20 @@ class HaccpService:
                 'log_id': str(log.id)
             })
         
-        # 3. 연속 이탈 패턴 감지 (같은 CCP에서 설정 횟수 연속)
-        recent_logs = CCPLog.objects.filter(
-            measured_at__gte=timezone.now() - timedelta(hours=CONSECUTIVE_VIOLATION_DETECTION_HOURS)
-        ).order_by('ccp', '-measured_at')
+        # 3. 연속 이탈 패턴 감지 (CCP별 연속 이탈 상태에서 조회)
+        active_streaks = DeviationStreakService().get_active_streaks(
+            threshold=CONSECUTIVE_VIOLATION_THRESHOLD,
+            since=timezone.now() - timedelta(hours=CONSECUTIVE_VIOLATION_DETECTION_HOURS)
+        )
         
-        ccp_consecutive_count = {}
-        for log in recent_logs:
-            ccp_id = log.ccp.id
-            if ccp_id not in ccp_consecutive_count:
-                ccp_consecutive_count[ccp_id] = {'count': 0, 'ccp': log.ccp}
-            
-            if not log.is_within_limits:
-                ccp_consecutive_count[ccp_id]['count'] += 1
-            else:
-                ccp_consecutive_count[ccp_id]['count'] = 0
-        
-        for ccp_id, data in ccp_consecutive_count.items():
-            if data['count'] >= CONSECUTIVE_VIOLATION_THRESHOLD:
-                alerts.append({
-                    'type': 'consecutive_deviation',
-                    'severity': 'critical',
-                    'message': f'{data["ccp"].name} 연속 {data["count"]}회 기준 이탈',
-                    'ccp_code': data['ccp'].code,
-                    'consecutive_count': data['count']
-                })
+        for streak in active_streaks:
+            alerts.append({
+                'type': 'consecutive_deviation',
+                'severity': 'critical',
+                'message': f'{streak.ccp.name} 연속 {streak.current_run}회 기준 이탈',
+                'ccp_code': streak.ccp.code,
+                'consecutive_count': streak.current_run
+            })
         
         result = {
             'alert_period': f'최근 {hours}시간',
@@ -184,33 +306,44 @@ class HaccpService:
     def generate_compliance_report(self, date_from, date_to, user):
         """
         HACCP 컴플라이언스 보고서 생성
+        - CCP x 주간 구간 집계를 단일 그룹 쿼리로 조회
+        - 전체/CCP별/주간 트렌드는 메모리에서 합산
         """
         if user.role not in ['admin', 'quality_manager']:
             raise PermissionDenied('컴플라이언스 보고서 생성 권한이 없습니다.')
         
+        # 주간 구간: date_from부터 7일 단위 연속 구간
+        week_starts = []
+        current_date = date_from
+        while current_date <= date_to:
+            week_starts.append(current_date)
+            current_date += timedelta(days=7)
+        
+        buckets = self._aggregate_compliance_buckets(date_from, date_to, week_starts)
+        
+        def empty_counts():
+            return {'total': 0, 'within_limits': 0, 'verified': 0, 'sum_value': Decimal('0')}
+        
+        overall_counts = empty_counts()
+        ccp_counts = defaultdict(empty_counts)
+        week_counts = defaultdict(empty_counts)
+        for row in buckets:
+            for target in (overall_counts, ccp_counts[row['ccp_id']], week_counts[row['week']]):
+                target['total'] += row['total']
+                target['within_limits'] += row['within_limits']
+                target['verified'] += row['verified']
+                target['sum_value'] += row['sum_value'] or Decimal('0')
+        
         # 기간 내 전체 통계
-        overall_stats = self.calculate_compliance_score(
-            date_from=date_from,
-            date_to=date_to
+        overall_stats = self._build_compliance_score(
+            overall_counts['total'], overall_counts['within_limits'], overall_counts['verified']
         )
         
         # CCP별 상세 통계
         ccp_stats = []
-        active_ccps = CCP.objects.filter(is_active=True)
-        
-        for ccp in active_ccps:
-            ccp_compliance = self.calculate_compliance_score(
-                ccp=ccp,
-                date_from=date_from,
-                date_to=date_to
-            )
-            
-            # 평균 측정값 계산
-            avg_value = CCPLog.objects.filter(
-                ccp=ccp,
-                measured_at__gte=date_from,
-                measured_at__lte=date_to
-            ).aggregate(avg_value=Avg('measured_value'))['avg_value']
+        for ccp in CCP.objects.filter(is_active=True):
+            counts = ccp_counts.get(ccp.id) or empty_counts()
+            avg_value = counts['sum_value'] / counts['total'] if counts['total'] else None
             
             ccp_stats.append({
                 'ccp_name': ccp.name,
@@ -219,29 +352,25 @@ class HaccpService:
                 'critical_limit_min': ccp.critical_limit_min,
                 'critical_limit_max': ccp.critical_limit_max,
                 'avg_measured_value': round(float(avg_value) if avg_value else 0, 3),
-                **ccp_compliance
+                **self._build_compliance_score(
+                    counts['total'], counts['within_limits'], counts['verified']
+                )
             })
         
         # 트렌드 분석 (주간 단위)
         trend_data = []
-        current_date = date_from
-        
-        while current_date <= date_to:
-            week_end = min(current_date + timedelta(days=6), date_to)
-            
-            week_stats = self.calculate_compliance_score(
-                date_from=current_date,
-                date_to=week_end
+        for index, week_start in enumerate(week_starts):
+            counts = week_counts.get(index) or empty_counts()
+            week_stats = self._build_compliance_score(
+                counts['total'], counts['within_limits'], counts['verified']
             )
             
             trend_data.append({
-                'week_start': current_date,
-                'week_end': week_end,
+                'week_start': week_start,
+                'week_end': min(week_start + timedelta(days=6), date_to),
                 'compliance_score': week_stats['compliance_score'],
                 'total_measurements': week_stats['total_measurements']
             })
-            
-            current_date += timedelta(days=7)
         
         return {
             'report_period': {
@@ -255,13 +384,46 @@ class HaccpService:
             'generated_by': user.username
         }
 
+    def _aggregate_compliance_buckets(self, date_from, date_to, week_starts):
+        """
+        CCP x 주간 구간별 측정 건수/기준 내 건수/검증 건수/측정값 합계 집계
+        주간 경계가 date_from 기준이므로 TruncWeek 대신 구간 인덱스를 CASE로 계산
+        기간이 이관 경계 이전이면 보관 로그 집계 행을 이어 붙임 (호출 측에서 합산)
+        """
+        if not week_starts:
+            return []
+        
+        week_index = models.Case(
+            *[
+                models.When(measured_at__lt=week_start + timedelta(days=7), then=models.Value(index))
+                for index, week_start in enumerate(week_starts)
+            ],
+            default=models.Value(len(week_starts) - 1),
+            output_field=models.IntegerField()
+        )
+        
+        rows = []
+        for model in ccp_log_models(date_from):
+            rows.extend(model.objects.filter(
+                measured_at__gte=date_from,
+                measured_at__lte=date_to
+            ).annotate(week=week_index).values('ccp_id', 'week').annotate(
+                total=Count('id'),
+                within_limits=Count('id', filter=Q(is_within_limits=True)),
+                verified=Count('id', filter=Q(verified_by__isnull=False)),
+                sum_value=models.Sum('measured_value')
+            ).order_by())
+        return rows
+
 
 class HaccpQueryService:
     """HACCP 데이터 조회 최적화 서비스"""
 
     def get_ccp_logs_for_user(self, user, **filters):
         """사용자 역할에 따른 CCP 로그 조회"""
-        queryset = CCPLog.objects.select_related('ccp', 'created_by', 'production_order')
+        queryset = CCPLog.objects.select_related(
+            'ccp', 'created_by', 'production_order', 'corrective_action_by', 'verified_by'
+        )
         
         # 역할별 필터링
         if user.role == 'operator':
@@ -285,6 +447,43 @@ class HaccpQueryService:
         
         return queryset.order_by('-measured_at')
 
+    def get_archived_ccp_logs_for_user(self, user):
+        """사용자 역할에 따른 보관 CCP 로그 조회 (보존 기간이 지난 월)"""
+        queryset = CCPLogArchive.objects.select_related(
+            'ccp', 'created_by', 'production_order', 'corrective_action_by', 'verified_by'
+        )
+        if user.role == 'operator':
+            queryset = queryset.filter(created_by=user)
+        elif user.role not in ['admin', 'quality_manager']:
+            return CCPLogArchive.objects.none()
+        return queryset.order_by('-measured_at')
+
+    def with_log_statistics(self, queryset, days=CCP_STATISTICS_DAYS):
+        """
+        CCP 쿼리셋에 로그 통계 주석 추가 (CCP 목록 한 번의 쿼리)
+        - total_log_count: 일 집계 합계 (보관 이관된 로그 포함)
+        - recent_*: 최근 days일 시간 집계 합계 (정시 단위 경계)
+        - 집계 테이블의 (ccp, bucket_start) 유니크 인덱스만 읽으므로 로그 건수와 무관
+        """
+        since = floor_hour(timezone.now()) - timedelta(days=days)
+        
+        def rollup_sum(model, field, **filters):
+            total = model.objects.filter(ccp=OuterRef('pk'), **filters).order_by().values(
+                'ccp'
+            ).annotate(total=Sum(field)).values('total')
+            return Coalesce(Subquery(total), Value(0))
+        
+        return queryset.annotate(
+            total_log_count=rollup_sum(CCPLogDailyRollup, 'log_count'),
+            recent_log_count=rollup_sum(CCPLogHourlyRollup, 'log_count', bucket_start__gte=since),
+            recent_within_limits_count=rollup_sum(
+                CCPLogHourlyRollup, 'within_limits_count', bucket_start__gte=since
+            ),
+            recent_corrective_action_count=rollup_sum(
+                CCPLogHourlyRollup, 'corrective_action_count', bucket_start__gte=since
+            )
+        )
+
     def get_ccps_for_user(self, user):
         """사용자가 접근 가능한 CCP 목록"""
         if user.role in ['admin', 'quality_manager']:
@@ -0,0 +1,287 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Q, F, Value, DecimalField
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.constants import LOW_STOCK_DEFAULT_THRESHOLD
+from core.models import RawMaterial, MaterialLot, MaterialInventoryPosition, BOM
+
+
+class InventoryPositionService:
+    """
+    원자재별 재고 현황(MaterialInventoryPosition) 유지 서비스
+    - 로트 입고/소비/할당 시 해당 원자재 행을 같은 트랜잭션에서 재계산
+    - 만료 관련 카운트는 기준일(as_of_date)이 지난 행만 조회 시 재계산
+    - 잠금 순서: 현황 행(원자재 ID 순) → 로트. 재계산은 로트를 잠그지 않고
+      현황 행 잠금으로만 직렬화 (READ COMMITTED에서 잠금 획득 후 조회는 최신 커밋 기준)
+    """
+
+    ACTIVE_LOT_STATUSES = ['received', 'in_storage', 'in_use']
+    AVAILABLE_LOT_STATUSES = ['received', 'in_storage']
+    NEAR_EXPIRY_DAYS = 7
+    EXPIRY_WARNING_DAYS = 30
+
+    POSITION_FIELDS = [
+        'on_hand_quantity', 'available_quantity', 'active_lot_count', 'near_expiry_count',
+        'expiring_30d_count', 'expired_lot_count', 'total_value', 'next_expiry_date', 'as_of_date'
+    ]
+
+    @transaction.atomic
+    def lock_positions(self, material_ids):
+        """
+        원자재 ID 순으로 현황 행 잠금 (없으면 기준일 경과 상태로 생성)
+        - 로트를 잠그거나 수정하는 쓰기 경로에서 로트 잠금보다 먼저 호출
+
+        Returns:
+            dict: {원자재 ID(str): 잠긴 현황}
+        """
+        material_ids = sorted({str(material_id) for material_id in material_ids})
+        if not material_ids:
+            return {}
+
+        existing_ids = set(
+            str(material_id) for material_id in
+            MaterialInventoryPosition.objects.filter(raw_material_id__in=material_ids).values_list(
+                'raw_material_id', flat=True
+            )
+        )
+        missing_ids = RawMaterial.objects.filter(
+            id__in=[material_id for material_id in material_ids if material_id not in existing_ids]
+        ).values_list('id', flat=True)
+        # 동시 최초 생성은 무시 (같은 원자재 행은 하나만 남음)
+        MaterialInventoryPosition.objects.bulk_create([
+            MaterialInventoryPosition(
+                raw_material_id=material_id,
+                as_of_date=timezone.localdate() - timedelta(days=1)
+            )
+            for material_id in missing_ids
+        ], ignore_conflicts=True)
+
+        return {
+            str(position.raw_material_id): position
+            for position in MaterialInventoryPosition.objects.select_for_update().filter(
+                raw_material_id__in=material_ids
+            ).order_by('raw_material_id')
+        }
+
+    @transaction.atomic
+    def recompute(self, material_ids):
+        """원자재별 재고 현황 재계산 (현황 행 잠금 후 활성 로트 집계)"""
+        positions = self.lock_positions(material_ids)
+        if not positions:
+            return {}
+
+        today = timezone.localdate()
+        lots_by_material = self._active_lots(positions.keys())
+        for material_id, position in positions.items():
+            self._apply(position, lots_by_material[material_id], today)
+            position.updated_at = timezone.now()  # bulk_update는 auto_now를 갱신하지 않음
+
+        MaterialInventoryPosition.objects.bulk_update(
+            list(positions.values()), self.POSITION_FIELDS + ['updated_at']
+        )
+        return positions
+
+    def _active_lots(self, material_ids):
+        """원자재별 활성 로트 (잠금 없는 조회)"""
+        lots_by_material = defaultdict(list)
+        for lot in MaterialLot.objects.filter(
+            raw_material_id__in=list(material_ids),
+            status__in=self.ACTIVE_LOT_STATUSES,
+            quantity_current__gt=0
+        ).values('raw_material_id', 'status', 'quantity_current', 'unit_price', 'expiry_date'):
+            lots_by_material[str(lot['raw_material_id'])].append(lot)
+        return lots_by_material
+
+    def _apply(self, position, lots, today):
+        near_expiry_until = today + timedelta(days=self.NEAR_EXPIRY_DAYS)
+        warning_until = today + timedelta(days=self.EXPIRY_WARNING_DAYS)
+
+        position.on_hand_quantity = sum((lot['quantity_current'] for lot in lots), Decimal('0'))
+        position.available_quantity = sum(
+            (lot['quantity_current'] for lot in lots if lot['status'] in self.AVAILABLE_LOT_STATUSES),
+            Decimal('0')
+        )
+        position.active_lot_count = len(lots)
+        position.total_value = sum(
+            (lot['unit_price'] * lot['quantity_current'] for lot in lots), Decimal('0')
+        ).quantize(Decimal('0.01'))
+
+        expiry_dates = [lot['expiry_date'] for lot in lots if lot['expiry_date']]
+        position.near_expiry_count = sum(1 for day in expiry_dates if today <= day <= near_expiry_until)
+        position.expiring_30d_count = sum(1 for day in expiry_dates if day <= warning_until)
+        position.expired_lot_count = sum(1 for day in expiry_dates if day < today)
+        position.next_expiry_date = min((day for day in expiry_dates if day >= today), default=None)
+        position.as_of_date = today
+
+    def refresh_stale(self, material_ids=None):
+        """
+        현황 행이 없거나 기준일이 지난 원자재만 재계산 (조회 전 호출)
+        - 조회 요청에서는 행 잠금 없이 계산하고, 아직 기준일이 지난 행만 조건부 갱신
+          (그 사이 쓰기 경로가 오늘 기준으로 재계산했다면 갱신하지 않음)
+        """
+        today = timezone.localdate()
+        queryset = RawMaterial.objects.filter(
+            Q(inventory_position__isnull=True) |
+            Q(inventory_position__as_of_date__lt=today)
+        )
+        if material_ids is not None:
+            queryset = queryset.filter(id__in=material_ids)
+        stale_ids = [str(material_id) for material_id in queryset.values_list('id', flat=True)]
+        if not stale_ids:
+            return 0
+
+        positions = {
+            str(position.raw_material_id): position
+            for position in MaterialInventoryPosition.objects.filter(raw_material_id__in=stale_ids)
+        }
+        lots_by_material = self._active_lots(stale_ids)
+        now = timezone.now()
+
+        to_create = []
+        for material_id in stale_ids:
+            position = positions.get(material_id)
+            if position is None:
+                position = MaterialInventoryPosition(raw_material_id=material_id)
+                self._apply(position, lots_by_material[material_id], today)
+                to_create.append(position)
+                continue
+            self._apply(position, lots_by_material[material_id], today)
+            MaterialInventoryPosition.objects.filter(pk=position.pk, as_of_date__lt=today).update(
+                updated_at=now,
+                **{field: getattr(position, field) for field in self.POSITION_FIELDS}
+            )
+        MaterialInventoryPosition.objects.bulk_create(to_create, ignore_conflicts=True)
+        return len(stale_ids)
+
+    def get_positions(self, material_ids):
+        """
+        목록 페이지 원자재들의 재고 현황 {원자재 ID: 현황}
+        - 기준일이 지난 행만 일괄 재계산한 뒤 한 번에 조회 (원자재 수와 무관한 쿼리 수)
+        """
+        material_ids = list(set(material_ids))
+        if not material_ids:
+            return {}
+        self.refresh_stale(material_ids)
+        return {
+            position.raw_material_id: position
+            for position in MaterialInventoryPosition.objects.filter(raw_material_id__in=material_ids)
+        }
+
+    def get_position(self, material):
+        """단일 원자재 재고 현황 (필요 시 재계산)"""
+        return self.get_positions([material.id]).get(material.id)
+
+    def reconcile(self, material_ids=None, batch_size=500):
+        """
+        MaterialLot 기준 전체 재구성
+        - 오늘 기준으로 저장된 값과 달라진(또는 행이 없던) 원자재 수 반환 (증분 갱신 누락 점검용)
+        """
+        if material_ids is None:
+            material_ids = list(RawMaterial.objects.values_list('id', flat=True))
+        fields = [field for field in self.POSITION_FIELDS if field != 'as_of_date']
+
+        drifted = 0
+        for start in range(0, len(material_ids), batch_size):
+            chunk = material_ids[start:start + batch_size]
+            before = {
+                str(row['raw_material_id']): row
+                for row in MaterialInventoryPosition.objects.filter(
+                    raw_material_id__in=chunk,
+                    as_of_date=timezone.localdate()
+                ).values('raw_material_id', *fields)
+            }
+            for material_id, position in self.recompute(chunk).items():
+                previous = before.get(material_id)
+                if previous is None or any(previous[field] != getattr(position, field) for field in fields):
+                    drifted += 1
+        return drifted
+
+    def get_low_stock_report(self, threshold=None):
+        """
+        재고 부족 원자재 보고서
+        - 원자재별 재주문점(미지정 시 기본 임계값) 이하인 원자재를 현황/공급업체 조인 한 번으로 조회
+        - threshold 지정 시 모든 원자재에 같은 임계값 적용 (기존 API 호환)
+        - 계획 생산오더 소요량으로 재고 소진 예상일/안전 재고 미달 예상일 계산
+        """
+        # 현황 행이 없는 원자재만 먼저 생성 (재고 수량은 만료 기준일과 무관)
+        self.refresh_stale(RawMaterial.objects.filter(is_active=True).values_list('id', flat=True))
+
+        decimal_field = DecimalField(max_digits=14, decimal_places=3)
+        limit = (
+            Value(Decimal(str(threshold)), output_field=decimal_field) if threshold is not None
+            else Coalesce(
+                F('reorder_point'),
+                Value(Decimal(LOW_STOCK_DEFAULT_THRESHOLD), output_field=decimal_field),
+                output_field=decimal_field
+            )
+        )
+        materials = list(RawMaterial.objects.filter(is_active=True).select_related(
+            'supplier', 'inventory_position'
+        ).annotate(
+            current_stock=Coalesce(
+                F('inventory_position__available_quantity'),
+                Value(Decimal('0'), output_field=decimal_field),
+                output_field=decimal_field
+            ),
+            stock_limit=limit
+        ).filter(current_stock__lte=F('stock_limit')).order_by('code'))
+
+        demand = self._planned_demand([material.id for material in materials])
+
+        report = []
+        for material in materials:
+            depletion_date = None
+            below_safety_date = None
+            balance = material.current_stock
+            planned_demand = Decimal('0')
+            for planned_start_date, quantity in demand.get(material.id, []):
+                balance -= quantity
+                planned_demand += quantity
+                if below_safety_date is None and balance < material.safety_stock:
+                    below_safety_date = planned_start_date
+                if depletion_date is None and balance < 0:
+                    depletion_date = planned_start_date
+
+            report.append({
+                'id': material.id,
+                'name': material.name,
+                'code': material.code,
+                'current_stock': material.current_stock,
+                'unit': material.unit,
+                'reorder_point': material.stock_limit,
+                'safety_stock': material.safety_stock,
+                'shortfall': material.stock_limit - material.current_stock,
+                'planned_demand': planned_demand,
+                'projected_balance': balance,
+                'projected_below_safety_date': below_safety_date,
+                'projected_depletion_date': depletion_date,
+                'supplier': material.supplier.name,
+                'category': material.get_category_display()
+            })
+        return report
+
+    def _planned_demand(self, material_ids):
+        """원자재별 계획 생산오더 소요량 [(계획 시작일, 수량)] (시작일 순, BOM → 주문 조인 한 번)"""
+        if not material_ids:
+            return {}
+
+        demand = defaultdict(list)
+        for row in BOM.objects.filter(
+            raw_material_id__in=material_ids,
+            is_active=True,
+            finished_product__production_orders__status='planned'
+        ).values(
+            'raw_material_id',
+            'quantity_per_unit',
+            'finished_product__production_orders__planned_quantity',
+            'finished_product__production_orders__planned_start_date'
+        ).order_by('finished_product__production_orders__planned_start_date'):
+            demand[row['raw_material_id']].append((
+                row['finished_product__production_orders__planned_start_date'],
+                row['quantity_per_unit'] * row['finished_product__production_orders__planned_quantity']
+            ))
+        return demand
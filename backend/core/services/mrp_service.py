@@ -0,0 +1,166 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from django.db.models import Sum
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError, PermissionDenied
+
+from core.constants import MRP_MAX_HORIZON_DAYS
+from core.models import BOM, MaterialLot, ProductionOrder, RawMaterial
+from core.services.production_service import ProductionService
+
+
+class MRPService:
+    """
+    계획 생산 주문 전체에 대한 자재 소요량 계획 (MRP)
+    - 주문/BOM/가용 재고를 각각 단일 쿼리로 조회
+    - 소요량 전개와 순소요량 계산은 딕셔너리 집계로 메모리에서 처리
+    """
+
+    def run(self, user, horizon_days=14):
+        """
+        계획 상태 주문의 원자재 순소요량 계산
+        - 계획 시작일이 기간 내인 주문 (지난 계획 주문 포함)을 시작일 순으로 재고에 배정
+        - 원자재별 총소요량, 가용 재고, 부족량, 최초 부족 일자
+        - 일자별 부족 원자재와 부족 위험 주문
+        """
+        if user.role not in ['admin', 'quality_manager', 'production_manager']:
+            raise PermissionDenied('자재 소요량 계획 조회 권한이 없습니다.')
+
+        if horizon_days < 1 or horizon_days > MRP_MAX_HORIZON_DAYS:
+            raise ValidationError(f'계획 기간은 1~{MRP_MAX_HORIZON_DAYS}일 사이여야 합니다.')
+
+        now = timezone.now()
+        horizon_end = now + timedelta(days=horizon_days)
+
+        # 1. 계획 주문 (시작일, 생성일 순)
+        orders = list(ProductionOrder.objects.filter(
+            status='planned',
+            planned_start_date__lte=horizon_end
+        ).values(
+            'id', 'order_number', 'finished_product_id', 'planned_quantity', 'planned_start_date'
+        ).order_by('planned_start_date', 'created_at'))
+
+        # 2. 주문 제품 전체의 BOM 전개
+        bom_by_product = defaultdict(list)
+        for row in BOM.objects.filter(
+            finished_product_id__in={order['finished_product_id'] for order in orders},
+            is_active=True
+        ).values('finished_product_id', 'raw_material_id', 'quantity_per_unit'):
+            bom_by_product[row['finished_product_id']].append(
+                (row['raw_material_id'], row['quantity_per_unit'])
+            )
+
+        material_ids = {
+            material_id
+            for lines in bom_by_product.values()
+            for material_id, _ in lines
+        }
+
+        # 3. 원자재별 가용 재고 (start_production 할당 기준과 동일)
+        available = {
+            row['raw_material_id']: row['total']
+            for row in MaterialLot.objects.filter(
+                raw_material_id__in=material_ids,
+                status__in=ProductionService.ALLOCATABLE_LOT_STATUSES,
+                quantity_current__gt=0,
+                quality_test_passed=True
+            ).values('raw_material_id').annotate(total=Sum('quantity_current')).order_by()
+        }
+
+        materials = {
+            row['id']: row
+            for row in RawMaterial.objects.filter(id__in=material_ids).values('id', 'code', 'name', 'unit')
+        }
+
+        # 4. 시작일 순으로 재고 배정하며 순소요량 계산
+        balance = {material_id: available.get(material_id, Decimal('0')) for material_id in material_ids}
+        gross = defaultdict(Decimal)
+        daily_demand = defaultdict(lambda: defaultdict(Decimal))
+        shortage_by_date = defaultdict(lambda: defaultdict(Decimal))
+        first_shortage_date = {}
+        orders_at_risk = []
+        orders_without_bom = []
+
+        for order in orders:
+            lines = bom_by_product.get(order['finished_product_id'])
+            if not lines:
+                orders_without_bom.append(order['order_number'])
+                continue
+
+            order_date = timezone.localtime(order['planned_start_date']).date()
+            short_materials = []
+            for material_id, quantity_per_unit in lines:
+                required = quantity_per_unit * order['planned_quantity']
+                gross[material_id] += required
+                daily_demand[material_id][order_date] += required
+
+                balance[material_id] -= required
+                if balance[material_id] < 0:
+                    # 이번 주문으로 새로 부족해진 수량만 해당 일자에 기록
+                    shortage_by_date[order_date][material_id] += min(required, -balance[material_id])
+                    first_shortage_date.setdefault(material_id, order_date)
+                    short_materials.append(materials[material_id]['code'])
+
+            if short_materials:
+                orders_at_risk.append({
+                    'order_id': str(order['id']),
+                    'order_number': order['order_number'],
+                    'planned_start_date': order['planned_start_date'],
+                    'short_materials': short_materials
+                })
+
+        material_rows = []
+        for material_id in sorted(material_ids, key=lambda material_id: materials[material_id]['code']):
+            available_quantity = available.get(material_id, Decimal('0'))
+            projected = available_quantity
+            daily = []
+            for day in sorted(daily_demand[material_id]):
+                projected -= daily_demand[material_id][day]
+                daily.append({
+                    'date': day,
+                    'demand': daily_demand[material_id][day],
+                    'projected_balance': projected
+                })
+
+            material_rows.append({
+                'material_id': str(material_id),
+                'material_code': materials[material_id]['code'],
+                'material_name': materials[material_id]['name'],
+                'unit': materials[material_id]['unit'],
+                'gross_requirement': gross[material_id],
+                'available_quantity': available_quantity,
+                'net_shortage': max(gross[material_id] - available_quantity, Decimal('0')),
+                'first_shortage_date': first_shortage_date.get(material_id),
+                'daily': daily
+            })
+
+        return {
+            'horizon': {
+                'from': now,
+                'to': horizon_end,
+                'days': horizon_days
+            },
+            'summary': {
+                'order_count': len(orders),
+                'material_count': len(material_ids),
+                'shortage_material_count': len(first_shortage_date),
+                'orders_at_risk_count': len(orders_at_risk)
+            },
+            'materials': material_rows,
+            'shortages_by_date': [
+                {
+                    'date': day,
+                    'materials': [
+                        {
+                            'material_code': materials[material_id]['code'],
+                            'shortage_quantity': quantity
+                        }
+                        for material_id, quantity in shortage_by_date[day].items()
+                    ]
+                }
+                for day in sorted(shortage_by_date)
+            ],
+            'orders_at_risk': orders_at_risk,
+            'orders_without_bom': orders_without_bom
+        }
@@ -0,0 +1,118 @@
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Case, When, Value, BooleanField
+from django.utils import timezone
+
+from core.models import ProductionOrder, ProductionOrderBoardEntry
+
+
+class ProductionBoardService:
+    """
+    생산 주문 목록 읽기 모델(ProductionOrderBoardEntry) 유지 서비스
+    - 생산 주문 저장 시 같은 트랜잭션에서 해당 행 갱신
+    - 제품명/코드, 작업자 이름 변경 시 해당 행만 일괄 갱신
+    - 지연 여부는 시각에 따라 바뀌므로 저장하지 않고 open_deadline 비교로 조회 시 계산
+    """
+
+    CLOSED_STATUSES = ['completed', 'cancelled']
+
+    # 보드 컬럼 ← 생산 주문 values() 필드
+    SOURCE_FIELDS = {
+        'order_number': 'order_number',
+        'finished_product_id': 'finished_product_id',
+        'product_name': 'finished_product__name',
+        'product_code': 'finished_product__code',
+        'planned_quantity': 'planned_quantity',
+        'produced_quantity': 'produced_quantity',
+        'planned_start_date': 'planned_start_date',
+        'planned_end_date': 'planned_end_date',
+        'actual_start_date': 'actual_start_date',
+        'actual_end_date': 'actual_end_date',
+        'status': 'status',
+        'priority': 'priority',
+        'assigned_operator_id': 'assigned_operator_id',
+        'assigned_operator_username': 'assigned_operator__username',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+    UPDATE_FIELDS = list(SOURCE_FIELDS) + ['completion_rate', 'open_deadline']
+
+    @transaction.atomic
+    def sync(self, order_ids):
+        """생산 주문별 보드 행 생성/갱신 (조인 조회 1회)"""
+        order_ids = {str(order_id) for order_id in order_ids}
+        if not order_ids:
+            return 0
+
+        rows = ProductionOrder.objects.filter(id__in=order_ids).values('id', *self.SOURCE_FIELDS.values())
+        existing_ids = set(
+            str(order_id) for order_id in
+            ProductionOrderBoardEntry.objects.filter(production_order_id__in=order_ids).values_list(
+                'production_order_id', flat=True
+            )
+        )
+
+        to_create = []
+        to_update = []
+        for row in rows:
+            entry = self._build(row)
+            if str(row['id']) in existing_ids:
+                to_update.append(entry)
+            else:
+                to_create.append(entry)
+
+        ProductionOrderBoardEntry.objects.bulk_create(to_create)
+        ProductionOrderBoardEntry.objects.bulk_update(to_update, self.UPDATE_FIELDS)
+        return len(to_create) + len(to_update)
+
+    def _build(self, row):
+        entry = ProductionOrderBoardEntry(production_order_id=row['id'])
+        for field, source in self.SOURCE_FIELDS.items():
+            setattr(entry, field, row[source])
+        entry.assigned_operator_username = entry.assigned_operator_username or ''
+        entry.completion_rate = self.completion_rate(entry.planned_quantity, entry.produced_quantity)
+        entry.open_deadline = None if entry.status in self.CLOSED_STATUSES else entry.planned_end_date
+        return entry
+
+    def completion_rate(self, planned_quantity, produced_quantity):
+        """생산 완료율 (ProductionOrderSerializer와 동일한 계산)"""
+        if not planned_quantity:
+            return Decimal('0')
+        return round((produced_quantity / planned_quantity) * 100, 2)
+
+    def refresh_product(self, product):
+        """제품명/코드 변경 반영 (값이 다른 행만 갱신)"""
+        return ProductionOrderBoardEntry.objects.filter(finished_product_id=product.id).exclude(
+            product_name=product.name, product_code=product.code
+        ).update(product_name=product.name, product_code=product.code)
+
+    def refresh_operator(self, user):
+        """작업자 이름 변경 반영 (값이 다른 행만 갱신)"""
+        return ProductionOrderBoardEntry.objects.filter(assigned_operator_id=user.id).exclude(
+            assigned_operator_username=user.username
+        ).update(assigned_operator_username=user.username)
+
+    def release_operator(self, user):
+        """작업자 삭제 전 배정 해제 반영 (생산 주문의 SET_NULL은 저장 시그널 없이 처리됨)"""
+        return ProductionOrderBoardEntry.objects.filter(assigned_operator_id=user.id).update(
+            assigned_operator=None, assigned_operator_username=''
+        )
+
+    @transaction.atomic
+    def rebuild(self, batch_size=1000):
+        """전체 생산 주문으로부터 보드 재구성"""
+        ProductionOrderBoardEntry.objects.all().delete()
+        order_ids = list(ProductionOrder.objects.values_list('id', flat=True))
+        for index in range(0, len(order_ids), batch_size):
+            self.sync(order_ids[index:index + batch_size])
+        return len(order_ids)
+
+    def annotate_overdue(self, queryset):
+        """조회 시점 기준 지연 여부 (미완료 주문의 계획 종료 시각 경과)"""
+        return queryset.annotate(
+            is_overdue=Case(
+                When(open_deadline__lt=timezone.now(), then=Value(True)),
+                default=Value(False),
+                output_field=BooleanField()
+            )
+        )
@@ -1,16 +1,26 @@
+from collections import defaultdict
 from datetime import datetime, timedelta
 from decimal import Decimal
 from django.db import transaction, models
-from django.db.models import Sum, F, Q
+from django.db.models import Sum, F, Q, Count
 from django.utils import timezone
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
-from core.models import ProductionOrder, MaterialLot, RawMaterial, CCPLog, User
+from core.models import (
+    ProductionOrder, ProductionOrderBoardEntry, MaterialLot, RawMaterial, CCPLog, User, MaterialUsage
+)
+from core.services.dashboard_service import DashboardSnapshotService
+from core.services.cost_cache import invalidate_material_costs
+from core.services.inventory_service import InventoryPositionService
+from core.services.production_board_service import ProductionBoardService
 
 
 class ProductionService:
     """생산 주문 및 제조 실행 관련 비즈니스 로직"""
 
+    # 생산 투입 가능한 로트 상태 (보관중 또는 사용중)
+    ALLOCATABLE_LOT_STATUSES = ['in_storage', 'in_use']
+
     def validate_production_order_creation(self, order_data, user):
         """
         생산 주문 생성 전 검증
@@ -52,22 +62,18 @@ class ProductionService:
         if user.role not in ['admin', 'quality_manager', 'operator']:
             raise PermissionDenied('생산 시작 권한이 없습니다.')
         
+        # 동시 시작 방지를 위해 주문 행 잠금 후 상태 재확인
+        production_order = ProductionOrder.objects.select_for_update().select_related(
+            'finished_product'
+        ).get(pk=production_order.pk)
+        
         if production_order.status != 'planned':
             raise ValidationError('계획 상태의 주문만 시작할 수 있습니다.')
         
-        # 원자재 가용성 재검증
+        # 원자재 할당 및 재고 차감 (전체 후보 로트 잠금 → 메모리 계획 → 일괄 반영)
         required_materials = self._calculate_required_materials(production_order)
-        
-        for material_code, required_qty in required_materials.items():
-            available_qty = self._get_available_material_quantity(material_code)
-            if available_qty < required_qty:
-                raise ValidationError(
-                    f'원자재 부족: {material_code} (필요: {required_qty}, 가용: {available_qty})'
-                )
-        
-        # 원자재 할당 및 재고 차감
-        for material_code, required_qty in required_materials.items():
-            self._allocate_materials(material_code, required_qty, production_order)
+        allocations = self._plan_fifo_allocation(required_materials)
+        self._apply_allocations(allocations, production_order, user)
         
         # 생산 주문 상태 업데이트
         production_order.status = 'in_progress'
@@ -142,51 +148,125 @@ class ProductionService:
         if production_order.status not in ['completed']:
             return None
         
-        # 수량 효율성
-        quantity_efficiency = (
-            production_order.produced_quantity / production_order.planned_quantity
-        ) * 100
+        return self.get_production_efficiencies([production_order]).get(production_order.id)
+
+    def get_production_efficiencies(self, production_orders):
+        """
+        여러 생산 주문의 효율성 지표 일괄 계산
+        - CCP 로그 전체/기준 내 건수를 주문별 단일 그룹 쿼리로 조회
+        - 완료되지 않은 주문은 결과에서 제외
         
-        # 시간 효율성
-        planned_duration = (
-            production_order.planned_end_date - production_order.planned_start_date
-        ).total_seconds() / 3600  # 시간 단위
+        Returns:
+            dict: {주문 ID: get_production_efficiency와 동일한 지표}
+        """
+        completed_orders = [order for order in production_orders if order.status == 'completed']
+        if not completed_orders:
+            return {}
+        
+        ccp_counts = {
+            row['production_order_id']: row
+            for row in CCPLog.objects.filter(
+                production_order_id__in=[order.id for order in completed_orders]
+            ).values('production_order_id').annotate(
+                total=Count('id'),
+                compliant=Count('id', filter=Q(is_within_limits=True))
+            ).order_by()
+        }
         
-        actual_duration = (
-            production_order.actual_end_date - production_order.actual_start_date
-        ).total_seconds() / 3600
+        efficiencies = {}
+        for order in completed_orders:
+            # 수량 효율성
+            quantity_efficiency = (order.produced_quantity / order.planned_quantity) * 100
+            
+            # 시간 효율성
+            planned_duration = (
+                order.planned_end_date - order.planned_start_date
+            ).total_seconds() / 3600  # 시간 단위
+            
+            actual_duration = (
+                order.actual_end_date - order.actual_start_date
+            ).total_seconds() / 3600
+            
+            time_efficiency = (planned_duration / actual_duration) * 100 if actual_duration > 0 else 0
+            
+            # HACCP 준수율
+            counts = ccp_counts.get(order.id)
+            total_ccp_logs = counts['total'] if counts else 0
+            compliant_logs = counts['compliant'] if counts else 0
+            
+            haccp_compliance = (compliant_logs / total_ccp_logs) * 100 if total_ccp_logs > 0 else 100
+            
+            efficiencies[order.id] = {
+                'quantity_efficiency': round(quantity_efficiency, 2),
+                'time_efficiency': round(time_efficiency, 2),
+                'haccp_compliance': round(haccp_compliance, 2),
+                'overall_efficiency': round((quantity_efficiency + time_efficiency + haccp_compliance) / 3, 2)
+            }
         
-        time_efficiency = (planned_duration / actual_duration) * 100 if actual_duration > 0 else 0
+        return efficiencies
+
+    def get_efficiency_report(self, date_from, date_to, user):
+        """
+        기간 내 완료 주문 효율성 보고서 (실제 종료일 기준)
+        """
+        if user.role not in ['admin', 'quality_manager', 'production_manager']:
+            raise PermissionDenied('효율성 보고서 조회 권한이 없습니다.')
+        
+        completed_orders = list(
+            ProductionOrder.objects.filter(
+                status='completed',
+                actual_end_date__gte=date_from,
+                actual_end_date__lte=date_to
+            ).select_related('finished_product').order_by('-actual_end_date')
+        )
+        efficiencies = self.get_production_efficiencies(completed_orders)
         
-        # HACCP 준수율
-        total_ccp_logs = CCPLog.objects.filter(production_order=production_order).count()
-        compliant_logs = CCPLog.objects.filter(
-            production_order=production_order,
-            is_within_limits=True
-        ).count()
+        orders = []
+        for order in completed_orders:
+            efficiency = efficiencies.get(order.id)
+            if efficiency:
+                orders.append({
+                    'order_id': str(order.id),
+                    'order_number': order.order_number,
+                    'product_name': order.finished_product.name,
+                    'actual_end_date': order.actual_end_date,
+                    **efficiency
+                })
         
-        haccp_compliance = (compliant_logs / total_ccp_logs) * 100 if total_ccp_logs > 0 else 100
+        def average(key):
+            return round(sum(order[key] for order in orders) / len(orders), 2) if orders else 0
         
         return {
-            'quantity_efficiency': round(quantity_efficiency, 2),
-            'time_efficiency': round(time_efficiency, 2),
-            'haccp_compliance': round(haccp_compliance, 2),
-            'overall_efficiency': round((quantity_efficiency + time_efficiency + haccp_compliance) / 3, 2)
+            'report_period': {
+                'from': date_from,
+                'to': date_to
+            },
+            'summary': {
+                'total_orders': len(orders),
+                'avg_quantity_efficiency': average('quantity_efficiency'),
+                'avg_time_efficiency': average('time_efficiency'),
+                'avg_haccp_compliance': average('haccp_compliance'),
+                'avg_overall_efficiency': average('overall_efficiency')
+            },
+            'orders': orders
         }
 
     def _calculate_required_materials(self, production_order):
         """
         생산 주문에 필요한 원자재 계산 (BOM 기반)
+        
+        Returns:
+            dict: {RawMaterial: 총 필요 수량}
         """
         from core.models import BOM
         
         # 해당 제품의 활성 BOM 조회
-        bom_items = BOM.objects.filter(
+        bom_items = list(BOM.objects.filter(
             finished_product=production_order.finished_product,
             is_active=True
-        ).select_related('raw_material')
+        ).select_related('raw_material'))
         
-        if not bom_items.exists():
+        if not bom_items:
             raise ValidationError(
                 f'제품 "{production_order.finished_product.name}"의 BOM이 설정되지 않았습니다. '
                 f'제품 관리에서 BOM을 먼저 설정해주세요.'
@@ -198,61 +278,92 @@ class ProductionService:
             total_required = bom_item.calculate_total_required_quantity(
                 production_order.planned_quantity
             )
-            required_materials[bom_item.raw_material.code] = total_required
+            required_materials[bom_item.raw_material] = total_required
         
         return required_materials
 
-    def _get_available_material_quantity(self, material_code):
-        """지정된 원자재 코드의 가용 수량 조회 (품질검사 합격품만)"""
-        try:
-            material = RawMaterial.objects.get(code=material_code)
-            available_lots = MaterialLot.objects.filter(
-                raw_material=material,
-                status__in=['in_storage', 'in_use'],  # 보관중 또는 사용중 모두 가용
-                quantity_current__gt=0,
-                quality_test_passed=True  # 품질검사 합격한 것만
-            )
-            return available_lots.aggregate(
-                total=Sum('quantity_current')
-            )['total'] or 0
-        except RawMaterial.DoesNotExist:
-            return 0
+    def _lock_allocatable_lots(self, raw_material_ids):
+        """
+        할당 가능한 로트 전체를 단일 쿼리로 잠금 (품질검사 합격품만)
+        - 원자재, 입고일(FIFO), ID 순 정렬로 동시 시작 간 잠금 순서를 고정해 교착 방지
+        - 재고 현황 행을 먼저 잠가 로트 소비/재고 현황 재계산과 같은 잠금 순서 유지
+        """
+        InventoryPositionService().lock_positions(raw_material_ids)
+        lots_by_material = defaultdict(list)
+        lots = MaterialLot.objects.select_for_update().filter(
+            raw_material_id__in=raw_material_ids,
+            status__in=self.ALLOCATABLE_LOT_STATUSES,
+            quantity_current__gt=0,
+            quality_test_passed=True
+        ).order_by('raw_material_id', 'received_date', 'id')
+        
+        for lot in lots:
+            lots_by_material[lot.raw_material_id].append(lot)
+        return lots_by_material
 
-    def _allocate_materials(self, material_code, required_qty, production_order):
+    def _plan_fifo_allocation(self, required_materials):
         """
-        원자재 할당 및 재고 차감 (FIFO 방식)
+        잠긴 로트 기준 FIFO 할당 계획 (메모리 계산)
+        - 부족한 원자재가 있으면 아무것도 차감하지 않고 검증 오류
+        
+        Returns:
+            list: [(RawMaterial, MaterialLot, 할당 수량)]
         """
-        try:
-            material = RawMaterial.objects.get(code=material_code)
-            available_lots = MaterialLot.objects.filter(
-                raw_material=material,
-                status__in=['in_storage', 'in_use'],  # 보관중 또는 사용중 모두 가용
-                quantity_current__gt=0,
-                quality_test_passed=True  # 품질검사 합격한 것만
-            ).order_by('received_date')  # FIFO
+        lots_by_material = self._lock_allocatable_lots(
+            [material.id for material in required_materials]
+        )
+        
+        shortages = []
+        allocations = []
+        for material, required_qty in required_materials.items():
+            lots = lots_by_material.get(material.id, [])
+            available_qty = sum((lot.quantity_current for lot in lots), Decimal('0'))
+            if available_qty < required_qty:
+                shortages.append(f'{material.code} (필요: {required_qty}, 가용: {available_qty})')
+                continue
             
             remaining_qty = required_qty
-            
-            for lot in available_lots:
+            for lot in lots:
                 if remaining_qty <= 0:
                     break
-                
-                if lot.quantity_current >= remaining_qty:
-                    # 이 로트에서 모든 수량 충당 가능
-                    lot.quantity_current -= remaining_qty
-                    if lot.quantity_current == 0:
-                        lot.status = 'used'
-                    remaining_qty = 0
-                else:
-                    # 이 로트를 모두 사용하고 다음 로트로
-                    remaining_qty -= lot.quantity_current
-                    lot.quantity_current = 0
-                    lot.status = 'used'
-                
-                lot.save()
-        
-        except RawMaterial.DoesNotExist:
-            raise ValidationError(f'원자재 코드 {material_code}를 찾을 수 없습니다.')
+                used_qty = min(lot.quantity_current, remaining_qty)
+                allocations.append((material, lot, used_qty))
+                remaining_qty -= used_qty
+        
+        if shortages:
+            raise ValidationError(f'원자재 부족: {", ".join(shortages)}')
+        
+        return allocations
+
+    def _apply_allocations(self, allocations, production_order, user):
+        """할당 계획을 로트 일괄 수정과 사용 이력 일괄 생성으로 반영"""
+        now = timezone.now()
+        lots = []
+        usages = []
+        for material, lot, used_qty in allocations:
+            lot.quantity_current -= used_qty
+            if lot.quantity_current == 0:
+                lot.status = 'used'
+            lot.updated_at = now  # bulk_update는 auto_now를 갱신하지 않음
+            lots.append(lot)
+            usages.append(MaterialUsage(
+                material_lot=lot,
+                raw_material=material,
+                production_order=production_order,
+                usage_type='production',
+                quantity=used_qty,
+                unit_price=lot.unit_price,
+                used_at=now,
+                created_by=user
+            ))
+        
+        MaterialLot.objects.bulk_update(lots, ['quantity_current', 'status', 'updated_at'])
+        MaterialUsage.objects.bulk_create(usages)
+        
+        # bulk_update는 post_save 시그널이 없으므로 재고 현황/원가 캐시를 직접 갱신
+        material_ids = {material.id for material, _, _ in allocations}
+        InventoryPositionService().recompute(material_ids)
+        invalidate_material_costs(material_ids)
 
 
 class ProductionQueryService:
@@ -284,60 +395,41 @@ class ProductionQueryService:
         
         return queryset.order_by('-created_at')
 
+    def get_board_entries_for_user(self, user):
+        """사용자 역할에 따른 생산 주문 목록 읽기 모델 조회 (get_production_orders_for_user와 같은 권한)"""
+        queryset = ProductionOrderBoardEntry.objects.all()
+        
+        if user.role == 'operator':
+            queryset = queryset.filter(assigned_operator=user)
+        elif user.role not in ['admin', 'quality_manager', 'production_manager']:
+            return ProductionOrderBoardEntry.objects.none()
+        
+        return ProductionBoardService().annotate_overdue(queryset).order_by('-created_at')
+
+    def get_upcoming_board_entries(self, days_ahead):
+        """기간 내 시작 예정인 계획 상태 주문 (상태+계획 시작 인덱스 범위 조회)"""
+        now = timezone.now()
+        queryset = ProductionOrderBoardEntry.objects.filter(
+            status='planned',
+            planned_start_date__gte=now,
+            planned_start_date__lte=now + timedelta(days=days_ahead)
+        ).order_by('planned_start_date')
+        return ProductionBoardService().annotate_overdue(queryset)
+
     def get_production_dashboard_data(self, user):
         """생산 대시보드용 요약 데이터"""
         if user.role not in ['admin', 'quality_manager', 'production_manager']:
             raise PermissionDenied('대시보드 조회 권한이 없습니다.')
         
-        today = timezone.now().date()
-        
-        # 오늘 생산 현황
-        today_orders = ProductionOrder.objects.filter(
-            planned_start_date__date=today
-        )
-        
-        # 주간 통계 (최근 7일)
-        week_ago = timezone.now() - timedelta(days=7)
-        week_orders = ProductionOrder.objects.filter(
-            created_at__gte=week_ago
-        )
-        
-        return {
-            'today_stats': {
-                'total_orders': today_orders.count(),
-                'in_progress': today_orders.filter(status='in_progress').count(),
-                'completed': today_orders.filter(status='completed').count(),
-                'planned': today_orders.filter(status='planned').count()
-            },
-            'week_stats': {
-                'total_orders': week_orders.count(),
-                'completed_orders': week_orders.filter(status='completed').count(),
-                'avg_efficiency': self._calculate_avg_efficiency(week_orders.filter(status='completed'))
-            },
-            'urgent_orders': ProductionOrder.objects.filter(
-                priority='urgent',
-                status__in=['planned', 'in_progress']
-            ).count(),
-            'overdue_orders': ProductionOrder.objects.filter(
-                planned_end_date__lt=timezone.now(),
-                status__in=['planned', 'in_progress']
-            ).count()
-        }
+        # 그룹 집계 스냅샷 (짧은 TTL 캐시, 생산 주문 변경 시 무효화)
+        return DashboardSnapshotService().get_production_summary()
 
     def _calculate_avg_efficiency(self, completed_orders):
         """완료된 주문들의 평균 효율성 계산"""
-        if not completed_orders.exists():
-            return 0
-        
-        production_service = ProductionService()
-        efficiencies = []
+        efficiencies = ProductionService().get_production_efficiencies(list(completed_orders))
         
-        for order in completed_orders:
-            efficiency_data = production_service.get_production_efficiency(order)
-            if efficiency_data:
-                efficiencies.append(efficiency_data['overall_efficiency'])
-        
-        return round(sum(efficiencies) / len(efficiencies), 2) if efficiencies else 0
+        overall = [efficiency['overall_efficiency'] for efficiency in efficiencies.values()]
+        return round(sum(overall) / len(overall), 2) if overall else 0
 
 
 class MaterialTraceabilityService:
@@ -347,7 +439,7 @@ class MaterialTraceabilityService:
         """
         원자재 로트의 완전한 추적성 정보 조회
         - 공급업체 정보
-        - 사용된 생산 주문
+        - 사용된 생산 주문 (MaterialUsage 기준)
         - 품질 검사 이력
         """
         try:
@@ -355,12 +447,12 @@ class MaterialTraceabilityService:
                 'raw_material', 'supplier', 'created_by'
             ).get(id=material_lot_id)
             
-            # 이 로트가 사용된 생산 주문 조회 (임시 로직)
-            # TODO: 실제로는 MaterialUsage 중간 테이블이 필요
-            related_orders = ProductionOrder.objects.filter(
-                created_at__gte=lot.received_date,
-                status__in=['completed', 'in_progress']
-            )
+            # 이 로트의 사용 이력 (로트 + 사용 시각 인덱스)
+            usages = MaterialUsage.objects.filter(
+                material_lot=lot
+            ).select_related(
+                'production_order__finished_product'
+            ).order_by('used_at')
             
             return {
                 'lot_info': {
@@ -376,7 +468,7 @@ class MaterialTraceabilityService:
                 'supplier_info': {
                     'name': lot.supplier.name,
                     'code': lot.supplier.code,
-                    'contact': lot.supplier.contact_email
+                    'contact': lot.supplier.email
                 },
                 'quality_info': {
                     'test_passed': lot.quality_test_passed,
@@ -385,12 +477,15 @@ class MaterialTraceabilityService:
                 },
                 'usage_history': [
                     {
-                        'order_number': order.order_number,
-                        'product_name': order.finished_product.name,
-                        'start_date': order.actual_start_date,
-                        'status': order.get_status_display()
+                        'order_number': usage.production_order.order_number if usage.production_order else None,
+                        'product_name': usage.production_order.finished_product.name if usage.production_order else None,
+                        'start_date': usage.production_order.actual_start_date if usage.production_order else None,
+                        'status': usage.production_order.get_status_display() if usage.production_order else None,
+                        'usage_type': usage.get_usage_type_display(),
+                        'quantity_used': usage.quantity,
+                        'used_at': usage.used_at
                     }
-                    for order in related_orders
+                    for usage in usages
                 ]
             }
             
@@ -399,21 +494,24 @@ class MaterialTraceabilityService:
 
     def get_forward_traceability(self, production_order_id):
         """
-        전방 추적성: 사용된 원자재 → 완성품
+        전방 추적성: 사용된 원자재 → 완성품 (MaterialUsage 기준)
         """
         try:
             order = ProductionOrder.objects.select_related(
                 'finished_product'
             ).get(id=production_order_id)
             
-            # TODO: MaterialUsage 테이블 구현 후 실제 사용된 로트 조회
-            # 현재는 시간 기반 추정
-            used_materials = MaterialLot.objects.filter(
-                raw_material__code__contains=order.finished_product.code[:3],
-                status='used',
-                updated_at__gte=order.actual_start_date,
-                updated_at__lte=order.actual_end_date or timezone.now()
-            )
+            # 주문에 투입된 로트별 사용량 (주문 + 로트 인덱스)
+            used_lots = MaterialUsage.objects.filter(
+                production_order=order
+            ).values(
+                'material_lot__lot_number',
+                'material_lot__raw_material__name',
+                'material_lot__supplier__name',
+                'material_lot__received_date'
+            ).annotate(
+                quantity_used=Sum('quantity')
+            ).order_by('material_lot__raw_material__name', 'material_lot__received_date')
             
             return {
                 'production_info': {
@@ -424,14 +522,15 @@ class MaterialTraceabilityService:
                 },
                 'used_materials': [
                     {
-                        'lot_number': lot.lot_number,
-                        'material_name': lot.raw_material.name,
-                        'supplier': lot.supplier.name,
-                        'received_date': lot.received_date
+                        'lot_number': row['material_lot__lot_number'],
+                        'material_name': row['material_lot__raw_material__name'],
+                        'supplier': row['material_lot__supplier__name'],
+                        'received_date': row['material_lot__received_date'],
+                        'quantity_used': row['quantity_used']
                     }
-                    for lot in used_materials
+                    for row in used_lots
                 ]
             }
             
         except ProductionOrder.DoesNotExist:
-            raise ValidationError('존재하지 않는 생산 주문입니다.')
\ No newline at end of file
+            raise ValidationError('존재하지 않는 생산 주문입니다.')
@@ -0,0 +1,273 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db.models import Count, Q, Sum
+from rest_framework.exceptions import ValidationError, PermissionDenied
+
+from core.constants import RECALL_MAX_DEPTH, RECALL_QUERY_CHUNK_SIZE
+from core.models import MaterialLot, ProductionOrder, MaterialUsage
+from core.services.ccp_log_archive_service import ccp_log_models
+
+
+def _chunked(values, size=RECALL_QUERY_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+class LotGenealogy:
+    """
+    로트 ↔ 생산 주문 이분 그래프 탐색 결과
+    - lot_depth / order_depth: 시작점으로부터의 단계 (시작 로트 0, 직접 사용 주문 1, ...)
+    - edges: {(로트 ID, 주문 ID): 사용 수량}
+    """
+
+    def __init__(self):
+        self.lot_depth = {}
+        self.order_depth = {}
+        self.edges = {}
+
+    def implicating_edges(self):
+        """주문을 영향 범위에 포함시킨 (직전 단계 로트 → 주문) 간선"""
+        by_order = defaultdict(list)
+        for (lot_id, order_id), quantity in self.edges.items():
+            lot_depth = self.lot_depth.get(lot_id)
+            if lot_depth is not None and lot_depth == self.order_depth[order_id] - 1:
+                by_order[order_id].append((lot_id, quantity))
+        return by_order
+
+
+class RecallService:
+    """
+    원자재 로트 리콜 영향 분석
+    - 사용 이력(MaterialUsage)으로 로트 → 생산 주문 → 같은 주문에 투입된 로트 ... 다단계 탐색
+    - 단계별로 현재 경계 노드 전체를 묶어 조회 (노드당 쿼리 없음)
+    """
+
+    def _check_permission(self, user):
+        if user.role not in ['admin', 'quality_manager']:
+            raise PermissionDenied('리콜 영향 분석 권한이 없습니다.')
+
+    def _validate_depth(self, max_depth):
+        if max_depth < 1 or max_depth > RECALL_MAX_DEPTH:
+            raise ValidationError(f'탐색 단계는 1~{RECALL_MAX_DEPTH} 사이여야 합니다.')
+
+    def trace(self, lot_ids=(), order_ids=(), max_depth=RECALL_MAX_DEPTH):
+        """
+        너비 우선 탐색으로 로트/주문 계보 수집
+        - 한 단계 = 로트 → 주문 조회 1회 + 주문 → 로트 조회 1회 (경계가 크면 청크 단위)
+        - lot_ids에서 시작하면 하류(주문 방향), order_ids에서 시작하면 상류(로트 방향)부터 탐색
+        """
+        genealogy = LotGenealogy()
+        frontier_lots = set(lot_ids)
+        frontier_orders = set(order_ids)
+        for lot_id in frontier_lots:
+            genealogy.lot_depth[lot_id] = 0
+        for order_id in frontier_orders:
+            genealogy.order_depth[order_id] = 0
+
+        depth = 0
+        while (frontier_lots or frontier_orders) and depth < max_depth:
+            depth += 1
+
+            # 로트 → 주문
+            for row in self._usage_rows('material_lot_id__in', frontier_lots):
+                self._add_edge(genealogy, row)
+                if row['production_order_id'] not in genealogy.order_depth:
+                    genealogy.order_depth[row['production_order_id']] = depth
+                    frontier_orders.add(row['production_order_id'])
+            frontier_lots = set()
+
+            # 주문 → 로트
+            for row in self._usage_rows('production_order_id__in', frontier_orders):
+                self._add_edge(genealogy, row)
+                if row['material_lot_id'] not in genealogy.lot_depth:
+                    genealogy.lot_depth[row['material_lot_id']] = depth
+                    frontier_lots.add(row['material_lot_id'])
+            frontier_orders = set()
+
+        return genealogy
+
+    def _usage_rows(self, lookup, ids):
+        for chunk in _chunked(ids):
+            yield from MaterialUsage.objects.filter(
+                **{lookup: chunk},
+                production_order__isnull=False
+            ).values('material_lot_id', 'production_order_id').annotate(
+                quantity=Sum('quantity')
+            ).order_by()
+
+    def _add_edge(self, genealogy, row):
+        genealogy.edges[(row['material_lot_id'], row['production_order_id'])] = row['quantity']
+
+    def _fetch_in_chunks(self, queryset, lookup, ids):
+        rows = []
+        for chunk in _chunked(ids):
+            rows.extend(queryset.filter(**{lookup: chunk}))
+        return rows
+
+    def analyze_lot_recall(self, lot_id, user, max_depth=RECALL_MAX_DEPTH):
+        """
+        로트 리콜 영향 분석
+        - 영향 생산 주문과 원인 로트/투입 수량
+        - 영향 완제품(출하 제품)별 생산량
+        - 영향 주문의 CCP 로그/기준 이탈 건수
+        - 같은 주문에 함께 투입된 다른 로트
+        """
+        self._check_permission(user)
+        self._validate_depth(max_depth)
+
+        source = MaterialLot.objects.select_related('raw_material', 'supplier').filter(id=lot_id).first()
+        if source is None:
+            raise ValidationError('존재하지 않는 원자재 로트입니다.')
+
+        genealogy = self.trace(lot_ids=[source.id], max_depth=max_depth)
+        return self._build_impact(genealogy, source, max_depth)
+
+    def get_genealogy(self, user, lot_id=None, order_id=None, max_depth=RECALL_MAX_DEPTH):
+        """로트 또는 생산 주문 기준 계보 그래프 (노드/간선)"""
+        self._check_permission(user)
+        self._validate_depth(max_depth)
+
+        genealogy = self.trace(
+            lot_ids=[lot_id] if lot_id else (),
+            order_ids=[order_id] if order_id else (),
+            max_depth=max_depth
+        )
+        lots = self._fetch_lots(genealogy.lot_depth)
+        orders = self._fetch_orders(genealogy.order_depth)
+
+        return {
+            'max_depth': max_depth,
+            'lots': [
+                {**self._lot_summary(lots[lot_id]), 'depth': depth}
+                for lot_id, depth in sorted(genealogy.lot_depth.items(), key=lambda item: item[1])
+                if lot_id in lots
+            ],
+            'orders': [
+                {**self._order_summary(orders[order_id]), 'depth': depth}
+                for order_id, depth in sorted(genealogy.order_depth.items(), key=lambda item: item[1])
+                if order_id in orders
+            ],
+            'edges': [
+                {'lot_id': str(lot_id), 'order_id': str(order_id), 'quantity': quantity}
+                for (lot_id, order_id), quantity in genealogy.edges.items()
+            ]
+        }
+
+    def _fetch_lots(self, lot_ids):
+        queryset = MaterialLot.objects.select_related('raw_material', 'supplier')
+        return {lot.id: lot for lot in self._fetch_in_chunks(queryset, 'id__in', lot_ids)}
+
+    def _fetch_orders(self, order_ids):
+        queryset = ProductionOrder.objects.select_related('finished_product')
+        return {order.id: order for order in self._fetch_in_chunks(queryset, 'id__in', order_ids)}
+
+    def _fetch_ccp_counts(self, order_ids):
+        """생산 주문별 CCP 로그/이탈 건수 (오래된 주문은 보관 로그 포함)"""
+        counts = defaultdict(lambda: {'total': 0, 'deviations': 0})
+        log_models = ccp_log_models()
+        for chunk in _chunked(order_ids):
+            for model in log_models:
+                for row in model.objects.filter(production_order_id__in=chunk).values(
+                    'production_order_id'
+                ).annotate(
+                    total=Count('id'),
+                    deviations=Count('id', filter=Q(is_within_limits=False))
+                ).order_by():
+                    target = counts[row['production_order_id']]
+                    target['total'] += row['total']
+                    target['deviations'] += row['deviations']
+        return counts
+
+    def _lot_summary(self, lot):
+        return {
+            'lot_id': str(lot.id),
+            'lot_number': lot.lot_number,
+            'material_name': lot.raw_material.name,
+            'material_code': lot.raw_material.code,
+            'supplier_name': lot.supplier.name,
+            'status': lot.status,
+            'quantity_current': lot.quantity_current
+        }
+
+    def _order_summary(self, order):
+        return {
+            'order_id': str(order.id),
+            'order_number': order.order_number,
+            'product_name': order.finished_product.name,
+            'product_code': order.finished_product.code,
+            'status': order.status,
+            'planned_quantity': order.planned_quantity,
+            'produced_quantity': order.produced_quantity
+        }
+
+    def _build_impact(self, genealogy, source, max_depth):
+        lots = self._fetch_lots(genealogy.lot_depth)
+        orders = self._fetch_orders(genealogy.order_depth)
+        ccp_counts = self._fetch_ccp_counts(genealogy.order_depth)
+        implicating = genealogy.implicating_edges()
+
+        affected_orders = []
+        products = {}
+        totals = {
+            'produced_quantity': Decimal('0'),
+            'implicated_quantity': Decimal('0'),
+            'ccp_log_count': 0,
+            'ccp_deviation_count': 0
+        }
+        for order_id, depth in sorted(genealogy.order_depth.items(), key=lambda item: item[1]):
+            order = orders.get(order_id)
+            if order is None:
+                continue
+            causes = implicating.get(order_id, [])
+            implicated_quantity = sum((quantity for _, quantity in causes), Decimal('0'))
+            counts = ccp_counts.get(order_id, {'total': 0, 'deviations': 0})
+            produced = order.produced_quantity or Decimal('0')
+
+            affected_orders.append({
+                **self._order_summary(order),
+                'depth': depth,
+                'implicated_lots': [lots[lot_id].lot_number for lot_id, _ in causes if lot_id in lots],
+                'implicated_quantity': implicated_quantity,
+                'ccp_log_count': counts['total'],
+                'ccp_deviation_count': counts['deviations']
+            })
+
+            product = products.setdefault(order.finished_product_id, {
+                'product_name': order.finished_product.name,
+                'product_code': order.finished_product.code,
+                'order_count': 0,
+                'produced_quantity': Decimal('0')
+            })
+            product['order_count'] += 1
+            product['produced_quantity'] += produced
+
+            totals['produced_quantity'] += produced
+            totals['implicated_quantity'] += implicated_quantity
+            totals['ccp_log_count'] += counts['total']
+            totals['ccp_deviation_count'] += counts['deviations']
+
+        related_lots = [
+            {**self._lot_summary(lots[lot_id]), 'depth': depth}
+            for lot_id, depth in sorted(genealogy.lot_depth.items(), key=lambda item: item[1])
+            if depth > 0 and lot_id in lots
+        ]
+
+        return {
+            'source_lot': self._lot_summary(source),
+            'max_depth': max_depth,
+            'summary': {
+                'affected_order_count': len(affected_orders),
+                'affected_product_count': len(products),
+                'related_lot_count': len(related_lots),
+                'total_produced_quantity': totals['produced_quantity'],
+                'implicated_quantity': totals['implicated_quantity'],
+                'ccp_log_count': totals['ccp_log_count'],
+                'ccp_deviation_count': totals['ccp_deviation_count']
+            },
+            'affected_orders': affected_orders,
+            'affected_products': sorted(
+                products.values(), key=lambda product: product['produced_quantity'], reverse=True
+            ),
+            'related_lots': related_lots
+        }
@@ -0,0 +1,162 @@
+"""
+모델 변경 이벤트 처리
+- 집계/파생 테이블의 증분 유지
+"""
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from core.models import CCPLog, ProductionOrder, FinishedProduct, User, BOM, MaterialLot
+from core.realtime import publish_ccp_deviation, publish_production_status_change
+from core.services.ccp_rollup_service import CCPRollupService
+from core.services.deviation_streak_service import DeviationStreakService
+from core.services.dashboard_service import DashboardSnapshotService
+from core.services.cost_cache import invalidate_product_costs, invalidate_material_costs
+from core.services.inventory_service import InventoryPositionService
+from core.services.production_board_service import ProductionBoardService
+
+
+@receiver(pre_save, sender=CCPLog)
+def capture_ccp_log_previous_state(sender, instance, raw=False, **kwargs):
+    """수정 전 상태 보관 (집계 보정용)"""
+    if raw or instance._state.adding:
+        return
+    instance._previous_state = CCPLog.objects.filter(pk=instance.pk).values(
+        'status', 'verified_by_id'
+    ).first()
+
+
+@receiver(post_save, sender=CCPLog)
+def update_ccp_log_rollups(sender, instance, created, raw=False, **kwargs):
+    """CCP 로그 생성/검증 시 시간·일 집계 증분 반영"""
+    if raw:
+        return
+    
+    rollup_service = CCPRollupService()
+    if created:
+        rollup_service.record_logs([instance])
+        return
+    
+    previous_state = getattr(instance, '_previous_state', None)
+    if previous_state:
+        rollup_service.record_log_update(instance, previous_state)
+
+
+@receiver(post_save, sender=CCPLog)
+def update_ccp_deviation_streak(sender, instance, created, raw=False, **kwargs):
+    """CCP 로그 생성 시 연속 이탈 상태 갱신"""
+    if raw or not created:
+        return
+    DeviationStreakService().record_logs([instance])
+
+
+@receiver(post_save, sender=CCPLog)
+def push_ccp_deviation(sender, instance, created, raw=False, **kwargs):
+    """기준 이탈 측정값 실시간 푸시"""
+    if raw or not created or instance.is_within_limits:
+        return
+    publish_ccp_deviation(instance)
+
+
+@receiver(pre_save, sender=ProductionOrder)
+def capture_production_order_status(sender, instance, raw=False, **kwargs):
+    """수정 전 생산 주문 상태 보관 (상태 변경 푸시용)"""
+    if raw or instance._state.adding:
+        instance._previous_status = None
+        return
+    instance._previous_status = ProductionOrder.objects.filter(
+        pk=instance.pk
+    ).values_list('status', flat=True).first()
+
+
+@receiver(post_save, sender=ProductionOrder)
+def push_production_status_change(sender, instance, created, raw=False, **kwargs):
+    """생산 주문 생성/상태 변경 실시간 푸시"""
+    if raw:
+        return
+    previous_status = getattr(instance, '_previous_status', None)
+    if created or previous_status != instance.status:
+        publish_production_status_change(instance, previous_status)
+
+
+@receiver(post_save, sender=CCPLog)
+@receiver(post_delete, sender=CCPLog)
+def invalidate_haccp_dashboard(sender, instance, raw=False, **kwargs):
+    """CCP 로그 변경 시 대시보드 스냅샷 무효화"""
+    if raw:
+        return
+    DashboardSnapshotService().invalidate_haccp()
+
+
+@receiver(post_save, sender=ProductionOrder)
+@receiver(post_delete, sender=ProductionOrder)
+def invalidate_production_dashboard(sender, instance, raw=False, **kwargs):
+    """생산 주문 변경 시 대시보드 스냅샷 무효화"""
+    if raw:
+        return
+    DashboardSnapshotService().invalidate_production()
+
+
+@receiver(post_save, sender=BOM)
+@receiver(post_delete, sender=BOM)
+def invalidate_bom_product_cost(sender, instance, raw=False, **kwargs):
+    """BOM 변경 시 해당 제품 원가 캐시와 원자재 → 제품 역색인 무효화"""
+    if raw:
+        return
+    invalidate_product_costs([instance.finished_product_id], rebuild_index=True)
+
+
+@receiver(post_save, sender=MaterialLot)
+@receiver(post_delete, sender=MaterialLot)
+def invalidate_lot_product_cost(sender, instance, raw=False, **kwargs):
+    """원자재 로트(수량/단가/상태) 변경 시 해당 원자재를 쓰는 제품 원가 캐시 무효화"""
+    if raw:
+        return
+    invalidate_material_costs([instance.raw_material_id])
+
+
+@receiver(pre_save, sender=MaterialLot)
+@receiver(pre_delete, sender=MaterialLot)
+def lock_material_inventory_position(sender, instance, raw=False, **kwargs):
+    """로트 행 쓰기 전에 원자재 재고 현황 행부터 잠금 (현황 → 로트 잠금 순서 유지)"""
+    if raw:
+        return
+    InventoryPositionService().lock_positions([instance.raw_material_id])
+
+
+@receiver(post_save, sender=MaterialLot)
+@receiver(post_delete, sender=MaterialLot)
+def update_material_inventory_position(sender, instance, raw=False, **kwargs):
+    """로트 입고/소비/상태 변경 시 같은 트랜잭션에서 원자재 재고 현황 재계산"""
+    if raw:
+        return
+    InventoryPositionService().recompute([instance.raw_material_id])
+
+
+@receiver(post_save, sender=ProductionOrder)
+def update_production_order_board(sender, instance, raw=False, **kwargs):
+    """생산 주문 생성/수정 시 같은 트랜잭션에서 목록 읽기 모델 갱신"""
+    if raw:
+        return
+    ProductionBoardService().sync([instance.pk])
+
+
+@receiver(post_save, sender=FinishedProduct)
+def update_production_board_product(sender, instance, created, raw=False, **kwargs):
+    """제품명/코드 변경 시 목록 읽기 모델 반영"""
+    if raw or created:
+        return
+    ProductionBoardService().refresh_product(instance)
+
+
+@receiver(post_save, sender=User)
+def update_production_board_operator(sender, instance, created, raw=False, **kwargs):
+    """작업자 이름 변경 시 목록 읽기 모델 반영"""
+    if raw or created:
+        return
+    ProductionBoardService().refresh_operator(instance)
+
+
+@receiver(pre_delete, sender=User)
+def release_production_board_operator(sender, instance, **kwargs):
+    """작업자 삭제 시 목록 읽기 모델의 배정 해제"""
+    ProductionBoardService().release_operator(instance)
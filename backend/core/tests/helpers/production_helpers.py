@@ -1,7 +1,8 @@
 """Production 관련 테스트 헬퍼 함수들"""
 from datetime import timedelta
+from decimal import Decimal
 from django.utils import timezone
-from core.models import ProductionOrder, FinishedProduct
+from core.models import ProductionOrder, FinishedProduct, BOM
 from .user_helpers import create_test_user
 
 
@@ -89,4 +90,20 @@ def create_completed_production_order(**kwargs):
         'produced_quantity': kwargs.get('planned_quantity', 100)
     }
     defaults.update(kwargs)
-    return create_test_production_order(**defaults)
\ No newline at end of file
+    return create_test_production_order(**defaults)
+
+def create_test_bom(finished_product, raw_material, quantity_per_unit=1, **kwargs):
+    """테스트용 BOM 항목 생성"""
+    user = kwargs.pop('created_by', None)
+    if not user:
+        user = create_test_user(role='admin')
+    
+    defaults = {
+        'finished_product': finished_product,
+        'raw_material': raw_material,
+        'quantity_per_unit': Decimal(str(quantity_per_unit)),
+        'unit': raw_material.unit,
+        'created_by': user
+    }
+    defaults.update(kwargs)
+    return BOM.objects.create(**defaults)
@@ -0,0 +1,115 @@
+"""CCP 로그 목록 평면 표현 통합테스트"""
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from core.services.ccp_log_archive_service import CCPLogArchiveService, add_months, month_start
+from core.tests.helpers.haccp_helpers import create_test_ccp_log
+
+
+@pytest.mark.integration
+class TestCCPLogListRepresentationAPI:
+    """CCP 로그 목록 평면/상세 표현"""
+
+    url = '/api/ccp-logs/'
+
+    def _create_logs(self, ccp, user, count):
+        now = timezone.now()
+        return [
+            create_test_ccp_log(ccp=ccp, created_by=user, measured_at=now - timedelta(minutes=index))
+            for index in range(count)
+        ]
+
+    def test_flat_list_query_count_independent_of_rows(self, admin_client, admin_user, test_ccp):
+        """평면 목록은 행 수와 무관하게 쿼리 수 일정 (조인 값만 사용)"""
+        self._create_logs(test_ccp, admin_user, 2)
+        with CaptureQueriesContext(connection) as small:
+            admin_client.get(self.url, {'page_size': 20})
+
+        self._create_logs(test_ccp, admin_user, 10)
+        with CaptureQueriesContext(connection) as large:
+            response = admin_client.get(self.url, {'page_size': 20})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(large.captured_queries) == len(small.captured_queries)
+
+        row = response.data['results'][0]
+        assert row['ccp'] == test_ccp.id
+        assert row['ccp_code'] == test_ccp.code
+        assert row['created_by_username'] == admin_user.username
+        assert row['production_order_number'] is None
+        assert 'deviation_percentage' in row
+
+    def test_detail_full_returns_nested_form(self, admin_client, admin_user, test_ccp):
+        """?detail=full 요청 시 중첩 상세 형식"""
+        self._create_logs(test_ccp, admin_user, 1)
+
+        response = admin_client.get(self.url, {'detail': 'full'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['results'][0]['ccp']['code'] == test_ccp.code
+
+
+@pytest.mark.integration
+class TestArchivedCCPLogReadAPI:
+    """보관 이관된 CCP 로그도 목록/상세/CCP 모니터링 로그에서 조회"""
+
+    url = '/api/ccp-logs/'
+
+    @pytest.fixture
+    def archived_setup(self, admin_user, test_ccp):
+        now = timezone.now()
+        old_month = add_months(month_start(now), -14)
+        old_logs = [
+            create_test_ccp_log(
+                ccp=test_ccp, created_by=admin_user,
+                measured_at=old_month + timedelta(days=2, minutes=index * 10)
+            )
+            for index in range(3)
+        ]
+        recent_log = create_test_ccp_log(ccp=test_ccp, created_by=admin_user, measured_at=now - timedelta(hours=1))
+        CCPLogArchiveService().archive_month(old_month)
+        return old_month, old_logs, recent_log
+
+    def test_list_merges_hot_and_archived_logs(self, admin_client, archived_setup):
+        """보관 월 기간 조회 및 기간 생략 조회에 보관 로그 포함 (측정 시각 역순)"""
+        old_month, old_logs, recent_log = archived_setup
+
+        response = admin_client.get(self.url, {'start_date': old_month.isoformat()})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 4
+        assert [row['id'] for row in response.data['results']] == [
+            str(log.id) for log in [recent_log, old_logs[2], old_logs[1], old_logs[0]]
+        ]
+
+        first = admin_client.get(self.url, {'cursor': '', 'page_size': 2})
+        second = admin_client.get(self.url, {'cursor': first.data['next_cursor'], 'page_size': 2})
+        assert [row['id'] for row in second.data['results']] == [str(old_logs[1].id), str(old_logs[0].id)]
+        assert second.data['next_cursor'] is None
+
+    def test_retrieve_and_monitoring_logs_include_archived(self, admin_client, test_ccp, archived_setup):
+        """상세 조회와 CCP 모니터링 로그에 보관 로그 포함"""
+        old_month, old_logs, _ = archived_setup
+
+        detail = admin_client.get(f'{self.url}{old_logs[0].id}/')
+        assert detail.status_code == status.HTTP_200_OK
+        assert detail.data['id'] == str(old_logs[0].id)
+
+        monitoring = admin_client.get(
+            f'/api/ccps/{test_ccp.id}/monitoring_logs/', {'start_date': old_month.isoformat()}
+        )
+        assert monitoring.status_code == status.HTTP_200_OK
+        assert len(monitoring.data['logs']) == 4
+        assert monitoring.data['total_logs'] == 4
+
+    def test_ccp_with_only_archived_logs_cannot_be_deleted(self, admin_client, test_ccp, archived_setup):
+        """보관 로그만 남은 CCP도 삭제 거부 (400)"""
+        test_ccp.logs.all().delete()
+
+        response = admin_client.delete(f'/api/ccps/{test_ccp.id}/')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,74 @@
+"""원자재 로트 목록 쿼리 수 통합테스트"""
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.tests.helpers.supplier_helpers import (
+    create_test_supplier, create_test_raw_material, create_test_material_lot
+)
+
+
+@pytest.mark.integration
+class TestMaterialLotListQueriesAPI:
+    """로트 목록은 원자재 재고 현황을 페이지 단위로 한 번에 조회"""
+
+    url = '/api/material-lots/'
+
+    def _create_lots(self, user, supplier, start, count):
+        for index in range(start, start + count):
+            material = create_test_raw_material(
+                code=f'RM-LIST-{index}', name=f'목록 원자재 {index}', supplier=supplier, created_by=user
+            )
+            create_test_material_lot(
+                lot_number=f'LOT-LIST-{index}', raw_material=material, created_by=user
+            )
+
+    def test_lot_list_query_count_independent_of_rows(self, admin_client, admin_user):
+        """로트/원자재 수가 늘어도 쿼리 수 일정"""
+        supplier = create_test_supplier(code='SUP-LIST', created_by=admin_user)
+        self._create_lots(admin_user, supplier, 0, 2)
+        admin_client.get(self.url)  # 오늘 기준 현황 행 생성
+        with CaptureQueriesContext(connection) as small:
+            admin_client.get(self.url)
+
+        self._create_lots(admin_user, supplier, 2, 8)
+        admin_client.get(self.url)
+        with CaptureQueriesContext(connection) as large:
+            response = admin_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 10
+        assert len(large.captured_queries) == len(small.captured_queries)
+        assert response.data['results'][0]['raw_material']['inventory_info']['activeLots'] == 1
+
+    def test_expiring_soon_uses_page_positions(self, admin_client, admin_user):
+        """유통기한 임박 로트도 원자재 재고 정보 포함"""
+        supplier = create_test_supplier(code='SUP-EXP', created_by=admin_user)
+        self._create_lots(admin_user, supplier, 0, 3)
+
+        response = admin_client.get(f'{self.url}expiring_soon/', {'days': 60})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total_count'] == 3
+        assert all(
+            lot['raw_material']['inventory_info']['totalQuantity'] == 100.0
+            for lot in response.data['expiring_lots']
+        )
+
+
+@pytest.mark.integration
+class TestMaterialLotConsumeAPI:
+    """로트 소비 요청 검증"""
+
+    def test_invalid_production_order_id_returns_400(self, admin_client, admin_user):
+        """UUID 형식이 아닌 생산 주문 ID는 400 (로트 수량 변경 없음)"""
+        lot = create_test_material_lot(lot_number='LOT-CONSUME-1', created_by=admin_user)
+
+        response = admin_client.post(
+            f'/api/material-lots/{lot.id}/consume/', {'quantity': 1, 'production_order': 'not-a-uuid'}, format='json'
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        lot.refresh_from_db()
+        assert lot.quantity_current == 100
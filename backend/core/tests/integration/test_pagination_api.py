@@ -0,0 +1,109 @@
+"""목록 API 키셋/건수 생략 페이지네이션 통합테스트"""
+import base64
+import json
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from rest_framework import status
+
+from core.tests.helpers.haccp_helpers import create_test_ccp_log
+from core.tests.helpers.supplier_helpers import create_test_raw_material, create_test_material_lot
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+@pytest.mark.integration
+class TestCCPLogKeysetPaginationAPI:
+    """CCP 로그 목록 키셋 페이지네이션"""
+
+    url = '/api/ccp-logs/'
+
+    def _create_logs(self, ccp, user, count=5):
+        now = timezone.now()
+        # 동일 측정 시각을 섞어 id 보조 정렬 검증
+        return [
+            create_test_ccp_log(ccp=ccp, created_by=user, measured_at=now - timedelta(minutes=index // 2))
+            for index in range(count)
+        ]
+
+    def test_cursor_pages_cover_all_logs_without_duplicates(self, admin_client, admin_user, test_ccp):
+        """커서를 따라가면 전체 로그를 중복 없이 측정 시각 역순으로 조회"""
+        logs = self._create_logs(test_ccp, admin_user)
+
+        seen = []
+        response = admin_client.get(self.url, {'cursor': '', 'page_size': 2})
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            assert 'count' in response.data
+            seen.extend(item['id'] for item in response.data['results'])
+            if not response.data['next_cursor']:
+                break
+            response = admin_client.get(self.url, {'cursor': response.data['next_cursor'], 'page_size': 2})
+
+        expected = sorted(logs, key=lambda log: (log.measured_at, str(log.id)), reverse=True)
+        assert [str(item) for item in seen] == [str(log.id) for log in expected]
+
+    def test_skip_count(self, admin_client, admin_user, test_ccp):
+        """count=false 요청 시 전체 건수 생략"""
+        self._create_logs(test_ccp, admin_user, count=3)
+
+        cursor_response = admin_client.get(self.url, {'cursor': '', 'count': 'false', 'page_size': 2})
+        page_response = admin_client.get(self.url, {'count': 'false', 'page_size': 2})
+
+        assert 'count' not in cursor_response.data
+        assert 'count' not in page_response.data
+        assert len(page_response.data['results']) == 2
+        assert page_response.data['next'] is not None
+
+    @pytest.mark.parametrize('cursor', [
+        'not-a-cursor',
+        encode_cursor(['2024-01-01T00:00:00+00:00', 'not-a-uuid']),
+        encode_cursor([1704067200, '3f2b8c9e-1d4a-4c55-9a1e-2b7d6f0a8c11']),
+        encode_cursor(['9999-12-31T23:59:59-14:00', '3f2b8c9e-1d4a-4c55-9a1e-2b7d6f0a8c11']),
+        encode_cursor(['not-a-datetime', '3f2b8c9e-1d4a-4c55-9a1e-2b7d6f0a8c11']),
+    ])
+    def test_invalid_cursor(self, admin_client, cursor):
+        """형식/타입/범위가 잘못된 커서는 404"""
+        response = admin_client.get(self.url, {'cursor': cursor})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.integration
+class TestMaterialLotKeysetPaginationAPI:
+    """원자재 로트 목록 키셋 페이지네이션 (입고일 역순)"""
+
+    url = '/api/material-lots/'
+
+    def test_cursor_pages_cover_all_lots_without_duplicates(self, admin_client, admin_user):
+        """커서를 따라가면 전체 로트를 중복 없이 입고일 역순으로 조회"""
+        material = create_test_raw_material(code='RM-KEYSET', created_by=admin_user)
+        now = timezone.now()
+        lots = [
+            create_test_material_lot(
+                lot_number=f'LOT-KEYSET-{index}', raw_material=material,
+                received_date=now - timedelta(days=index // 2), created_by=admin_user
+            )
+            for index in range(5)
+        ]
+
+        seen = []
+        response = admin_client.get(self.url, {'cursor': '', 'page_size': 2})
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(item['id'] for item in response.data['results'])
+            if not response.data['next_cursor']:
+                break
+            response = admin_client.get(self.url, {'cursor': response.data['next_cursor'], 'page_size': 2})
+
+        expected = sorted(lots, key=lambda lot: (lot.received_date, str(lot.id)), reverse=True)
+        assert [str(item) for item in seen] == [str(lot.id) for lot in expected]
+
+    def test_invalid_cursor(self, admin_client):
+        """정렬 컬럼 타입이 맞지 않는 커서는 404"""
+        response = admin_client.get(self.url, {'cursor': encode_cursor(['2024-01-01', 'x'])})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
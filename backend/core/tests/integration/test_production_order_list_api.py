@@ -0,0 +1,92 @@
+"""생산 주문 목록 읽기 모델 통합테스트"""
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+
+from core.tests.helpers.production_helpers import create_test_finished_product, create_test_production_order
+
+
+@pytest.mark.integration
+class TestProductionOrderListAPI:
+    """생산 주문 목록/예정 조회는 읽기 모델에서 평면 형식으로 제공"""
+
+    url = '/api/production-orders/'
+
+    def _create_orders(self, user, product, start, count, **kwargs):
+        return [
+            create_test_production_order(
+                order_number=f'PO-LIST-{index:03d}', finished_product=product, created_by=user, **kwargs
+            )
+            for index in range(start, start + count)
+        ]
+
+    def test_list_query_count_independent_of_rows(self, admin_client, admin_user):
+        """주문 수가 늘어도 쿼리 수 일정"""
+        product = create_test_finished_product(name='보드 제품', code='FP-BOARD', created_by=admin_user)
+        self._create_orders(admin_user, product, 0, 2)
+        with CaptureQueriesContext(connection) as small:
+            admin_client.get(self.url)
+
+        self._create_orders(admin_user, product, 2, 8)
+        with CaptureQueriesContext(connection) as large:
+            response = admin_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 10
+        assert len(large.captured_queries) == len(small.captured_queries)
+        assert response.data['results'][0]['product_name'] == '보드 제품'
+        assert response.data['results'][0]['product_code'] == 'FP-BOARD'
+
+    def test_board_follows_order_and_product_changes(self, admin_client, admin_user, operator_user):
+        """주문 진행/제품명 변경이 목록에 반영되고 지연 여부는 조회 시점 기준"""
+        product = create_test_finished_product(code='FP-SYNC', created_by=admin_user)
+        order = create_test_production_order(
+            order_number='PO-SYNC-001', finished_product=product, created_by=admin_user,
+            planned_end_date=timezone.now() - timedelta(hours=1)
+        )
+        order.produced_quantity = Decimal('25')
+        order.assigned_operator = operator_user
+        order.save()
+        product.name = '변경된 제품명'
+        product.save()
+
+        entry = admin_client.get(self.url).data['results'][0]
+        assert entry['id'] == str(order.id)
+        assert entry['completion_rate'] == Decimal('25.00')
+        assert entry['product_name'] == '변경된 제품명'
+        assert entry['assigned_operator_username'] == operator_user.username
+        assert entry['is_overdue'] is True
+
+        order.status = 'completed'
+        order.save()
+        assert admin_client.get(self.url).data['results'][0]['is_overdue'] is False
+
+    def test_operator_sees_assigned_orders_only(self, operator_client, admin_user, operator_user):
+        """작업자는 배정된 주문만 조회 (원본 목록과 같은 권한)"""
+        product = create_test_finished_product(created_by=admin_user)
+        self._create_orders(admin_user, product, 0, 2, assigned_operator=operator_user)
+        self._create_orders(admin_user, product, 2, 3)
+
+        response = operator_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['count'] == 2
+
+    def test_upcoming_and_full_detail(self, admin_client, admin_user):
+        """예정 주문은 읽기 모델, ?detail=full 목록은 중첩 형식"""
+        product = create_test_finished_product(created_by=admin_user)
+        self._create_orders(admin_user, product, 0, 2)
+        self._create_orders(admin_user, product, 2, 1, status='in_progress')
+
+        upcoming = admin_client.get(f'{self.url}upcoming/')
+        assert upcoming.status_code == status.HTTP_200_OK
+        assert upcoming.data['total_count'] == 2
+        assert 'product_name' in upcoming.data['upcoming_orders'][0]
+
+        full = admin_client.get(self.url, {'detail': 'full'})
+        assert full.data['results'][0]['finished_product']['id'] == str(product.id)
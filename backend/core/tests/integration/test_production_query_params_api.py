@@ -0,0 +1,38 @@
+"""생산 분석 API 쿼리 파라미터 검증 통합테스트"""
+import pytest
+from rest_framework import status
+
+from core.tests.helpers.production_helpers import create_test_production_order
+from core.tests.helpers.supplier_helpers import create_test_material_lot
+
+
+@pytest.mark.integration
+class TestProductionQueryParamsAPI:
+    """정수가 아닌 쿼리 파라미터는 500이 아닌 400"""
+
+    @pytest.mark.parametrize('days', ['abc', '1.5', ''])
+    def test_efficiency_report_invalid_days(self, admin_client, days):
+        """효율성 보고서 기간이 정수가 아니면 400"""
+        response = admin_client.get('/api/production-orders/efficiency_report/', {'days': days})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize('days', ['two-weeks', '14.0'])
+    def test_mrp_invalid_days(self, admin_client, days):
+        """MRP 계획 기간이 정수가 아니면 400"""
+        response = admin_client.get('/api/production-orders/mrp/', {'days': days})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_genealogy_invalid_depth(self, admin_client, admin_user):
+        """계보 추적 깊이가 정수가 아니면 400"""
+        order = create_test_production_order(created_by=admin_user)
+        lot = create_test_material_lot(created_by=admin_user)
+
+        for url in (
+            f'/api/production-orders/{order.id}/genealogy/',
+            f'/api/material-lots/{lot.id}/genealogy/',
+            f'/api/material-lots/{lot.id}/recall_impact/',
+        ):
+            response = admin_client.get(url, {'depth': 'deep'})
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
@@ -0,0 +1,213 @@
+"""핫 경로 쿼리 실행 계획 회귀 테스트 - 시드 데이터에서 EXPLAIN으로 전체 스캔 여부 확인"""
+import json
+import re
+import unittest
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from core.models import MaterialLot, RawMaterial, FinishedProduct, ProductionOrder, CCPLog
+from core.services.production_service import ProductionService
+from core.services.cost_calculation_service import CostSnapshot
+from core.services.haccp_service import HaccpService
+from core.services.mrp_service import MRPService
+from core.tests.helpers.user_helpers import create_admin_user
+from core.tests.helpers.supplier_helpers import create_test_supplier
+from core.tests.helpers.haccp_helpers import create_test_ccp
+
+
+def _plan_tables(node):
+    """EXPLAIN FORMAT=JSON 결과에서 테이블 접근 노드 수집"""
+    if isinstance(node, dict):
+        if 'table_name' in node:
+            yield node
+        for value in node.values():
+            yield from _plan_tables(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _plan_tables(value)
+
+
+@pytest.mark.integration
+@unittest.skipUnless(connection.vendor == 'mysql', 'EXPLAIN FORMAT=JSON 계획 검증은 MariaDB/MySQL 전용')
+class HotQueryPlanTest(TransactionTestCase):
+    """시드 데이터 기준 핫 쿼리 실행 계획 검증 (ANALYZE TABLE 암묵적 커밋 때문에 TransactionTestCase)"""
+
+    LOT_COUNT = 3000
+    CCP_LOG_COUNT = 6000
+    ORDER_COUNT = 1000
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.user = create_admin_user()
+        supplier = create_test_supplier(created_by=self.user)
+
+        self.materials = RawMaterial.objects.bulk_create([
+            RawMaterial(
+                name=f'계획 검증 원자재 {index}', code=f'PLAN-RM-{index}', category='ingredient',
+                supplier=supplier, created_by=self.user
+            )
+            for index in range(50)
+        ])
+        statuses = ['received', 'in_storage', 'in_use', 'used', 'used', 'used', 'expired', 'rejected']
+        MaterialLot.objects.bulk_create([
+            MaterialLot(
+                lot_number=f'PLAN-LOT-{index}',
+                raw_material=self.materials[index % len(self.materials)],
+                supplier=supplier,
+                received_date=self.now - timedelta(days=index % 365),
+                expiry_date=(self.now + timedelta(days=index % 90)).date(),
+                quantity_received=Decimal('100.000'),
+                quantity_current=Decimal('0.000') if statuses[index % len(statuses)] == 'used' else Decimal('50.000'),
+                unit_price=Decimal('1000.00'),
+                status=statuses[index % len(statuses)],
+                quality_test_passed=index % 10 != 0,
+                created_by=self.user
+            )
+            for index in range(self.LOT_COUNT)
+        ], batch_size=1000)
+
+        product = FinishedProduct.objects.create(
+            name='계획 검증 제품', code='PLAN-FP', shelf_life_days=30,
+            net_weight=Decimal('1.000'), packaging_type='box', created_by=self.user
+        )
+        order_statuses = ['planned', 'in_progress', 'completed', 'completed', 'completed', 'cancelled']
+        self.orders = ProductionOrder.objects.bulk_create([
+            ProductionOrder(
+                order_number=f'PLAN-PO-{index}',
+                finished_product=product,
+                planned_quantity=Decimal('100.000'),
+                planned_start_date=self.now + timedelta(days=index % 365 - 180),
+                planned_end_date=self.now + timedelta(days=index % 365 - 180, hours=8),
+                status=order_statuses[index % len(order_statuses)],
+                created_by=self.user
+            )
+            for index in range(self.ORDER_COUNT)
+        ], batch_size=1000)
+
+        self.ccps = [
+            create_test_ccp(name=f'계획 검증 CCP {index}', code=f'PLAN-CCP-{index}', created_by=self.user)
+            for index in range(10)
+        ]
+        CCPLog.objects.bulk_create([
+            CCPLog(
+                ccp=self.ccps[index % len(self.ccps)],
+                production_order=self.orders[index % len(self.orders)],
+                measured_value=Decimal('5.000'),
+                unit='°C',
+                measured_at=self.now - timedelta(minutes=15 * index),
+                status='within_limits' if index % 20 else 'out_of_limits',
+                is_within_limits=bool(index % 20),
+                verified_by=self.user if index % 3 else None,
+                created_by=self.user
+            )
+            for index in range(self.CCP_LOG_COUNT)
+        ], batch_size=1000)
+
+        with connection.cursor() as cursor:
+            for table in ['material_lots', 'production_orders', 'ccp_logs']:
+                cursor.execute(f'ANALYZE TABLE {table}')
+                cursor.fetchall()
+
+    def captured_selects(self, table, call, contains=None):
+        """
+        서비스 호출이 실제 실행한 대상 테이블 SELECT 문 (테스트용 복제 쿼리 아님)
+        - contains: 같은 호출의 여러 조회 중 검증할 조건 (WHERE 절 일부)
+        """
+        with CaptureQueriesContext(connection) as captured:
+            try:
+                call()
+            except ValidationError:
+                pass  # 검증 실패로 끝나는 호출도 그 전까지 실행한 조회는 검증 대상
+        statements = [
+            query['sql'] for query in captured.captured_queries
+            if query['sql'].lstrip().upper().startswith('SELECT')
+            and f'FROM `{table}`' in query['sql']
+            and (contains is None or contains in query['sql'])
+        ]
+        self.assertTrue(statements, f'{table} 조회가 실행되지 않았습니다.')
+        return statements
+
+    def assertNoFullScan(self, statements, table):
+        for sql in statements:
+            sql = re.sub(r'\s+FOR UPDATE\s*$', '', sql)
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN FORMAT=JSON {sql}')
+                plan = json.loads(cursor.fetchone()[0])
+            accesses = [node for node in _plan_tables(plan) if node['table_name'] == table]
+            self.assertTrue(accesses, f'{table} 접근 노드가 계획에 없습니다: {plan}')
+            for node in accesses:
+                self.assertNotEqual(
+                    node.get('access_type'), 'ALL',
+                    f'{table} 전체 스캔으로 회귀했습니다: {sql}\n{json.dumps(node, ensure_ascii=False)}'
+                )
+
+    def test_fifo_allocatable_lots(self):
+        """생산 시작 FIFO 할당 로트 잠금 조회 (ProductionService._lock_allocatable_lots)"""
+        def call():
+            with transaction.atomic():
+                ProductionService()._lock_allocatable_lots([self.materials[0].id])
+
+        self.assertNoFullScan(self.captured_selects('material_lots', call), 'material_lots')
+
+    def test_priceable_lots_snapshot(self):
+        """원가 스냅샷 가용 로트/평균 단가 조회 (CostSnapshot)"""
+        statements = self.captured_selects(
+            'material_lots',
+            lambda: CostSnapshot([], extra_material_ids=[material.id for material in self.materials[:3]])
+        )
+        self.assertNoFullScan(statements, 'material_lots')
+
+    def test_expiring_lots(self):
+        """유통기한 임박 로트 조회 (MaterialLotViewSet.expiring_soon)"""
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        def call():
+            response = client.get('/api/material-lots/expiring_soon/', {'days': 7})
+            self.assertEqual(response.status_code, 200)
+
+        self.assertNoFullScan(
+            self.captured_selects('material_lots', call, contains='`expiry_date` <='), 'material_lots'
+        )
+
+    def test_ccp_logs_by_ccp_and_period(self):
+        """CCP별 기간 로그 조회 (HaccpService.validate_ccp_log_creation 중복 측정 확인)"""
+        statements = self.captured_selects('ccp_logs', lambda: HaccpService().validate_ccp_log_creation(
+            ccp_id=self.ccps[0].id,
+            measured_value=Decimal('5.000'),
+            measured_at=self.now - timedelta(minutes=1),
+            created_by=self.user
+        ))
+        self.assertNoFullScan(statements, 'ccp_logs')
+
+    def test_recent_deviation_logs(self):
+        """최근 기준 이탈 로그 조회 (HaccpService.get_critical_alerts)"""
+        statements = self.captured_selects(
+            'ccp_logs',
+            lambda: HaccpService().get_critical_alerts(user=self.user, hours=24),
+            contains='`corrective_action_taken` IS NULL'
+        )
+        self.assertNoFullScan(statements, 'ccp_logs')
+
+    def test_unverified_logs_by_order(self):
+        """생산 주문별 미검증 로그 조회 (ProductionService.complete_production)"""
+        order = ProductionOrder.objects.get(pk=self.orders[1].pk)  # in_progress
+        statements = self.captured_selects('ccp_logs', lambda: ProductionService().complete_production(
+            production_order=order, produced_quantity=Decimal('100'), user=self.user
+        ))
+        self.assertNoFullScan(statements, 'ccp_logs')
+
+    def test_planned_orders_in_horizon(self):
+        """계획 기간 내 계획 주문 조회 (MRPService.run)"""
+        statements = self.captured_selects(
+            'production_orders', lambda: MRPService().run(self.user, horizon_days=7)
+        )
+        self.assertNoFullScan(statements, 'production_orders')
@@ -1,24 +1,50 @@
 """Service Layer 단위 테스트"""
+import asyncio
+import gzip
+import json
+import tempfile
 import pytest
 from datetime import datetime, timedelta
 from decimal import Decimal
+from unittest.mock import patch
 from django.utils import timezone
+from django.core.cache import cache
 from django.test import TestCase
 from rest_framework.exceptions import ValidationError, PermissionDenied
 
 from core.services.user_service import UserService, UserQueryService, UserStatsService
 from core.services.haccp_service import HaccpService, HaccpQueryService
-from core.services.production_service import ProductionService, ProductionQueryService
+from core.services.production_service import ProductionService, ProductionQueryService, MaterialTraceabilityService
 from core.services.supplier_service import SupplierService, SupplierQueryService
+from core.services.ccp_rollup_service import CCPRollupService
+from core.services.dashboard_service import DashboardSnapshotService
+from core.services.deviation_streak_service import DeviationStreakService
+from core.services.recall_service import RecallService
+from core.services.mrp_service import MRPService
+from core.services.cost_calculation_service import CostCalculationService
+from core.services.cost_cache import LocalCostCache, get_cost_cache
+from core.services.cost_simulation_service import CostSimulationService
+from core.services.inventory_service import InventoryPositionService
+from core.services.ccp_log_export_service import CCPLogExportService
+from core.services.ccp_log_archive_service import (
+    CCPLogArchiveService, ccp_log_models, month_start, add_months
+)
+from core.realtime.brokers import InProcessBroker
+from core.models import (
+    CCP, CCPLog, CCPLogArchive, CCPLogArchiveBatch, CCPLogHourlyRollup, CCPLogDailyRollup,
+    CCPDeviationStreak, MaterialUsage, FinishedProduct, MaterialInventoryPosition
+)
 from core.tests.helpers.user_helpers import (
     create_admin_user, create_quality_manager, create_operator, create_test_user
 )
 from core.tests.helpers.haccp_helpers import create_test_ccp, create_test_ccp_log
 from core.tests.helpers.production_helpers import (
     create_test_production_order, create_in_progress_production_order, 
-    create_completed_production_order
+    create_completed_production_order, create_test_bom, create_test_finished_product
+)
+from core.tests.helpers.supplier_helpers import (
+    create_test_supplier, create_test_material_lot, create_test_raw_material
 )
-from core.tests.helpers.supplier_helpers import create_test_supplier, create_test_material_lot
 
 
 @pytest.mark.unit
@@ -193,13 +219,13 @@ class HaccpServiceTest(TestCase):
         # 기준 내 로그 2개 생성
         create_test_ccp_log(
             ccp=self.ccp,
-            measured_value=Decimal('24.0'),
+            measured_value=Decimal('4.0'),
             is_within_limits=True,
             created_by=self.operator_user
         )
         create_test_ccp_log(
             ccp=self.ccp,
-            measured_value=Decimal('26.0'),
+            measured_value=Decimal('6.0'),
             is_within_limits=True,
             created_by=self.operator_user
         )
@@ -219,6 +245,59 @@ class HaccpServiceTest(TestCase):
         self.assertEqual(score['out_of_limits_count'], 1)
         self.assertAlmostEqual(score['compliance_rate'], 66.67, places=1)
 
+    def test_ccp_log_save_evaluates_limits(self):
+        """단건 저장 시 측정값으로 한계 기준 판정 (수정 저장 시에는 재판정하지 않음)"""
+        log = CCPLog(
+            ccp=self.ccp,
+            measured_value=Decimal('9.5'),
+            unit='C',
+            measured_at=timezone.now(),
+            status='within_limits',
+            is_within_limits=True,
+            created_by=self.operator_user
+        )
+        log.save()
+        log.refresh_from_db()
+        
+        self.assertFalse(log.is_within_limits)
+        self.assertEqual(log.status, 'out_of_limits')
+        
+        log.status = 'corrective_action'
+        log.save()
+        log.refresh_from_db()
+        
+        self.assertEqual(log.status, 'corrective_action')
+
+    def test_generate_compliance_report_buckets(self):
+        """컴플라이언스 보고서 CCP별/주간 집계"""
+        now = timezone.now()
+        date_from = now - timedelta(days=14)
+        create_test_ccp_log(
+            ccp=self.ccp,
+            measured_value=Decimal('4.0'),
+            measured_at=date_from + timedelta(days=1),
+            created_by=self.operator_user
+        )
+        create_test_ccp_log(
+            ccp=self.ccp,
+            measured_value=Decimal('10.0'),
+            measured_at=date_from + timedelta(days=9),
+            status='out_of_limits',
+            is_within_limits=False,
+            created_by=self.operator_user
+        )
+
+        report = self.service.generate_compliance_report(date_from, now, self.admin_user)
+
+        self.assertEqual(report['overall_statistics']['total_measurements'], 2)
+        ccp_stat = next(stat for stat in report['ccp_statistics'] if stat['ccp_code'] == self.ccp.code)
+        self.assertEqual(ccp_stat['out_of_limits_count'], 1)
+        self.assertEqual(ccp_stat['avg_measured_value'], 7.0)
+        self.assertEqual(
+            [week['total_measurements'] for week in report['trend_analysis']],
+            [1, 1, 0]
+        )
+
 
 @pytest.mark.unit
 class ProductionServiceTest(TestCase):
@@ -289,9 +368,38 @@ class ProductionServiceTest(TestCase):
         order = create_in_progress_production_order(created_by=self.admin_user)
         
         efficiency = self.service.get_production_efficiency(order)
-        
+
         self.assertIsNone(efficiency)
 
+    def test_get_production_efficiencies_batch(self):
+        """여러 주문의 효율성 일괄 계산 (단일 CCP 로그 집계)"""
+        first = create_completed_production_order(
+            order_number='PO-EFF-001', planned_quantity=100, produced_quantity=90,
+            created_by=self.admin_user
+        )
+        second = create_completed_production_order(
+            order_number='PO-EFF-002', planned_quantity=100, produced_quantity=100,
+            created_by=self.admin_user
+        )
+        in_progress = create_in_progress_production_order(
+            order_number='PO-EFF-003', created_by=self.admin_user
+        )
+        ccp = create_test_ccp(created_by=self.admin_user)
+        create_test_ccp_log(ccp=ccp, production_order=second, is_within_limits=True, created_by=self.operator_user)
+        create_test_ccp_log(
+            ccp=ccp, production_order=second, measured_value=Decimal('10.0'),
+            is_within_limits=False, status='out_of_limits',
+            measured_at=timezone.now() - timedelta(minutes=10), created_by=self.operator_user
+        )
+
+        with self.assertNumQueries(1):
+            efficiencies = self.service.get_production_efficiencies([first, second, in_progress])
+
+        self.assertEqual(set(efficiencies), {first.id, second.id})
+        self.assertEqual(efficiencies[first.id]['haccp_compliance'], 100.0)
+        self.assertEqual(efficiencies[second.id]['haccp_compliance'], 50.0)
+        self.assertEqual(efficiencies[first.id]['quantity_efficiency'], 90.0)
+
 
 @pytest.mark.unit
 class SupplierServiceTest(TestCase):
@@ -368,4 +476,855 @@ class SupplierServiceTest(TestCase):
         
         self.assertIn('risk_level', risk)
         self.assertIn('risk_score', risk)
-        self.assertIn('HACCP 인증 누락', risk['risk_factors'])
\ No newline at end of file
+        self.assertIn('HACCP 인증 누락', risk['risk_factors'])
+
+@pytest.mark.unit
+class HaccpBulkIngestTest(TestCase):
+    """HaccpService.bulk_create_ccp_logs 단위 테스트"""
+
+    def setUp(self):
+        self.service = HaccpService()
+        self.admin_user = create_admin_user()
+        self.operator_user = create_operator()
+        self.ccp = create_test_ccp(created_by=self.admin_user)
+
+    def _reading(self, value, measured_at, **kwargs):
+        data = {
+            'ccp_id': self.ccp.id,
+            'measured_value': Decimal(value),
+            'unit': 'C',
+            'measured_at': measured_at
+        }
+        data.update(kwargs)
+        return data
+
+    def test_bulk_create_evaluates_limits(self):
+        """한계 기준 판정 후 일괄 생성"""
+        now = timezone.now()
+        readings = [
+            (0, self._reading('5.0', now - timedelta(minutes=10))),
+            (1, self._reading('12.0', now - timedelta(minutes=5))),
+        ]
+        
+        result = self.service.bulk_create_ccp_logs(readings, created_by=self.operator_user)
+        
+        self.assertEqual(len(result['created']), 2)
+        self.assertEqual(result['errors'], [])
+        statuses = sorted(log.status for log in result['created'])
+        self.assertEqual(statuses, ['out_of_limits', 'within_limits'])
+
+    def test_bulk_create_reports_row_errors(self):
+        """중복/비활성 CCP 행은 오류로 보고하고 나머지는 생성"""
+        now = timezone.now()
+        create_test_ccp_log(
+            ccp=self.ccp,
+            measured_at=now - timedelta(minutes=30),
+            created_by=self.operator_user
+        )
+        inactive_ccp = create_test_ccp(created_by=self.admin_user, is_active=False)
+        readings = [
+            (0, self._reading('5.0', now - timedelta(minutes=30))),  # 기존 로그와 중복
+            (1, self._reading('5.0', now - timedelta(minutes=20))),
+            (2, self._reading('5.0', now - timedelta(minutes=20, seconds=30))),  # 배치 내 중복
+            (3, self._reading('5.0', now - timedelta(minutes=10), ccp_id=inactive_ccp.id)),
+        ]
+        
+        result = self.service.bulk_create_ccp_logs(readings, created_by=self.operator_user)
+        
+        self.assertEqual(len(result['created']), 1)
+        self.assertEqual([error['index'] for error in result['errors']], [0, 2, 3])
+
+    def test_bulk_create_permission_denied(self):
+        """권한 없는 사용자의 대량 등록 시도"""
+        unauthorized_user = create_test_user(role='viewer')
+        
+        with self.assertRaises(PermissionDenied):
+            self.service.bulk_create_ccp_logs([], created_by=unauthorized_user)
+
+
+@pytest.mark.unit
+class CCPRollupServiceTest(TestCase):
+    """CCPRollupService 단위 테스트"""
+
+    def setUp(self):
+        self.service = CCPRollupService()
+        self.admin_user = create_admin_user()
+        self.operator_user = create_operator()
+        self.ccp = create_test_ccp(created_by=self.admin_user)
+
+    def test_summarize_matches_raw_logs(self):
+        """집계 테이블 기반 요약이 원본 로그 집계와 일치"""
+        now = timezone.now()
+        for minutes, value in [(5, '5.0'), (70, '9.5'), (60 * 30, '1.0'), (60 * 24 * 3, '6.0')]:
+            is_within = Decimal('2.0') <= Decimal(value) <= Decimal('8.0')
+            create_test_ccp_log(
+                ccp=self.ccp,
+                measured_value=Decimal(value),
+                measured_at=now - timedelta(minutes=minutes),
+                status='within_limits' if is_within else 'out_of_limits',
+                is_within_limits=is_within,
+                created_by=self.operator_user
+            )
+        
+        totals = self.service.summarize(date_from=now - timedelta(days=2), date_to=now)
+        
+        self.assertEqual(totals['total'], 3)
+        self.assertEqual(totals['within_limits'], 1)
+        self.assertEqual(totals['min_value'], Decimal('1.000'))
+        self.assertEqual(totals['max_value'], Decimal('9.500'))
+        self.assertEqual(totals['sum_value'], Decimal('15.500'))
+
+    def test_verification_updates_rollups(self):
+        """로그 검증 시 검증 건수 증분 반영"""
+        log = create_test_ccp_log(ccp=self.ccp, created_by=self.operator_user)
+        
+        log.verified_by = self.admin_user
+        log.verification_date = timezone.now()
+        log.save()
+        
+        totals = self.service.summarize(ccp_ids=[self.ccp.id])
+        self.assertEqual(totals['total'], 1)
+        self.assertEqual(totals['verified'], 1)
+
+    def test_rebuild_restores_rollups(self):
+        """재생성 시 원본 로그 기준으로 집계 복원"""
+        create_test_ccp_log(ccp=self.ccp, created_by=self.operator_user)
+        CCPLogHourlyRollup.objects.all().delete()
+        CCPLogDailyRollup.objects.all().delete()
+        
+        self.service.rebuild()
+        
+        self.assertEqual(self.service.summarize(ccp_ids=[self.ccp.id])['total'], 1)
+
+
+@pytest.mark.unit
+class DeviationStreakServiceTest(TestCase):
+    """DeviationStreakService 단위 테스트"""
+
+    def setUp(self):
+        self.service = DeviationStreakService()
+        self.admin_user = create_admin_user()
+        self.operator_user = create_operator()
+        self.ccp = create_test_ccp(created_by=self.admin_user)
+
+    def _log(self, minutes_ago, within_limits):
+        return create_test_ccp_log(
+            ccp=self.ccp,
+            measured_value=Decimal('5.0') if within_limits else Decimal('10.0'),
+            measured_at=timezone.now() - timedelta(minutes=minutes_ago),
+            status='within_limits' if within_limits else 'out_of_limits',
+            is_within_limits=within_limits,
+            created_by=self.operator_user
+        )
+
+    def test_streak_tracks_latest_run(self):
+        """기준 내 측정 후 연속 이탈 횟수 누적"""
+        self._log(40, False)
+        self._log(30, True)
+        self._log(20, False)
+        self._log(10, False)
+
+        streak = CCPDeviationStreak.objects.get(ccp=self.ccp)
+        self.assertEqual(streak.current_run, 2)
+
+    def test_out_of_order_log_recomputes(self):
+        """마지막 측정보다 이전 로그 입력 시 재계산"""
+        self._log(30, False)
+        self._log(10, False)
+        self._log(20, True)  # 사이에 늦게 입력된 기준 내 측정
+
+        streak = CCPDeviationStreak.objects.get(ccp=self.ccp)
+        self.assertEqual(streak.current_run, 1)
+
+    def test_critical_alerts_use_streak_state(self):
+        """연속 이탈 알림이 상태 테이블에서 생성"""
+        for minutes in (30, 20, 10):
+            self._log(minutes, False)
+
+        alerts = HaccpService().get_critical_alerts(user=self.admin_user)
+
+        consecutive = [alert for alert in alerts['critical_alerts'] if alert['type'] == 'consecutive_deviation']
+        self.assertEqual(len(consecutive), 1)
+        self.assertEqual(consecutive[0]['consecutive_count'], 3)
+
+
+@pytest.mark.unit
+class RealtimeBrokerTest(TestCase):
+    """실시간 이벤트 브로커/발행 단위 테스트"""
+
+    def test_inprocess_broker_filters_topics(self):
+        """구독한 토픽 이벤트만 전달"""
+        broker = InProcessBroker()
+
+        async def scenario():
+            subscription = broker.subscribe(['ccp_deviation'])
+            broker.publish('production_status', {'status': 'completed'})
+            broker.publish('ccp_deviation', {'ccp_code': 'CCP01'})
+            message = await asyncio.wait_for(subscription.get(), timeout=1)
+            broker.unsubscribe(subscription)
+            return message, subscription.queue.qsize()
+
+        message, remaining = asyncio.run(scenario())
+
+        self.assertEqual(message, {'topic': 'ccp_deviation', 'payload': {'ccp_code': 'CCP01'}})
+        self.assertEqual(remaining, 0)
+
+    def test_deviation_published_after_commit(self):
+        """기준 이탈 로그만 커밋 후 브로커로 발행 (커밋 전에는 발행하지 않음)"""
+        ccp = create_test_ccp()
+
+        with patch('core.realtime.events.get_broker') as get_broker:
+            publish = get_broker.return_value.publish
+            with self.captureOnCommitCallbacks() as within_callbacks:
+                create_test_ccp_log(ccp=ccp, is_within_limits=True)
+            with self.captureOnCommitCallbacks() as deviation_callbacks:
+                log = create_test_ccp_log(
+                    ccp=ccp,
+                    measured_value=Decimal('10.0'),
+                    status='out_of_limits',
+                    is_within_limits=False
+                )
+            publish.assert_not_called()
+
+            for callback in within_callbacks + deviation_callbacks:
+                callback()
+
+        publish.assert_called_once()
+        topic, payload = publish.call_args.args
+        self.assertEqual(topic, 'ccp_deviation')
+        self.assertEqual(payload['log_id'], str(log.id))
+
+
+@pytest.mark.unit
+class DashboardSnapshotServiceTest(TestCase):
+    """DashboardSnapshotService 단위 테스트"""
+
+    def setUp(self):
+        cache.clear()
+        self.service = DashboardSnapshotService()
+        self.admin_user = create_admin_user()
+
+    def test_production_dashboard_counts(self):
+        """상태/우선순위 분포를 그룹 집계로 계산"""
+        create_test_production_order(created_by=self.admin_user, order_number='PO-DASH-001', priority='urgent')
+        create_in_progress_production_order(created_by=self.admin_user, order_number='PO-DASH-002')
+
+        snapshot = self.service.get_production_dashboard()
+
+        self.assertEqual(snapshot['overall_summary']['total_orders'], 2)
+        self.assertEqual(sum(snapshot['status_distribution'].values()), 2)
+        self.assertEqual(sum(snapshot['priority_distribution'].values()), 2)
+
+    def test_snapshot_invalidated_on_commit(self):
+        """생산 주문 저장 커밋 후 스냅샷 무효화"""
+        self.service.get_production_dashboard()
+        self.assertIsNotNone(cache.get(DashboardSnapshotService.PRODUCTION_KEY))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            create_test_production_order(created_by=self.admin_user)
+
+        self.assertIsNone(cache.get(DashboardSnapshotService.PRODUCTION_KEY))
+        self.assertEqual(self.service.get_production_dashboard()['overall_summary']['total_orders'], 1)
+
+
+@pytest.mark.unit
+class MaterialUsageTraceabilityTest(TestCase):
+    """원자재 사용 이력 기반 추적성 단위 테스트"""
+
+    def setUp(self):
+        self.service = ProductionService()
+        self.traceability_service = MaterialTraceabilityService()
+        self.admin_user = create_admin_user()
+        self.raw_material = create_test_raw_material(created_by=self.admin_user)
+        now = timezone.now()
+        self.old_lot = create_test_material_lot(
+            lot_number='LOT-OLD', raw_material=self.raw_material, status='in_storage',
+            received_date=now - timedelta(days=2), quantity_current=60, created_by=self.admin_user
+        )
+        self.new_lot = create_test_material_lot(
+            lot_number='LOT-NEW', raw_material=self.raw_material, status='in_storage',
+            received_date=now - timedelta(days=1), quantity_current=60, created_by=self.admin_user
+        )
+        self.order = create_test_production_order(created_by=self.admin_user, planned_quantity=100)
+        create_test_bom(self.order.finished_product, self.raw_material, quantity_per_unit=1)
+
+    def test_start_production_records_usage(self):
+        """생산 시작 시 FIFO로 차감한 로트별 사용 이력 기록"""
+        self.service.start_production(self.order, self.admin_user)
+
+        usages = {
+            usage.material_lot.lot_number: usage.quantity
+            for usage in MaterialUsage.objects.filter(production_order=self.order).select_related('material_lot')
+        }
+        self.assertEqual(usages, {'LOT-OLD': Decimal('60.000'), 'LOT-NEW': Decimal('40.000')})
+
+    def test_start_production_shortage_leaves_lots_untouched(self):
+        """가용 수량 부족 시 어떤 로트도 차감하지 않음"""
+        self.order.planned_quantity = 200
+        self.order.save()
+
+        with self.assertRaises(ValidationError) as context:
+            self.service.start_production(self.order, self.admin_user)
+
+        self.assertIn('원자재 부족', str(context.exception))
+        self.old_lot.refresh_from_db()
+        self.assertEqual(self.old_lot.quantity_current, Decimal('60.000'))
+        self.assertFalse(MaterialUsage.objects.exists())
+
+    def test_start_production_rejects_second_start(self):
+        """이미 시작된 주문의 재시작 거부 (잠금 후 상태 재확인)"""
+        self.service.start_production(self.order, self.admin_user)
+
+        with self.assertRaises(ValidationError):
+            self.service.start_production(self.order, self.admin_user)
+        self.assertEqual(MaterialUsage.objects.filter(production_order=self.order).count(), 2)
+
+    def test_traceability_uses_usage_rows(self):
+        """전방/후방 추적성이 사용 이력과 일치"""
+        self.service.start_production(self.order, self.admin_user)
+        other_order = create_test_production_order(created_by=self.admin_user, order_number='PO-OTHER-001')
+
+        forward = self.traceability_service.get_forward_traceability(self.order.id)
+        backward = self.traceability_service.get_material_traceability(self.new_lot.id)
+
+        self.assertEqual(
+            sorted(material['lot_number'] for material in forward['used_materials']),
+            ['LOT-NEW', 'LOT-OLD']
+        )
+        self.assertEqual(
+            [usage['order_number'] for usage in backward['usage_history']],
+            [self.order.order_number]
+        )
+        self.assertEqual(self.traceability_service.get_forward_traceability(other_order.id)['used_materials'], [])
+
+
+@pytest.mark.unit
+class RecallServiceTest(TestCase):
+    """RecallService 단위 테스트"""
+
+    def setUp(self):
+        self.service = RecallService()
+        self.admin_user = create_admin_user()
+        raw_material = create_test_raw_material(created_by=self.admin_user)
+        self.lot_a = create_test_material_lot(lot_number='LOT-A', raw_material=raw_material, created_by=self.admin_user)
+        self.lot_b = create_test_material_lot(lot_number='LOT-B', raw_material=raw_material, created_by=self.admin_user)
+        self.order_1 = create_completed_production_order(order_number='PO-RECALL-001', created_by=self.admin_user)
+        self.order_2 = create_completed_production_order(order_number='PO-RECALL-002', created_by=self.admin_user)
+        # LOT-A → 주문1 ← LOT-B → 주문2
+        for lot, order in [(self.lot_a, self.order_1), (self.lot_b, self.order_1), (self.lot_b, self.order_2)]:
+            MaterialUsage.objects.create(
+                material_lot=lot,
+                raw_material=raw_material,
+                production_order=order,
+                quantity=Decimal('10.000'),
+                unit_price=lot.unit_price,
+                created_by=self.admin_user
+            )
+
+    def test_trace_batches_queries_per_depth(self):
+        """단계당 로트→주문, 주문→로트 조회 각 1회"""
+        with self.assertNumQueries(4):
+            genealogy = self.service.trace(lot_ids=[self.lot_a.id], max_depth=2)
+
+        self.assertEqual(genealogy.order_depth, {self.order_1.id: 1, self.order_2.id: 2})
+        self.assertEqual(genealogy.lot_depth, {self.lot_a.id: 0, self.lot_b.id: 1})
+
+    def test_analyze_lot_recall(self):
+        """다단계 영향 주문/제품/관련 로트 집계"""
+        impact = self.service.analyze_lot_recall(self.lot_a.id, self.admin_user, max_depth=2)
+
+        self.assertEqual(
+            [order['order_number'] for order in impact['affected_orders']],
+            ['PO-RECALL-001', 'PO-RECALL-002']
+        )
+        self.assertEqual(impact['affected_orders'][1]['implicated_lots'], ['LOT-B'])
+        self.assertEqual([lot['lot_number'] for lot in impact['related_lots']], ['LOT-B'])
+        self.assertEqual(impact['summary']['implicated_quantity'], Decimal('20.000'))
+
+    def test_analyze_lot_recall_permission_denied(self):
+        """권한 없는 사용자의 리콜 분석 시도"""
+        with self.assertRaises(PermissionDenied):
+            self.service.analyze_lot_recall(self.lot_a.id, create_operator())
+
+
+@pytest.mark.unit
+class MRPServiceTest(TestCase):
+    """MRPService 단위 테스트"""
+
+    def setUp(self):
+        self.service = MRPService()
+        self.admin_user = create_admin_user()
+        self.raw_material = create_test_raw_material(created_by=self.admin_user)
+        create_test_material_lot(
+            lot_number='LOT-MRP', raw_material=self.raw_material, status='in_storage',
+            quantity_received=150, quantity_current=150, created_by=self.admin_user
+        )
+        self.product = create_test_finished_product(created_by=self.admin_user)
+        create_test_bom(self.product, self.raw_material, quantity_per_unit=1)
+
+    def test_run_reports_shortage_date(self):
+        """시작일 순 배정 후 처음 부족해지는 주문/일자 보고"""
+        now = timezone.now()
+        for index, days in enumerate([1, 2, 3]):
+            create_test_production_order(
+                order_number=f'PO-MRP-00{index}',
+                finished_product=self.product,
+                planned_quantity=60,
+                planned_start_date=now + timedelta(days=days),
+                planned_end_date=now + timedelta(days=days, hours=8),
+                created_by=self.admin_user
+            )
+
+        with self.assertNumQueries(4):
+            result = self.service.run(self.admin_user, horizon_days=7)
+
+        material = result['materials'][0]
+        self.assertEqual(material['gross_requirement'], Decimal('180.000'))
+        self.assertEqual(material['net_shortage'], Decimal('30.000'))
+        self.assertEqual(
+            material['first_shortage_date'],
+            timezone.localtime(now + timedelta(days=3)).date()
+        )
+        self.assertEqual([order['order_number'] for order in result['orders_at_risk']], ['PO-MRP-002'])
+
+    def test_run_permission_denied(self):
+        """권한 없는 사용자의 MRP 실행"""
+        with self.assertRaises(PermissionDenied):
+            self.service.run(create_operator())
+
+
+@pytest.mark.unit
+class CostCalculationServiceTest(TestCase):
+    """CostCalculationService 단위 테스트"""
+
+    def setUp(self):
+        self.admin_user = create_admin_user()
+        supplier = create_test_supplier(code='SUP-COST', created_by=self.admin_user)
+        self.flour = create_test_raw_material(code='RM-FLOUR', supplier=supplier, created_by=self.admin_user)
+        self.sugar = create_test_raw_material(code='RM-SUGAR', supplier=supplier, created_by=self.admin_user)
+        now = timezone.now()
+        create_test_material_lot(
+            lot_number='LOT-COST-1', raw_material=self.flour, status='in_storage',
+            quantity_received=10, quantity_current=10, unit_price=Decimal('100.00'),
+            expiry_date=(now + timedelta(days=5)).date(), created_by=self.admin_user
+        )
+        create_test_material_lot(
+            lot_number='LOT-COST-2', raw_material=self.flour, status='in_storage',
+            quantity_received=10, quantity_current=10, unit_price=Decimal('200.00'),
+            expiry_date=(now + timedelta(days=10)).date(), created_by=self.admin_user
+        )
+        # 재고 소진 로트만 있는 원자재 → 최근 30일 평균 단가
+        create_test_material_lot(
+            lot_number='LOT-COST-3', raw_material=self.sugar, status='used',
+            quantity_received=10, quantity_current=0, unit_price=Decimal('50.00'),
+            created_by=self.admin_user
+        )
+        self.product = create_test_finished_product(code='FP-COST', created_by=self.admin_user)
+        create_test_bom(self.product, self.flour, quantity_per_unit=15)
+        create_test_bom(self.product, self.sugar, quantity_per_unit=1)
+        create_test_finished_product(code='FP-NOBOM', created_by=self.admin_user)
+
+    def test_calculate_product_cost_fifo_and_average(self):
+        """FIFO 가중평균 + 최근 평균 단가 혼합 원가"""
+        cost = CostCalculationService.calculate_product_cost(str(self.product.id))
+
+        by_code = {item['material']['code']: item for item in cost['material_costs']}
+        # 10 x 100 + 5 x 200 = 2000 / 15
+        self.assertEqual(by_code['RM-FLOUR']['price_method'], 'current_lot')
+        self.assertEqual(by_code['RM-FLOUR']['total_cost'].quantize(Decimal('0.01')), Decimal('2000.00'))
+        self.assertEqual(by_code['RM-SUGAR']['price_method'], 'recent_average')
+        self.assertEqual(by_code['RM-SUGAR']['unit_price'], Decimal('50'))
+        self.assertEqual(cost['calculation_method'], 'recent_average')
+
+    def test_get_products_cost_summary_single_snapshot(self):
+        """제품 수와 무관하게 고정 쿼리 수로 원가 요약"""
+        with self.assertNumQueries(4):
+            summary = CostCalculationService.get_products_cost_summary()
+
+        by_code = {row['product_code']: row for row in summary}
+        self.assertTrue(by_code['FP-NOBOM']['bom_missing'])
+        self.assertEqual(
+            by_code['FP-COST']['unit_cost'],
+            CostCalculationService.calculate_product_cost(str(self.product.id))['unit_cost']
+        )
+
+    def test_calculate_products_costs_for_page(self):
+        """목록 페이지 제품 원가를 제품 수와 무관하게 한 번에 계산 (단건 계산과 동일 결과)"""
+        other_product = create_test_finished_product(code='FP-COST-2', created_by=self.admin_user)
+        create_test_bom(other_product, self.flour, quantity_per_unit=5)
+        products = list(FinishedProduct.objects.all())
+
+        with self.assertNumQueries(3):
+            costs = CostCalculationService.calculate_products_costs(products)
+
+        self.assertEqual(set(costs), {product.id for product in products})
+        for product in (self.product, other_product):
+            self.assertEqual(
+                costs[product.id]['unit_cost'],
+                CostCalculationService.calculate_product_cost(str(product.id))['unit_cost']
+            )
+        # 5 x 100 (첫 로트로 충당)
+        self.assertEqual(costs[other_product.id]['unit_cost'], Decimal('500'))
+        nobom = next(product for product in products if product.code == 'FP-NOBOM')
+        self.assertTrue(costs[nobom.id]['bom_missing'])
+
+
+@pytest.mark.unit
+class CostCacheTest(TestCase):
+    """제품 원가 캐시 단위 테스트"""
+
+    def setUp(self):
+        self.cost_cache = get_cost_cache()
+        self.cost_cache.clear()
+        self.admin_user = create_admin_user()
+        self.raw_material = create_test_raw_material(created_by=self.admin_user)
+        self.lot = create_test_material_lot(
+            lot_number='LOT-CACHE', raw_material=self.raw_material, status='in_storage',
+            unit_price=Decimal('100.00'), created_by=self.admin_user
+        )
+        self.product = create_test_finished_product(created_by=self.admin_user)
+        self.other_product = create_test_finished_product(code='FP-OTHER', created_by=self.admin_user)
+        create_test_bom(self.product, self.raw_material, quantity_per_unit=1)
+
+    def tearDown(self):
+        self.cost_cache.clear()
+
+    def test_lru_eviction(self):
+        """최대 항목 수 초과 시 가장 오래 사용되지 않은 항목 제거"""
+        local_cache = LocalCostCache(max_entries=2)
+        local_cache.set('a', 1, {})
+        local_cache.set('b', 1, {})
+        local_cache.get('a', 1)
+        local_cache.set('c', 1, {})
+
+        self.assertIsNotNone(local_cache.get('a', 1))
+        self.assertIsNone(local_cache.get('b', 1))
+
+    def test_local_entry_expires_after_ttl(self):
+        """로컬 캐시 항목도 TTL이 지나면 만료 (다른 워커의 무효화 반영)"""
+        local_cache = LocalCostCache(ttl_seconds=60)
+        entry = local_cache.set('a', 1, {})
+        self.assertIsNotNone(local_cache.get('a', 1))
+
+        entry['cached_at'] = timezone.now() - timedelta(seconds=61)
+
+        self.assertIsNone(local_cache.get('a', 1))
+        self.assertNotIn('a', local_cache._keys_by_product)
+
+    def test_cache_hit_and_lot_invalidation(self):
+        """로트 단가 변경 시 해당 원자재를 쓰는 제품만 무효화"""
+        product_id = str(self.product.id)
+        other_id = str(self.other_product.id)
+        _, first = CostCalculationService.get_cached_product_cost(product_id, 10)
+        CostCalculationService.get_cached_product_cost(other_id, 10)
+
+        with self.assertNumQueries(0):
+            cost, second = CostCalculationService.get_cached_product_cost(product_id, 10)
+        self.assertFalse(first['hit'])
+        self.assertTrue(second['hit'])
+        self.assertEqual(cost['unit_cost'], Decimal('100'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lot.unit_price = Decimal('120.00')
+            self.lot.save()
+
+        cost, third = CostCalculationService.get_cached_product_cost(product_id, 10)
+        self.assertFalse(third['hit'])
+        self.assertEqual(cost['unit_cost'], Decimal('120'))
+        self.assertIsNotNone(self.cost_cache.get(other_id, 10))
+
+
+@pytest.mark.unit
+class CostSimulationServiceTest(TestCase):
+    """CostSimulationService 단위 테스트"""
+
+    def setUp(self):
+        self.service = CostSimulationService()
+        self.admin_user = create_admin_user()
+        self.flour = create_test_raw_material(code='RM-FLOUR', created_by=self.admin_user)
+        self.lot = create_test_material_lot(
+            lot_number='LOT-SIM', raw_material=self.flour, status='in_storage',
+            unit_price=Decimal('100.00'), created_by=self.admin_user
+        )
+        self.product = create_test_finished_product(code='FP-SIM', created_by=self.admin_user)
+        create_test_bom(self.product, self.flour, quantity_per_unit=2)
+
+    def test_price_change_and_bom_change(self):
+        """단가 변동/BOM 변경 시나리오를 DB 변경 없이 재계산"""
+        result = self.service.simulate([
+            {'name': '밀가루 12% 인상', 'price_changes': {str(self.flour.id): 12}},
+            {'name': '소요량 절반', 'bom_changes': [{
+                'product_id': str(self.product.id), 'material_id': str(self.flour.id), 'quantity_per_unit': 1
+            }]},
+        ])
+
+        price_scenario, bom_scenario = result['scenarios']
+        self.assertEqual(price_scenario['products'][0]['unit_cost'], Decimal('224'))
+        self.assertEqual(price_scenario['products'][0]['delta'], Decimal('24'))
+        self.assertEqual(bom_scenario['products'][0]['unit_cost'], Decimal('100'))
+
+        self.lot.refresh_from_db()
+        self.assertEqual(self.lot.unit_price, Decimal('100.00'))
+        self.assertEqual(self.product.bom_items.get().quantity_per_unit, Decimal('2.000'))
+
+    def test_excluded_supplier_falls_back_to_no_data(self):
+        """유일한 공급업체 제외 시 가격 정보 없음"""
+        result = self.service.simulate([{'excluded_suppliers': [str(self.flour.supplier_id)]}])
+
+        row = result['scenarios'][0]['products'][0]
+        self.assertEqual(row['calculation_method'], 'no_data')
+        self.assertEqual(row['unit_cost'], Decimal('0'))
+
+
+@pytest.mark.unit
+class InventoryPositionServiceTest(TestCase):
+    """InventoryPositionService 단위 테스트"""
+
+    def setUp(self):
+        self.service = InventoryPositionService()
+        self.admin_user = create_admin_user()
+        self.raw_material = create_test_raw_material(created_by=self.admin_user)
+        today = timezone.localdate()
+        self.lot = create_test_material_lot(
+            lot_number='LOT-INV-1', raw_material=self.raw_material, status='in_storage',
+            quantity_received=100, quantity_current=100, unit_price=Decimal('10.00'),
+            expiry_date=today + timedelta(days=3), created_by=self.admin_user
+        )
+        create_test_material_lot(
+            lot_number='LOT-INV-2', raw_material=self.raw_material, status='in_use',
+            quantity_received=50, quantity_current=20, unit_price=Decimal('20.00'),
+            expiry_date=today + timedelta(days=20), created_by=self.admin_user
+        )
+
+    def test_position_updated_on_lot_write(self):
+        """로트 저장 시 같은 트랜잭션에서 재고 현황 갱신"""
+        position = MaterialInventoryPosition.objects.get(raw_material=self.raw_material)
+        self.assertEqual(position.on_hand_quantity, Decimal('120.000'))
+        self.assertEqual(position.available_quantity, Decimal('100.000'))
+        self.assertEqual(position.active_lot_count, 2)
+        self.assertEqual(position.near_expiry_count, 1)
+        self.assertEqual(position.expiring_30d_count, 2)
+        self.assertEqual(position.total_value, Decimal('1400.00'))
+        self.assertEqual(position.next_expiry_date, self.lot.expiry_date)
+
+        self.lot.quantity_current = Decimal('0')
+        self.lot.status = 'used'
+        self.lot.save()
+
+        position.refresh_from_db()
+        self.assertEqual(position.on_hand_quantity, Decimal('20.000'))
+        self.assertEqual(position.active_lot_count, 1)
+        self.assertEqual(position.near_expiry_count, 0)
+
+    def test_reconcile_and_stale_refresh(self):
+        """누락/기준일 지난 현황 재구성"""
+        MaterialInventoryPosition.objects.filter(raw_material=self.raw_material).update(
+            on_hand_quantity=0, as_of_date=timezone.localdate() - timedelta(days=1)
+        )
+        self.assertEqual(self.service.refresh_stale(), 1)
+        self.assertEqual(
+            MaterialInventoryPosition.objects.get(raw_material=self.raw_material).on_hand_quantity,
+            Decimal('120.000')
+        )
+
+        MaterialInventoryPosition.objects.filter(raw_material=self.raw_material).update(on_hand_quantity=0)
+        self.assertEqual(self.service.reconcile(), 1)
+        self.assertEqual(self.service.reconcile(), 0)
+
+    def test_lock_positions_creates_missing_row_once(self):
+        """현황 행이 없으면 기준일 경과 상태로 한 번만 생성 후 잠금"""
+        material = create_test_raw_material(
+            code='RM-LOCK', supplier=self.raw_material.supplier, created_by=self.admin_user
+        )
+        MaterialInventoryPosition.objects.filter(raw_material=material).delete()
+
+        positions = self.service.lock_positions([material.id, material.id])
+        self.service.lock_positions([material.id])
+
+        self.assertEqual(list(positions), [str(material.id)])
+        self.assertEqual(MaterialInventoryPosition.objects.filter(raw_material=material).count(), 1)
+        self.assertLess(positions[str(material.id)].as_of_date, timezone.localdate())
+
+    def test_stale_refresh_skips_rows_refreshed_by_writer(self):
+        """조회 시 재계산은 이미 오늘 기준으로 갱신된 행을 덮어쓰지 않음"""
+        MaterialInventoryPosition.objects.filter(raw_material=self.raw_material).update(
+            on_hand_quantity=0, as_of_date=timezone.localdate() - timedelta(days=1)
+        )
+        stale = MaterialInventoryPosition.objects.get(raw_material=self.raw_material)
+        self.service.recompute([self.raw_material.id])
+        MaterialInventoryPosition.objects.filter(pk=stale.pk).update(on_hand_quantity=Decimal('7'))
+
+        self.assertEqual(self.service.refresh_stale([self.raw_material.id]), 0)
+        self.assertEqual(
+            MaterialInventoryPosition.objects.get(pk=stale.pk).on_hand_quantity, Decimal('7.000')
+        )
+
+    def test_low_stock_report_per_material_reorder_point(self):
+        """원자재별 재주문점 기준 부족 판단과 계획 소요량 기반 소진 예상일"""
+        self.raw_material.reorder_point = Decimal('150')
+        self.raw_material.safety_stock = Decimal('50')
+        self.raw_material.save()
+        ample = create_test_raw_material(
+            code='RM-AMPLE', reorder_point=Decimal('5'), supplier=self.raw_material.supplier,
+            created_by=self.admin_user
+        )
+        create_test_material_lot(
+            lot_number='LOT-INV-3', raw_material=ample, status='in_storage', created_by=self.admin_user
+        )
+
+        product = create_test_finished_product(created_by=self.admin_user)
+        create_test_bom(product, self.raw_material, quantity_per_unit=1)
+        now = timezone.now()
+        for index, (days, quantity) in enumerate([(1, 60), (2, 60)]):
+            create_test_production_order(
+                order_number=f'PO-INV-00{index}', finished_product=product, planned_quantity=quantity,
+                planned_start_date=now + timedelta(days=days),
+                planned_end_date=now + timedelta(days=days, hours=8),
+                created_by=self.admin_user
+            )
+
+        report = self.service.get_low_stock_report()
+
+        self.assertEqual([row['code'] for row in report], [self.raw_material.code])
+        row = report[0]
+        self.assertEqual(row['current_stock'], Decimal('100.000'))
+        self.assertEqual(row['planned_demand'], Decimal('120.000'))
+        self.assertEqual(row['projected_below_safety_date'], now + timedelta(days=1))
+        self.assertEqual(row['projected_depletion_date'], now + timedelta(days=2))
+
+
+@pytest.mark.unit
+class CCPLogExportServiceTest(TestCase):
+    """CCPLogExportService 단위 테스트"""
+
+    def setUp(self):
+        self.service = CCPLogExportService()
+        self.admin_user = create_admin_user()
+        self.ccp = create_test_ccp(created_by=self.admin_user)
+        now = timezone.now()
+        self.logs = [
+            create_test_ccp_log(
+                ccp=self.ccp, created_by=self.admin_user,
+                measured_value=Decimal('5.000'), measured_at=now - timedelta(minutes=index)
+            )
+            for index in range(5)
+        ]
+
+    def test_iter_rows_keyset_chunks(self):
+        """키셋 청크 경계와 무관하게 전체 로그를 측정 시각 오름차순으로 한 번씩"""
+        rows = list(self.service.iter_rows(CCPLog.objects.all(), chunk_size=2))
+
+        self.assertEqual(
+            [row[0] for row in rows],
+            [log.id for log in sorted(self.logs, key=lambda log: log.measured_at)]
+        )
+        self.assertEqual(rows[0][2], self.ccp.code)
+
+    def test_stream_csv_and_ndjson(self):
+        """CSV 헤더/행 수와 NDJSON 행 형식"""
+        csv_lines = ''.join(self.service.stream_csv(CCPLog.objects.all())).splitlines()
+        ndjson_lines = list(self.service.stream_ndjson(CCPLog.objects.all()))
+
+        self.assertTrue(csv_lines[0].lstrip('\ufeff').startswith('id,measured_at,ccp_code'))
+        self.assertEqual(len(csv_lines), 6)
+        self.assertEqual(len(ndjson_lines), 5)
+        self.assertEqual(json.loads(ndjson_lines[0])['created_by'], self.admin_user.username)
+
+
+@pytest.mark.unit
+class CCPLogArchiveServiceTest(TestCase):
+    """CCPLogArchiveService 단위 테스트"""
+
+    def setUp(self):
+        self.service = CCPLogArchiveService()
+        self.admin_user = create_admin_user()
+        self.ccp = create_test_ccp(created_by=self.admin_user)
+        self.now = timezone.now()
+        self.old_month = add_months(month_start(self.now), -14)
+        self.old_logs = [
+            create_test_ccp_log(
+                ccp=self.ccp, created_by=self.admin_user,
+                measured_at=self.old_month + timedelta(days=3, hours=10, minutes=index * 10)
+            )
+            for index in range(3)
+        ]
+        self.recent_log = create_test_ccp_log(
+            ccp=self.ccp, created_by=self.admin_user, measured_at=self.now - timedelta(hours=1)
+        )
+
+    def test_archive_month_moves_closed_month(self):
+        """보존 기간 이전 월만 보관 테이블로 이동, 기간 집계는 이관 전후 동일"""
+        date_from = self.old_month + timedelta(days=3, hours=10, minutes=5)
+        before = CCPRollupService().summarize(date_from=date_from, date_to=self.now)
+
+        months = self.service.archivable_months(retention_months=12)
+        self.assertEqual(months, [self.old_month])
+        result = self.service.archive_month(months[0])
+
+        self.assertEqual(result['moved_count'], 3)
+        self.assertEqual(list(CCPLog.objects.values_list('id', flat=True)), [self.recent_log.id])
+        self.assertEqual(
+            set(CCPLogArchive.objects.values_list('id', flat=True)),
+            {log.id for log in self.old_logs}
+        )
+        self.assertEqual(CCPLogArchiveBatch.objects.get(period_start=self.old_month).log_count, 3)
+
+        after = CCPRollupService().summarize(date_from=date_from, date_to=self.now)
+        self.assertEqual(after['total'], before['total'])
+        self.assertEqual(after['total'], 3)
+
+    def test_ccp_log_models_by_boundary(self):
+        """이관 경계 이전 기간 조회에만 보관 테이블 포함"""
+        self.assertEqual(ccp_log_models(), [CCPLog])
+
+        self.service.archive_month(self.old_month)
+
+        self.assertEqual(ccp_log_models(), [CCPLog, CCPLogArchive])
+        self.assertEqual(ccp_log_models(self.old_month), [CCPLog, CCPLogArchive])
+        self.assertEqual(ccp_log_models(self.now - timedelta(days=1)), [CCPLog])
+
+    def test_archive_month_exports_gzip_csv(self):
+        """월별 압축 CSV 파일 생성"""
+        with tempfile.TemporaryDirectory() as export_dir:
+            result = self.service.archive_month(self.old_month, export_dir=export_dir)
+            with gzip.open(result['export_path'], 'rt', encoding='utf-8') as archive_file:
+                lines = archive_file.read().splitlines()
+
+        self.assertEqual(len(lines), 4)
+        self.assertIn(str(self.old_logs[0].id), lines[1])
+
+    def test_archive_month_rejects_open_month(self):
+        """진행 중인 월은 이관 불가"""
+        with self.assertRaises(ValidationError):
+            self.service.archive_month(self.now)
+
+
+@pytest.mark.unit
+class HaccpQueryServiceStatisticsTest(TestCase):
+    """HaccpQueryService.with_log_statistics 단위 테스트"""
+
+    def setUp(self):
+        self.service = HaccpQueryService()
+        self.admin_user = create_admin_user()
+        self.ccp = create_test_ccp(created_by=self.admin_user)
+        self.idle_ccp = create_test_ccp(name='Idle Control', created_by=self.admin_user)
+        now = timezone.now()
+        for days, value, is_within in [(1, '5.0', True), (2, '6.0', True), (3, '9.5', False), (40, '5.0', True)]:
+            create_test_ccp_log(
+                ccp=self.ccp, created_by=self.admin_user,
+                measured_value=Decimal(value), measured_at=now - timedelta(days=days),
+                is_within_limits=is_within, status='within_limits' if is_within else 'out_of_limits'
+            )
+
+    def test_statistics_in_single_query(self):
+        """CCP 목록 통계를 집계 테이블 서브쿼리 한 번으로 조회"""
+        queryset = self.service.with_log_statistics(CCP.objects.filter(id__in=[self.ccp.id, self.idle_ccp.id]))
+
+        with self.assertNumQueries(1):
+            stats = {ccp.id: ccp for ccp in queryset}
+
+        self.assertEqual(stats[self.ccp.id].total_log_count, 4)
+        self.assertEqual(stats[self.ccp.id].recent_log_count, 3)
+        self.assertEqual(stats[self.ccp.id].recent_within_limits_count, 2)
+        self.assertEqual(stats[self.idle_ccp.id].total_log_count, 0)
+        self.assertEqual(stats[self.idle_ccp.id].recent_log_count, 0)
@@ -20,6 +20,7 @@ from core.views.bom_views import BOMViewSet
 from core.views.cost_calculation_views import (
     calculate_product_cost,
     products_cost_summary, 
+    simulate_products_cost,
     material_price_info
 )
 
@@ -49,6 +50,7 @@ urlpatterns = [
     # Cost calculation endpoints
     path('products/<uuid:product_id>/cost/', calculate_product_cost, name='product_cost'),
     path('products/cost-summary/', products_cost_summary, name='products_cost_summary'),
+    path('products/cost-simulation/', simulate_products_cost, name='products_cost_simulation'),
     path('raw-materials/<uuid:material_id>/price-info/', material_price_info, name='material_price_info'),
 
     # API endpoints
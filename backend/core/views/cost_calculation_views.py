@@ -6,6 +6,7 @@ from django.http import Http404
 from decimal import Decimal
 
 from ..services.cost_calculation_service import CostCalculationService
+from ..services.cost_simulation_service import CostSimulationService
 
 
 @api_view(['GET'])
@@ -33,8 +34,9 @@ def calculate_product_cost(request, product_id):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # 원가 계산
-        cost_info = CostCalculationService.calculate_product_cost(product_id, quantity)
+        # 원가 계산 (BOM/로트 변경 시 무효화되는 캐시 사용)
+        cost_info, cache_info = CostCalculationService.get_cached_product_cost(product_id, quantity)
+        cost_info = {**cost_info, 'cache': cache_info}
         
         # Decimal을 문자열로 변환 (JSON 직렬화를 위해)
         def decimal_to_str(obj):
@@ -92,6 +94,33 @@ def products_cost_summary(request):
         )
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def simulate_products_cost(request):
+    """
+    원가 what-if 시뮬레이션 (DB 변경 없음)
+    
+    Request Body:
+    - scenarios: [{name, price_changes: {원자재 ID: 변동률(%)}, excluded_suppliers: [...], bom_changes: [...]}]
+    - quantity: 생산 수량 (기본값: 1)
+    """
+    try:
+        quantity = int(request.data.get('quantity', 1))
+    except (TypeError, ValueError):
+        return Response(
+            {'error': '잘못된 생산 수량입니다.'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if quantity <= 0:
+        return Response(
+            {'error': '생산 수량은 1 이상이어야 합니다.'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    result = CostSimulationService().simulate(request.data.get('scenarios'), quantity)
+    return Response(result, status=status.HTTP_200_OK)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def material_price_info(request, material_id):
@@ -1,17 +1,31 @@
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Count, Avg, Q
+from django.http import Http404, StreamingHttpResponse
 from django.utils import timezone
 from datetime import timedelta
-from core.models import CCP, CCPLog
+from core.models import CCP, CCPLog, CCPLogArchive
 from core.serializers import (
     CCPSerializer, CCPCreateSerializer,
-    CCPLogSerializer, CCPLogCreateSerializer, CCPLogUpdateSerializer
+    CCPLogSerializer, CCPLogListSerializer, CCPLogCreateSerializer, CCPLogUpdateSerializer
 )
+from core.pagination import KeysetPagination
 from core.services.haccp_service import HaccpService, HaccpQueryService
+from core.services.ccp_rollup_service import CCPRollupService
+from core.services.ccp_log_export_service import CCPLogExportService
+from core.services.ccp_log_archive_service import CCPLogUnion, ccp_log_models
+from core.constants import CCP_LOG_BULK_MAX_SIZE
+
+
+def ccp_log_list_serializer_class(request):
+    """CCP 로그 목록 표현 - ?detail=full 요청 시에만 중첩 상세 형식"""
+    if request.query_params.get('detail') == 'full':
+        return CCPLogSerializer
+    return CCPLogListSerializer
 
 
 class CCPViewSet(viewsets.ModelViewSet):
@@ -36,12 +50,15 @@ class CCPViewSet(viewsets.ModelViewSet):
         return CCPSerializer
     
     def get_queryset(self):
-        """역할별 CCP 조회 권한"""
-        return self.haccp_query_service.get_ccps_for_user(self.request.user)
+        """역할별 CCP 조회 권한 (로그 통계는 집계 테이블 서브쿼리 주석)"""
+        queryset = self.haccp_query_service.get_ccps_for_user(self.request.user)
+        return self.haccp_query_service.with_log_statistics(
+            queryset.select_related('finished_product', 'created_by')
+        )
     
     def perform_destroy(self, instance):
-        """CCP 삭제 시 로그 존재 확인"""
-        if instance.logs.exists():
+        """CCP 삭제 시 로그 존재 확인 (보관 이관된 로그 포함)"""
+        if instance.logs.exists() or instance.archived_logs.exists():
             from rest_framework.exceptions import ValidationError
             raise ValidationError("모니터링 로그가 존재하는 CCP는 삭제할 수 없습니다. 비활성화하세요.")
         
@@ -57,18 +74,21 @@ class CCPViewSet(viewsets.ModelViewSet):
         end_date = request.query_params.get('end_date')
         status_filter = request.query_params.get('status')
         
-        queryset = ccp.logs.all()
-        
-        if start_date:
-            queryset = queryset.filter(measured_at__gte=start_date)
-        if end_date:
-            queryset = queryset.filter(measured_at__lte=end_date)
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
+        # 조회 기간이 보관 이관 경계 이전이면 보관 로그 포함
+        querysets = []
+        for log_model in ccp_log_models(start_date):
+            queryset = log_model.objects.filter(ccp=ccp).select_related(*CCPLogListSerializer.RELATED_FIELDS)
+            if start_date:
+                queryset = queryset.filter(measured_at__gte=start_date)
+            if end_date:
+                queryset = queryset.filter(measured_at__lte=end_date)
+            if status_filter:
+                queryset = queryset.filter(status=status_filter)
+            querysets.append(queryset)
         
         # 최근 100개 제한
-        logs = queryset.order_by('-measured_at')[:100]
-        serializer = CCPLogSerializer(logs, many=True)
+        logs = CCPLogUnion(querysets, ['-measured_at', '-id'])[:100]
+        serializer = ccp_log_list_serializer_class(request)(logs, many=True)
         
         return Response({
             'ccp_info': {
@@ -78,7 +98,7 @@ class CCPViewSet(viewsets.ModelViewSet):
                 'process_step': ccp.process_step
             },
             'logs': serializer.data,
-            'total_logs': ccp.logs.count()
+            'total_logs': ccp.logs.count() + ccp.archived_logs.count()
         })
     
     @action(detail=True, methods=['get'])
@@ -91,9 +111,9 @@ class CCPViewSet(viewsets.ModelViewSet):
         from datetime import timedelta
         start_date = timezone.now() - timedelta(days=days)
         
-        logs = ccp.logs.filter(measured_at__gte=start_date)
+        totals = CCPRollupService().summarize(date_from=start_date, ccp_ids=[ccp.id])
         
-        if not logs.exists():
+        if totals['total'] == 0:
             return Response({
                 'ccp_name': ccp.name,
                 'analysis_period': f'최근 {days}일',
@@ -101,8 +121,8 @@ class CCPViewSet(viewsets.ModelViewSet):
             })
         
         # 기본 통계
-        total_logs = logs.count()
-        within_limits = logs.filter(status='within_limits').count()
+        total_logs = totals['total']
+        within_limits = totals['within_limits']
         compliance_rate = (within_limits / total_logs * 100) if total_logs > 0 else 0
         
         return Response({
@@ -143,6 +163,9 @@ class CCPLogViewSet(viewsets.ModelViewSet):
     search_fields = ['ccp__name', 'deviation_notes', 'corrective_action_taken']
     ordering_fields = ['measured_at', 'created_at']
     ordering = ['-measured_at']
+    # ?cursor= 요청 시 키셋 페이지네이션 정렬 (ccplog_measured_idx / ccplog_ccp_measured_idx)
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-measured_at', '-id')
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -154,14 +177,56 @@ class CCPLogViewSet(viewsets.ModelViewSet):
             return CCPLogCreateSerializer
         elif self.action in ['update', 'partial_update']:
             return CCPLogUpdateSerializer  # 개선조치 정보만 수정 가능
-        return CCPLogSerializer
+        elif self.action == 'retrieve':
+            return CCPLogSerializer
+        return ccp_log_list_serializer_class(self.request)
     
     def get_queryset(self):
         """로그 조회 필터링"""
         # Service를 통해 사용자별 권한 필터링된 queryset 가져오기
         queryset = self.haccp_query_service.get_ccp_logs_for_user(self.request.user)
+        queryset = self._filter_date_range(queryset)
         
-        # 날짜 범위 필터
+        # 작업자는 자신이 생성한 로그만 수정 가능
+        if self.action in ['update', 'partial_update'] and self.request.user.role == 'operator':
+            queryset = queryset.filter(created_by=self.request.user)
+            
+        return queryset
+    
+    def list(self, request, *args, **kwargs):
+        """로그 목록 - 조회 기간이 보관 이관 경계 이전(또는 생략)이면 보관 로그를 함께 정렬해 제공"""
+        queryset = self.filter_queryset(self.get_queryset())
+        if CCPLogArchive in ccp_log_models(request.query_params.get('start_date')):
+            queryset = CCPLogUnion(
+                [queryset, self.filter_queryset(self._archived_queryset())],
+                queryset.query.order_by or self.ordering
+            )
+        
+        # pagination_class 고정 (CCPLogUnion은 페이지 단위 슬라이싱으로만 조회)
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    def get_object(self):
+        """상세 조회는 보관 이관된 로그도 포함 (수정은 원본 로그만)"""
+        try:
+            return super().get_object()
+        except Http404:
+            if self.action != 'retrieve':
+                raise
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        log = get_object_or_404(self._archived_queryset(), pk=self.kwargs[lookup_url_kwarg])
+        self.check_object_permissions(self.request, log)
+        return log
+    
+    def _archived_queryset(self):
+        """사용자별 보관 로그 (목록과 같은 날짜 범위 필터)"""
+        return self._filter_date_range(
+            self.haccp_query_service.get_archived_ccp_logs_for_user(self.request.user)
+        )
+    
+    def _filter_date_range(self, queryset):
+        """날짜 범위 필터 (start_date 이상, end_date 이하)"""
         start_date = self.request.query_params.get('start_date')
         end_date = self.request.query_params.get('end_date')
         
@@ -169,11 +234,6 @@ class CCPLogViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(measured_at__gte=start_date)
         if end_date:
             queryset = queryset.filter(measured_at__lte=end_date)
-        
-        # 작업자는 자신이 생성한 로그만 수정 가능
-        if self.action in ['update', 'partial_update'] and self.request.user.role == 'operator':
-            queryset = queryset.filter(created_by=self.request.user)
-            
         return queryset
     
     def perform_create(self, serializer):
@@ -199,6 +259,78 @@ class CCPLogViewSet(viewsets.ModelViewSet):
         from rest_framework.exceptions import PermissionDenied
         raise PermissionDenied("CCP 모니터링 로그는 삭제할 수 없습니다. (HACCP 규정 준수)")
     
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """라인 센서 측정값 대량 등록 (행 단위 오류 보고)"""
+        readings = request.data.get('logs') if isinstance(request.data, dict) else request.data
+        
+        if not isinstance(readings, list) or not readings:
+            return Response(
+                {'detail': 'logs 목록이 필요합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if len(readings) > CCP_LOG_BULK_MAX_SIZE:
+            return Response(
+                {'detail': f'한 번에 최대 {CCP_LOG_BULK_MAX_SIZE}건까지 등록할 수 있습니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # 형식 검증은 행 단위로 수행 (DB 조회 없음)
+        valid_readings = []
+        errors = []
+        for idx, reading in enumerate(readings):
+            serializer = CCPLogCreateSerializer(data=reading)
+            if serializer.is_valid():
+                valid_readings.append((idx, serializer.validated_data))
+            else:
+                errors.append({'index': idx, 'errors': serializer.errors})
+        
+        result = self.haccp_service.bulk_create_ccp_logs(valid_readings, created_by=request.user)
+        errors = sorted(errors + result['errors'], key=lambda error: error['index'])
+        created_logs = result['created']
+        
+        return Response({
+            'created_ids': [str(log.id) for log in created_logs],
+            'out_of_limits_count': sum(1 for log in created_logs if not log.is_within_limits),
+            'errors': errors,
+            'success_count': len(created_logs),
+            'error_count': len(errors)
+        }, status=status.HTTP_201_CREATED if created_logs else status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        감사용 CCP 로그 내보내기 (스트리밍)
+        - export_format: csv (기본) / ndjson
+        - 목록과 같은 필터(ccp, status, start_date, end_date 등) 적용, 측정 시각 오름차순
+        - start_date가 보관 이관 경계 이전(또는 생략)이면 보관 로그를 앞에 이어서 포함
+        """
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in ['csv', 'ndjson']:
+            return Response(
+                {'detail': 'export_format은 csv 또는 ndjson이어야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        querysets = [self.filter_queryset(self.get_queryset())]
+        if CCPLogArchive in ccp_log_models(request.query_params.get('start_date')):
+            querysets.insert(0, self.filter_queryset(self._archived_queryset()))
+        
+        export_service = CCPLogExportService()
+        filename = f"ccp_logs_{timezone.now().strftime('%Y%m%d_%H%M%S')}.{export_format}"
+        
+        if export_format == 'csv':
+            response = StreamingHttpResponse(
+                export_service.stream_csv(*querysets), content_type='text/csv; charset=utf-8'
+            )
+        else:
+            response = StreamingHttpResponse(
+                export_service.stream_ndjson(*querysets), content_type='application/x-ndjson; charset=utf-8'
+            )
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+    
     @action(detail=False, methods=['get'])
     def recent_violations(self, request):
         """최근 기준 이탈 로그"""
@@ -208,9 +340,9 @@ class CCPLogViewSet(viewsets.ModelViewSet):
         violations = CCPLog.objects.filter(
             measured_at__gte=start_time,
             status='out_of_limits'
-        ).select_related('ccp', 'created_by').order_by('-measured_at')
+        ).select_related(*CCPLogListSerializer.RELATED_FIELDS).order_by('-measured_at')
         
-        serializer = CCPLogSerializer(violations, many=True)
+        serializer = self.get_serializer(violations, many=True)
         return Response({
             'period': f'최근 {hours}시간',
             'violations': serializer.data,
@@ -223,9 +355,9 @@ class CCPLogViewSet(viewsets.ModelViewSet):
         pending_logs = CCPLog.objects.filter(
             status='out_of_limits',
             corrective_action_taken__isnull=True
-        ).select_related('ccp', 'created_by').order_by('-measured_at')[:50]
+        ).select_related(*CCPLogListSerializer.RELATED_FIELDS).order_by('-measured_at')[:50]
         
-        serializer = CCPLogSerializer(pending_logs, many=True)
+        serializer = self.get_serializer(pending_logs, many=True)
         return Response({
             'pending_logs': serializer.data,
             'total_count': pending_logs.count()
@@ -237,9 +369,9 @@ class CCPLogViewSet(viewsets.ModelViewSet):
         verification_needed = CCPLog.objects.filter(
             status='corrective_action',
             verified_by__isnull=True
-        ).select_related('ccp', 'corrective_action_by').order_by('-measured_at')[:50]
+        ).select_related(*CCPLogListSerializer.RELATED_FIELDS).order_by('-measured_at')[:50]
         
-        serializer = CCPLogSerializer(verification_needed, many=True)
+        serializer = self.get_serializer(verification_needed, many=True)
         return Response({
             'verification_needed': serializer.data,
             'total_count': verification_needed.count()
@@ -247,34 +379,42 @@ class CCPLogViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def statistics(self, request):
-        """CCP 로그 통계"""
+        """CCP 로그 통계 (집계 테이블 기반)"""
         # 최근 30일 통계
         thirty_days_ago = timezone.now() - timedelta(days=30)
-        recent_logs = CCPLog.objects.filter(measured_at__gte=thirty_days_ago)
+        ccp_totals = CCPRollupService().summarize(date_from=thirty_days_ago, group_by_ccp=True)
+        
+        total_logs = sum(totals['total'] for totals in ccp_totals.values())
+        within_limits = sum(totals['within_limits'] for totals in ccp_totals.values())
+        corrective_actions = sum(totals['corrective_action'] for totals in ccp_totals.values())
+        out_of_limits = total_logs - within_limits - corrective_actions
         
-        total_logs = recent_logs.count()
-        within_limits = recent_logs.filter(status='within_limits').count()
-        out_of_limits = recent_logs.filter(status='out_of_limits').count()
-        corrective_actions = recent_logs.filter(status='corrective_action').count()
+        # CCP별 기준 이탈(out_of_limits 상태) 건수
+        violation_counts = {
+            ccp_id: totals['total'] - totals['within_limits'] - totals['corrective_action']
+            for ccp_id, totals in ccp_totals.items()
+        }
+        violated_ccps = CCP.objects.filter(
+            id__in=[ccp_id for ccp_id, count in violation_counts.items() if count > 0]
+        ).only('id', 'name', 'code', 'ccp_type')
         
         # CCP 타입별 위반 현황
-        violation_by_type = recent_logs.filter(
-            status='out_of_limits'
-        ).values(
-            'ccp__ccp_type'
-        ).annotate(
-            count=Count('id')
-        ).order_by('-count')
+        type_counts = {}
+        for ccp in violated_ccps:
+            type_counts[ccp.ccp_type] = type_counts.get(ccp.ccp_type, 0) + violation_counts[ccp.id]
+        violation_by_type = sorted(
+            [{'ccp__ccp_type': ccp_type, 'count': count} for ccp_type, count in type_counts.items()],
+            key=lambda item: -item['count']
+        )
         
         # 가장 많이 위반되는 CCP
-        frequent_violations = recent_logs.filter(
-            status='out_of_limits'
-        ).values(
-            'ccp__name',
-            'ccp__code'
-        ).annotate(
-            violation_count=Count('id')
-        ).order_by('-violation_count')[:10]
+        frequent_violations = sorted(
+            [
+                {'ccp__name': ccp.name, 'ccp__code': ccp.code, 'violation_count': violation_counts[ccp.id]}
+                for ccp in violated_ccps
+            ],
+            key=lambda item: -item['violation_count']
+        )[:10]
         
         return Response({
             'analysis_period': '최근 30일',
@@ -3,9 +3,11 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Count, Q
-from core.models import FinishedProduct, ProductionOrder
+from django.db.models import Count, Q, Exists, OuterRef
+from core.models import FinishedProduct, ProductionOrder, BOM
 from core.serializers import FinishedProductSerializer, FinishedProductCreateSerializer, FinishedProductUpdateSerializer
+from core.services.cost_calculation_service import CostCalculationService
+from core.services.haccp_service import HaccpQueryService
 
 
 class FinishedProductViewSet(viewsets.ModelViewSet):
@@ -30,11 +32,30 @@ class FinishedProductViewSet(viewsets.ModelViewSet):
         """역할별 제품 조회 권한"""
         user = self.request.user
         
+        # BOM 설정 여부는 서브쿼리로 함께 조회 (행별 exists 쿼리 방지)
+        queryset = FinishedProduct.objects.annotate(
+            has_active_bom=Exists(BOM.objects.filter(finished_product=OuterRef('pk'), is_active=True))
+        )
+        
         # 작업자는 활성 제품만 조회 가능
         if user.role == 'operator':
-            return FinishedProduct.objects.filter(is_active=True)
+            return queryset.filter(is_active=True)
             
-        return FinishedProduct.objects.all()
+        return queryset
+    
+    def list(self, request, *args, **kwargs):
+        """제품 목록 (페이지 단위로 원가를 한 번에 계산)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        products = page if page is not None else list(queryset)
+        
+        context = self.get_serializer_context()
+        context['product_costs'] = CostCalculationService.calculate_products_costs(products)
+        serializer = self.get_serializer(products, many=True, context=context)
+        
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
     
     def perform_destroy(self, instance):
         """제품 삭제 시 생산오더 확인"""
@@ -135,15 +156,14 @@ class FinishedProductViewSet(viewsets.ModelViewSet):
         """제품별 중요 관리점(CCP) 목록"""
         product = self.get_object()
         
-        ccps = product.ccps.filter(is_active=True)
+        # 최근 로그 통계는 집계 테이블 서브쿼리 주석으로 한 번에 조회
+        ccps = HaccpQueryService().with_log_statistics(product.ccps.filter(is_active=True))
         
         ccp_data = []
         for ccp in ccps:
-            # 최근 로그 통계
-            recent_logs = ccp.logs.filter(
-                measured_at__gte=datetime.now() - timedelta(days=30)
+            out_of_limits = (
+                ccp.recent_log_count - ccp.recent_within_limits_count - ccp.recent_corrective_action_count
             )
-            
             ccp_data.append({
                 'id': ccp.id,
                 'name': ccp.name,
@@ -156,11 +176,11 @@ class FinishedProductViewSet(viewsets.ModelViewSet):
                 },
                 'monitoring_frequency': ccp.monitoring_frequency,
                 'recent_performance': {
-                    'total_logs': recent_logs.count(),
-                    'out_of_limits': recent_logs.filter(status='out_of_limits').count(),
+                    'total_logs': ccp.recent_log_count,
+                    'out_of_limits': out_of_limits,
                     'compliance_rate': round(
-                        (recent_logs.filter(status='within_limits').count() / recent_logs.count() * 100), 2
-                    ) if recent_logs.count() > 0 else 0
+                        ccp.recent_within_limits_count / ccp.recent_log_count * 100, 2
+                    ) if ccp.recent_log_count > 0 else 0
                 }
             })
         
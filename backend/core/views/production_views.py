@@ -7,10 +7,25 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.db.models import Sum, Count, Avg, Q, F
 from django.utils import timezone
 from datetime import timedelta
-from core.models import ProductionOrder, CCPLog
-from core.serializers import ProductionOrderSerializer, ProductionOrderCreateSerializer, ProductionOrderUpdateSerializer
+from core.models import ProductionOrder
+from core.serializers import (
+    ProductionOrderSerializer, ProductionOrderBoardSerializer, ProductionOrderCreateSerializer,
+    ProductionOrderUpdateSerializer
+)
 from core.services.production_service import ProductionService, ProductionQueryService, MaterialTraceabilityService
-from core.services.haccp_service import HaccpService
+from core.services.dashboard_service import DashboardSnapshotService
+from core.services.recall_service import RecallService
+from core.services.mrp_service import MRPService
+from core.constants import RECALL_MAX_DEPTH
+
+
+class ProductionOrderSearchFilter(filters.SearchFilter):
+    """목록 읽기 모델 조회 시 읽기 모델 컬럼으로 검색"""
+    
+    def get_search_fields(self, view, request):
+        if view.uses_board():
+            return view.board_search_fields
+        return super().get_search_fields(view, request)
 
 
 class ProductionOrderViewSet(viewsets.ModelViewSet):
@@ -18,9 +33,10 @@ class ProductionOrderViewSet(viewsets.ModelViewSet):
     
     queryset = ProductionOrder.objects.all()
     permission_classes = [IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, ProductionOrderSearchFilter, filters.OrderingFilter]
     filterset_fields = ['status', 'priority', 'finished_product', 'assigned_operator']
     search_fields = ['order_number', 'finished_product__name', 'notes']
+    board_search_fields = ['order_number', 'product_name', 'product_code']
     ordering_fields = ['planned_start_date', 'priority', 'created_at']
     ordering = ['-created_at']
     
@@ -30,17 +46,26 @@ class ProductionOrderViewSet(viewsets.ModelViewSet):
         self.production_query_service = ProductionQueryService()
         self.traceability_service = MaterialTraceabilityService()
     
+    def uses_board(self):
+        """목록은 읽기 모델(평면 형식)로 제공 - ?detail=full 요청 시에만 원본 중첩 형식"""
+        return self.action == 'list' and self.request.query_params.get('detail') != 'full'
+    
     def get_serializer_class(self):
         if self.action == 'create':
             return ProductionOrderCreateSerializer
         elif self.action in ['update', 'partial_update']:
             return ProductionOrderUpdateSerializer
+        elif self.uses_board():
+            return ProductionOrderBoardSerializer
         return ProductionOrderSerializer
     
     def get_queryset(self):
         """역할별 생산오더 조회 권한"""
         # Service를 통해 사용자별 권한 필터링된 queryset 가져오기
-        queryset = self.production_query_service.get_production_orders_for_user(self.request.user)
+        if self.uses_board():
+            queryset = self.production_query_service.get_board_entries_for_user(self.request.user)
+        else:
+            queryset = self.production_query_service.get_production_orders_for_user(self.request.user)
         
         # 날짜 범위 필터
         start_date = self.request.query_params.get('start_date')
@@ -142,6 +167,27 @@ class ProductionOrderViewSet(viewsets.ModelViewSet):
             'order': ProductionOrderSerializer(order).data
         })
     
+    @action(detail=True, methods=['get'])
+    def traceability(self, request, pk=None):
+        """생산오더에 투입된 원자재 로트 (전방 추적성)"""
+        order = self.get_object()
+        return Response(self.traceability_service.get_forward_traceability(order.id))
+    
+    @action(detail=True, methods=['get'])
+    def genealogy(self, request, pk=None):
+        """생산오더 계보 그래프 (투입 로트 방향 상류 추적)"""
+        order = self.get_object()
+        try:
+            max_depth = int(request.query_params.get('depth', RECALL_MAX_DEPTH))
+        except ValueError:
+            return Response(
+                {'detail': '추적 깊이(depth)는 정수여야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        graph = RecallService().get_genealogy(request.user, order_id=order.id, max_depth=max_depth)
+        return Response(graph)
+    
     @action(detail=True, methods=['get'])
     def ccp_logs(self, request, pk=None):
         """생산오더와 연결된 CCP 로그"""
@@ -174,83 +220,21 @@ class ProductionOrderViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def dashboard(self, request):
         """생산 대시보드 데이터"""
-        # 오늘 생산 현황
-        today = timezone.now().date()
-        today_orders = ProductionOrder.objects.filter(
-            planned_start_date__date=today
-        )
-        
-        # 전체 현황
-        all_orders = ProductionOrder.objects.all()
-        
-        # 상태별 분포
-        status_counts = {}
-        for status_key, status_name in ProductionOrder.STATUS_CHOICES:
-            count = all_orders.filter(status=status_key).count()
-            status_counts[status_name] = count
-        
-        # 우선순위별 분포
-        priority_counts = {}
-        for priority_key, priority_name in ProductionOrder.PRIORITY_CHOICES:
-            count = all_orders.filter(priority=priority_key).count()
-            priority_counts[priority_name] = count
-        
-        # 지연된 오더 (계획 종료일이 지났지만 완료되지 않은 것)
-        overdue_orders = all_orders.filter(
-            planned_end_date__lt=timezone.now(),
-            status__in=['planned', 'in_progress', 'on_hold']
-        ).count()
-        
-        # 최근 7일 완료 오더
-        week_ago = timezone.now() - timedelta(days=7)
-        recent_completed = all_orders.filter(
-            status='completed',
-            actual_end_date__gte=week_ago
-        ).count()
-        
-        # 평균 완료율
-        completed_orders = all_orders.filter(status='completed')
-        if completed_orders.exists():
-            avg_completion_rate = completed_orders.aggregate(
-                avg_rate=Avg('produced_quantity') * 100 / Avg('planned_quantity')
-            )['avg_rate'] or 0
-        else:
-            avg_completion_rate = 0
-        
-        return Response({
-            'today_summary': {
-                'total_orders': today_orders.count(),
-                'in_progress': today_orders.filter(status='in_progress').count(),
-                'completed': today_orders.filter(status='completed').count(),
-                'planned': today_orders.filter(status='planned').count()
-            },
-            'overall_summary': {
-                'total_orders': all_orders.count(),
-                'overdue_orders': overdue_orders,
-                'recent_completed': recent_completed,
-                'avg_completion_rate': round(avg_completion_rate, 2)
-            },
-            'status_distribution': status_counts,
-            'priority_distribution': priority_counts
-        })
+        # 그룹 집계 스냅샷 (짧은 TTL 캐시, 생산 주문 변경 시 무효화)
+        return Response(DashboardSnapshotService().get_production_dashboard())
     
     @action(detail=False, methods=['get'])
     def upcoming(self, request):
         """예정된 생산오더"""
         days_ahead = int(request.query_params.get('days', '7'))
-        end_date = timezone.now() + timedelta(days=days_ahead)
         
-        upcoming_orders = ProductionOrder.objects.filter(
-            planned_start_date__gte=timezone.now(),
-            planned_start_date__lte=end_date,
-            status='planned'
-        ).select_related('finished_product', 'assigned_operator').order_by('planned_start_date')
+        upcoming_orders = self.production_query_service.get_upcoming_board_entries(days_ahead)
         
-        serializer = ProductionOrderSerializer(upcoming_orders, many=True)
+        serializer = ProductionOrderBoardSerializer(upcoming_orders, many=True)
         return Response({
             'period_days': days_ahead,
             'upcoming_orders': serializer.data,
-            'total_count': upcoming_orders.count()
+            'total_count': len(serializer.data)
         })
     
     @action(detail=False, methods=['get'])
@@ -301,35 +285,41 @@ class ProductionOrderViewSet(viewsets.ModelViewSet):
             'top_products': list(product_performance)
         })
 
+    @action(detail=False, methods=['get'])
+    def efficiency_report(self, request):
+        """기간별 생산 효율성 보고서"""
+        try:
+            days = int(request.query_params.get('days', '30'))
+        except ValueError:
+            return Response(
+                {'detail': '조회 기간(days)은 정수여야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        date_to = timezone.now()
+        date_from = date_to - timedelta(days=days)
+        
+        report = self.production_service.get_efficiency_report(date_from, date_to, request.user)
+        return Response(report)
+
+    @action(detail=False, methods=['get'])
+    def mrp(self, request):
+        """계획 생산오더 전체의 자재 소요량 계획 (MRP)"""
+        try:
+            horizon_days = int(request.query_params.get('days', '14'))
+        except ValueError:
+            return Response(
+                {'detail': '계획 기간(days)은 정수여야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        result = MRPService().run(request.user, horizon_days=horizon_days)
+        return Response(result)
+
+
 class StatisticsAPIView(APIView):
     """대시보드 통계 데이터 API"""
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        haccp_service = HaccpService()
-        
-        # HACCP 준수율 (최근 30일)
-        thirty_days_ago = timezone.now() - timedelta(days=30)
-        compliance_stats = haccp_service.calculate_compliance_score(
-            date_from=thirty_days_ago,
-            date_to=timezone.now()
-        )
-        compliance_rate = compliance_stats.get('compliance_score', 0)
-        
-        # 중요 이탈 건수 (최근 7일)
-        seven_days_ago = timezone.now() - timedelta(days=7)
-        critical_issues_count = CCPLog.objects.filter(
-            is_within_limits=False,
-            created_at__gte=seven_days_ago
-        ).count()
-        
-        # 진행중인 생산 오더 수
-        active_orders_count = ProductionOrder.objects.filter(status='in_progress').count()
-
-        data = {
-            'compliance_rate': round(compliance_rate, 2),
-            'critical_issues_count': critical_issues_count,
-            'active_production_orders': active_orders_count,
-        }
-        
-        return Response(data)
+        # 그룹 집계 스냅샷 (짧은 TTL 캐시, 생산 주문/CCP 로그 변경 시 무효화)
+        return Response(DashboardSnapshotService().get_statistics())
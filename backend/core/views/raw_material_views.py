@@ -3,9 +3,15 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db import transaction
 from django.db.models import Sum, Count, Q
+import uuid
 from datetime import datetime, timedelta, date
-from core.models import RawMaterial, MaterialLot
+from core.models import RawMaterial, MaterialLot, MaterialUsage, ProductionOrder
+from core.pagination import KeysetPagination
+from core.services.recall_service import RecallService
+from core.services.inventory_service import InventoryPositionService
+from core.constants import RECALL_MAX_DEPTH
 from core.serializers import RawMaterialSerializer, RawMaterialCreateSerializer, MaterialLotSerializer, MaterialLotCreateSerializer
 
 
@@ -20,6 +26,10 @@ class RawMaterialViewSet(viewsets.ModelViewSet):
     ordering_fields = ['name', 'code', 'created_at']
     ordering = ['-created_at']
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.inventory_service = InventoryPositionService()
+    
     def get_serializer_class(self):
         if self.action in ['create', 'update', 'partial_update']:
             return RawMaterialCreateSerializer
@@ -28,12 +38,31 @@ class RawMaterialViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """역할별 원자재 조회 권한"""
         user = self.request.user
+        queryset = RawMaterial.objects.select_related(
+            'inventory_position', *RawMaterialSerializer.RELATED_FIELDS
+        )
         
         # 작업자는 활성 원자재만 조회 가능
         if user.role == 'operator':
-            return RawMaterial.objects.filter(is_active=True)
+            return queryset.filter(is_active=True)
             
-        return RawMaterial.objects.all()
+        return queryset
+    
+    def list(self, request, *args, **kwargs):
+        """원자재 목록 (기준일이 지난 재고 현황은 페이지 단위로 한 번에 재계산)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        materials = page if page is not None else list(queryset)
+        
+        context = self.get_serializer_context()
+        context['inventory_positions'] = self.inventory_service.get_positions(
+            material.id for material in materials
+        )
+        serializer = self.get_serializer(materials, many=True, context=context)
+        
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def lots(self, request, pk=None):
@@ -42,7 +71,7 @@ class RawMaterialViewSet(viewsets.ModelViewSet):
         
         # 상태별 필터링
         status_filter = request.query_params.get('status')
-        queryset = material.lots.all()
+        queryset = material.lots.select_related(*MaterialLotSerializer.RELATED_FIELDS)
         
         if status_filter:
             queryset = queryset.filter(status=status_filter)
@@ -50,42 +79,28 @@ class RawMaterialViewSet(viewsets.ModelViewSet):
         # 최신순 정렬, 최근 100개만
         lots = queryset.order_by('-received_date')[:100]
         
-        serializer = MaterialLotSerializer(lots, many=True)
+        serializer = MaterialLotSerializer(lots, many=True, context={
+            'request': request,
+            'inventory_positions': self.inventory_service.get_positions([material.id])
+        })
         return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def inventory(self, request, pk=None):
         """특정 원자재의 재고 현황"""
         material = self.get_object()
-        
-        # 현재 보유 로트들
-        current_lots = material.lots.filter(
-            status__in=['received', 'in_storage', 'in_use'],
-            quantity_current__gt=0
-        )
-        
-        total_quantity = current_lots.aggregate(
-            total=Sum('quantity_current')
-        )['total'] or 0
-        
-        # 유통기한별 분류
-        today = date.today()
-        near_expiry = current_lots.filter(
-            expiry_date__lte=today + timedelta(days=30)
-        ).count()
-        
-        expired = current_lots.filter(
-            expiry_date__lt=today
-        ).count()
+        position = self.inventory_service.get_position(material)
         
         return Response({
             'material_name': material.name,
             'material_code': material.code,
-            'total_quantity': total_quantity,
+            'total_quantity': position.on_hand_quantity,
             'unit': material.unit,
-            'active_lots': current_lots.count(),
-            'near_expiry_lots': near_expiry,
-            'expired_lots': expired,
+            'active_lots': position.active_lot_count,
+            'near_expiry_lots': position.expiring_30d_count,
+            'expired_lots': position.expired_lot_count,
+            'total_value': position.total_value,
+            'next_expiry_date': position.next_expiry_date,
             'storage_requirements': {
                 'temp_min': material.storage_temp_min,
                 'temp_max': material.storage_temp_max,
@@ -105,31 +120,13 @@ class RawMaterialViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def low_stock(self, request):
         """재고 부족 원자재 목록"""
-        # 임계값은 쿼리 파라미터로 받거나 기본값 사용
-        threshold = float(request.query_params.get('threshold', '10.0'))
-        
-        low_stock_materials = []
-        
-        for material in RawMaterial.objects.filter(is_active=True):
-            current_stock = material.lots.filter(
-                status__in=['received', 'in_storage'],
-                quantity_current__gt=0
-            ).aggregate(
-                total=Sum('quantity_current')
-            )['total'] or 0
-            
-            if current_stock <= threshold:
-                low_stock_materials.append({
-                    'id': material.id,
-                    'name': material.name,
-                    'code': material.code,
-                    'current_stock': current_stock,
-                    'unit': material.unit,
-                    'supplier': material.supplier.name,
-                    'category': material.get_category_display()
-                })
-        
-        return Response(low_stock_materials)
+        # 임계값 파라미터가 없으면 원자재별 재주문점 사용
+        threshold = request.query_params.get('threshold')
+        
+        report = self.inventory_service.get_low_stock_report(
+            threshold=float(threshold) if threshold is not None else None
+        )
+        return Response(report)
 
 
 class MaterialLotViewSet(viewsets.ModelViewSet):
@@ -142,6 +139,13 @@ class MaterialLotViewSet(viewsets.ModelViewSet):
     search_fields = ['lot_number', 'raw_material__name', 'supplier__name']
     ordering_fields = ['received_date', 'expiry_date', 'created_at']
     ordering = ['-received_date']
+    # ?cursor= 요청 시 키셋 페이지네이션 정렬 (mlot_received_idx / mlot_material_received_idx)
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-received_date', '-id')
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.inventory_service = InventoryPositionService()
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -150,9 +154,7 @@ class MaterialLotViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """로트 조회 필터링"""
-        queryset = MaterialLot.objects.select_related(
-            'raw_material', 'supplier', 'created_by'
-        )
+        queryset = MaterialLot.objects.select_related(*MaterialLotSerializer.RELATED_FIELDS)
         
         # 날짜 범위 필터
         start_date = self.request.query_params.get('start_date')
@@ -165,6 +167,25 @@ class MaterialLotViewSet(viewsets.ModelViewSet):
         
         return queryset
     
+    def list(self, request, *args, **kwargs):
+        """로트 목록 (원자재 재고 현황은 페이지 단위로 한 번에 조회)"""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        lots = page if page is not None else list(queryset)
+        
+        serializer = self.get_serializer(lots, many=True, context=self._lot_list_context(lots))
+        
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+    
+    def _lot_list_context(self, lots):
+        context = self.get_serializer_context()
+        context['inventory_positions'] = self.inventory_service.get_positions(
+            lot.raw_material_id for lot in lots
+        )
+        return context
+    
     def destroy(self, request, *args, **kwargs):
         """로트 삭제 - 조건부 허용"""
         lot = self.get_object()
@@ -193,11 +214,11 @@ class MaterialLotViewSet(viewsets.ModelViewSet):
     
     @action(detail=True, methods=['post'])
     def consume(self, request, pk=None):
-        """로트 소비/사용"""
+        """로트 소비/사용 (사용 이력 기록)"""
         from decimal import Decimal
         
-        lot = self.get_object()
         consume_quantity = Decimal(str(request.data.get('quantity', 0)))
+        production_order_id = request.data.get('production_order')
         
         if consume_quantity <= 0:
             return Response(
@@ -205,24 +226,54 @@ class MaterialLotViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        if consume_quantity > lot.quantity_current:
-            return Response(
-                {'detail': '소비 수량이 현재 수량을 초과합니다.'}, 
-                status=status.HTTP_400_BAD_REQUEST
+        production_order = None
+        if production_order_id:
+            try:
+                production_order = ProductionOrder.objects.filter(id=uuid.UUID(str(production_order_id))).first()
+            except ValueError:
+                production_order = None
+            if production_order is None:
+                return Response(
+                    {'detail': '존재하지 않는 생산 주문입니다.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        with transaction.atomic():
+            # 동시 소비로 인한 재고 음수 방지를 위해 로트 잠금 후 재조회
+            # (재고 현황 행을 먼저 잠가 현황 → 로트 잠금 순서 유지)
+            lot = self.get_object()
+            self.inventory_service.lock_positions([lot.raw_material_id])
+            lot = MaterialLot.objects.select_for_update().select_related('raw_material').get(pk=lot.pk)
+            
+            if consume_quantity > lot.quantity_current:
+                return Response(
+                    {'detail': '소비 수량이 현재 수량을 초과합니다.'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # 수량 차감 (Decimal 타입으로 처리)
+            lot.quantity_current -= consume_quantity
+            
+            # 상태 업데이트
+            if lot.quantity_current == 0:
+                lot.status = 'used'
+            else:
+                lot.status = 'in_use'
+            
+            lot.save()
+            
+            # 사용 이력 기록 (추적성 조회 기준)
+            MaterialUsage.objects.create(
+                material_lot=lot,
+                raw_material=lot.raw_material,
+                production_order=production_order,
+                usage_type='production' if production_order else 'manual',
+                quantity=consume_quantity,
+                unit_price=lot.unit_price,
+                notes=request.data.get('notes', ''),
+                created_by=request.user
             )
         
-        # 수량 차감 (Decimal 타입으로 처리)
-        lot.quantity_current -= consume_quantity
-        
-        # 상태 업데이트
-        if lot.quantity_current == 0:
-            lot.status = 'used'
-        else:
-            lot.status = 'in_use'
-        
-        lot.save()
-        
-        # 사용 기록 로깅 (향후 별도 모델로 확장 가능)
         return Response({
             'detail': f'{consume_quantity}{lot.raw_material.unit} 소비 처리되었습니다.',
             'remaining_quantity': lot.quantity_current,
@@ -257,29 +308,69 @@ class MaterialLotViewSet(viewsets.ModelViewSet):
             }
         }
         
-        # 향후 생산오더 연결 정보도 추가 가능
-        # trace_data['production_usage'] = ProductionOrder.objects.filter(...)
+        # 생산오더 연결 정보 (사용 이력 기준)
+        trace_data['production_usage'] = list(
+            MaterialUsage.objects.filter(material_lot=lot).values(
+                'production_order__order_number',
+                'production_order__finished_product__name',
+                'usage_type',
+                'quantity',
+                'used_at'
+            ).order_by('used_at')
+        )
         
         return Response(trace_data)
     
+    @action(detail=True, methods=['get'])
+    def recall_impact(self, request, pk=None):
+        """로트 리콜 영향 분석 (다단계 하류 추적)"""
+        lot = self.get_object()
+        try:
+            max_depth = int(request.query_params.get('depth', RECALL_MAX_DEPTH))
+        except ValueError:
+            return Response(
+                {'detail': '추적 깊이(depth)는 정수여야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        impact = RecallService().analyze_lot_recall(lot.id, request.user, max_depth=max_depth)
+        return Response(impact)
+    
+    @action(detail=True, methods=['get'])
+    def genealogy(self, request, pk=None):
+        """로트 계보 그래프 (로트 ↔ 생산오더)"""
+        lot = self.get_object()
+        try:
+            max_depth = int(request.query_params.get('depth', RECALL_MAX_DEPTH))
+        except ValueError:
+            return Response(
+                {'detail': '추적 깊이(depth)는 정수여야 합니다.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        graph = RecallService().get_genealogy(request.user, lot_id=lot.id, max_depth=max_depth)
+        return Response(graph)
+    
     @action(detail=False, methods=['get'])
     def expiring_soon(self, request):
         """유통기한 임박 로트"""
         days_ahead = int(request.query_params.get('days', '7'))
         threshold_date = date.today() + timedelta(days=days_ahead)
         
-        expiring_lots = MaterialLot.objects.filter(
+        expiring_lots = list(MaterialLot.objects.filter(
             expiry_date__lte=threshold_date,
             expiry_date__gte=date.today(),
             status__in=['received', 'in_storage', 'in_use'],
             quantity_current__gt=0
-        ).select_related('raw_material', 'supplier')
+        ).select_related(*MaterialLotSerializer.RELATED_FIELDS))
         
-        serializer = MaterialLotSerializer(expiring_lots, many=True)
+        serializer = MaterialLotSerializer(
+            expiring_lots, many=True, context=self._lot_list_context(expiring_lots)
+        )
         return Response({
             'threshold_days': days_ahead,
             'expiring_lots': serializer.data,
-            'total_count': expiring_lots.count()
+            'total_count': len(expiring_lots)
         })
     
     @action(detail=False, methods=['get'])
@@ -2,6 +2,7 @@
 ASGI config for mes_backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+HTTP 요청은 Django로, /ws/events/ WebSocket 연결은 실시간 이벤트 푸시로 라우팅한다.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -13,4 +14,22 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'mes_backend.settings')
 
-application = get_asgi_application()
+# 앱 레지스트리 초기화 이후에 모델을 사용하는 모듈을 import
+django_application = get_asgi_application()
+
+from core.realtime.consumer import websocket_events  # noqa: E402
+
+WEBSOCKET_ROUTES = {
+    '/ws/events/': websocket_events,
+}
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        handler = WEBSOCKET_ROUTES.get(scope['path'])
+        if handler is None:
+            await receive()
+            await send({'type': 'websocket.close', 'code': 4404})
+            return
+        return await handler(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -178,3 +178,35 @@ CORS_ALLOWED_ORIGINS = [
 ]
 
 CORS_ALLOW_CREDENTIALS = True
+
+# Cache settings
+# 대시보드 스냅샷 등 공용 캐시. 워커가 여러 개면 무효화가 모든 워커에 반영되도록 CACHE_REDIS_URL 지정
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default='')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': 'mes',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'mes-default',
+        }
+    }
+
+# 제품 원가 캐시 백엔드
+# 'local': 프로세스 메모리 LRU, 'shared': 위 CACHES(default) 공유 (다중 워커 시 무효화 일관성)
+COST_CACHE_BACKEND = config('COST_CACHE_BACKEND', default='local')
+
+# CCP 로그 보관 이관 시 월별 압축 CSV 저장 위치
+CCP_LOG_ARCHIVE_DIR = config('CCP_LOG_ARCHIVE_DIR', default=str(BASE_DIR / 'archives' / 'ccp_logs'))
+
+# Realtime (WebSocket) settings
+# 'inprocess': 단일 ASGI 프로세스 내 팬아웃, 'redis': Redis 호환 pub/sub으로 프로세스 간 팬아웃
+REALTIME_BROKER = config('REALTIME_BROKER', default='inprocess')
+REALTIME_REDIS_URL = config('REALTIME_REDIS_URL', default='redis://localhost:6379/0')
+REALTIME_CHANNEL_PREFIX = config('REALTIME_CHANNEL_PREFIX', default='mes')
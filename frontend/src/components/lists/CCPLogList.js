@@ -101,8 +101,7 @@ const CCPLogList = ({ ccpId = null, refreshTrigger = 0 }) => {
 
   // 측정값과 한계기준 비교 표시
   const renderMeasurementStatus = (log) => {
-    const { measured_value, unit, ccp } = log;
-    const { critical_limit_min, critical_limit_max } = ccp;
+    const { measured_value, unit, critical_limit_min, critical_limit_max } = log;
     
     let limitInfo = '';
     if (critical_limit_min && critical_limit_max) {
@@ -226,10 +225,10 @@ const CCPLogList = ({ ccpId = null, refreshTrigger = 0 }) => {
                   <td className="px-6 py-4 whitespace-nowrap">
                     <div>
                       <div className="text-sm font-medium text-gray-900">
-                        {log.ccp.name}
+                        {log.ccp_name}
                       </div>
                       <div className="text-sm text-gray-500">
-                        {log.ccp.code} - {log.ccp.process_step}
+                        {log.ccp_code} - {log.ccp_process_step}
                       </div>
                     </div>
                   </td>
@@ -245,7 +244,7 @@ const CCPLogList = ({ ccpId = null, refreshTrigger = 0 }) => {
                     </span>
                   </td>
                   <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-900">
-                    {log.created_by?.username || '-'}
+                    {log.created_by_username || '-'}
                   </td>
                   <td className="px-6 py-4 text-sm text-gray-900 max-w-xs">
                     <div className="truncate">
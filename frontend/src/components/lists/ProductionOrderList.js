@@ -166,7 +166,7 @@ const ProductionOrderList = ({
                     </div>
                     {order.assigned_operator && (
                       <div className="text-sm text-gray-500">
-                        담당: {order.assigned_operator.username}
+                        담당: {order.assigned_operator_username}
                       </div>
                     )}
                   </div>
@@ -175,10 +175,10 @@ const ProductionOrderList = ({
                 <td className="px-6 py-4 whitespace-nowrap">
                   <div>
                     <div className="text-sm font-medium text-gray-900">
-                      {order.finished_product?.name || '제품명 없음'}
+                      {order.product_name || '제품명 없음'}
                     </div>
                     <div className="text-sm text-gray-500">
-                      {order.finished_product?.code || ''}
+                      {order.product_code || ''}
                     </div>
                   </div>
                 </td>
@@ -94,7 +94,7 @@ const ProductionControls = ({
               </div>
               <div className="flex justify-between">
                 <span className="text-gray-600">제품:</span>
-                <span className="font-medium">{order.finished_product?.name}</span>
+                <span className="font-medium">{order.product_name}</span>
               </div>
               <div className="flex justify-between">
                 <span className="text-gray-600">상태:</span>
@@ -102,7 +102,7 @@ const ProductionControls = ({
               </div>
               <div className="flex justify-between">
                 <span className="text-gray-600">담당자:</span>
-                <span className="font-medium">{order.assigned_operator?.username || '미배정'}</span>
+                <span className="font-medium">{order.assigned_operator_username || '미배정'}</span>
               </div>
             </div>
           </div>
@@ -222,7 +222,7 @@ const DashboardPage = () => {
                             <li key={log.id} className="py-5">
                               <div className="relative focus-within:ring-2 focus-within:ring-indigo-500">
                                 <h3 className="text-sm font-semibold text-gray-800">
-                                  {log.ccp.name} - {log.measured_value}{log.unit}
+                                  {log.ccp_name} - {log.measured_value}{log.unit}
                                 </h3>
                                 <p className={`mt-1 text-sm ${log.is_within_limits ? 'text-green-600' : 'text-red-600'}`}>
                                   {log.is_within_limits ? '정상' : '이탈'} - {log.status}